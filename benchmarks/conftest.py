@@ -0,0 +1,152 @@
+"""Shared fixtures and helpers of the benchmark suite.
+
+The benchmarks use pytest-benchmark, and run headless, without a notebook or a browser.
+Besides the time, every benchmark records the peak memory allocated by a single run,
+and the size of the serialised state of the created widgets, in the ``extra_info`` of its results.
+
+Usage::
+
+    pytest benchmarks
+    pytest benchmarks --max-size 10000000 --benchmark-json benchmarks.json
+
+"""
+
+import functools
+import json
+import tracemalloc
+
+import numpy
+import pytest
+from compas.datastructures import Graph
+from compas.datastructures import Mesh
+from compas.geometry import Pointcloud
+from ipywidgets import Widget
+from ipywidgets.widgets.widget import _remove_buffers
+
+FACES = [1_000, 10_000, 100_000, 1_000_000]
+EDGES = [1_000, 10_000, 100_000, 1_000_000]
+POINTS = [10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--max-size",
+        type=int,
+        default=100_000,
+        help="Skip benchmarks of inputs with more faces, edges or points than this.",
+    )
+
+
+@pytest.fixture(autouse=True)
+def _max_size(request):
+    size = getattr(request.node, "callspec", None) and request.node.callspec.params.get("size")
+    if size and size > request.config.getoption("--max-size"):
+        pytest.skip(f"size {size} is larger than --max-size")
+
+
+# =============================================================================
+# Inputs
+# =============================================================================
+
+
+@functools.lru_cache(maxsize=1)
+def make_grid(faces: int) -> Mesh:
+    """A square quad grid with approximately the given number of faces."""
+    n = max(1, round(faces**0.5))
+    return Mesh.from_meshgrid(dx=10.0, nx=n)
+
+
+@functools.lru_cache(maxsize=1)
+def make_trimesh(faces: int) -> Mesh:
+    """A triangulated square grid with approximately the given number of faces."""
+    mesh = make_grid(faces // 2).copy()
+    mesh.quads_to_triangles()
+    return mesh
+
+
+@functools.lru_cache(maxsize=1)
+def make_graph(edges: int) -> Graph:
+    """A square grid graph with approximately the given number of edges."""
+    n = max(2, round((edges / 2) ** 0.5))
+    x, y = numpy.meshgrid(numpy.arange(n), numpy.arange(n), indexing="ij")
+    nodes = numpy.column_stack([x.ravel(), y.ravel(), numpy.zeros(n * n)]).tolist()
+    index = numpy.arange(n * n).reshape(n, n)
+    edges = numpy.concatenate(
+        [
+            numpy.column_stack([index[:-1, :].ravel(), index[1:, :].ravel()]),
+            numpy.column_stack([index[:, :-1].ravel(), index[:, 1:].ravel()]),
+        ]
+    )
+    return Graph.from_nodes_and_edges(nodes, edges.tolist())
+
+
+@functools.lru_cache(maxsize=1)
+def make_pointcloud(points: int) -> Pointcloud:
+    """A pointcloud with the given number of points, sampled from a noisy surface."""
+    rng = numpy.random.default_rng(0)
+    xy = rng.random((points, 2)) * 100
+    z = numpy.sin(xy[:, 0] / 10) * numpy.cos(xy[:, 1] / 10) + rng.normal(scale=0.05, size=points)
+    return Pointcloud(numpy.column_stack([xy, z]).tolist())
+
+
+# =============================================================================
+# Measurements
+# =============================================================================
+
+
+def peak_memory(func) -> int:
+    """The peak memory in bytes that is allocated by a single call of a function."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def state_size(widgets) -> int:
+    """The size in bytes of the serialised state of widgets and all widgets they reference.
+
+    The size includes the JSON encoded state, and the binary buffers that are sent alongside it.
+    """
+    size = 0
+    seen = set()
+    stack = list(widgets)
+
+    while stack:
+        widget = stack.pop()
+        if widget.model_id in seen:
+            continue
+        seen.add(widget.model_id)
+
+        state, _, buffers = _remove_buffers(widget.get_state())
+        size += len(json.dumps(state)) + sum(memoryview(buffer).nbytes for buffer in buffers)
+
+        for name in widget.keys:
+            value = getattr(widget, name)
+            if isinstance(value, dict):
+                value = list(value.values())
+            elif not isinstance(value, (list, tuple)):
+                value = [value]
+            stack.extend(item for item in value if isinstance(item, Widget))
+
+    return size
+
+
+@pytest.fixture
+def measure(benchmark):
+    """Benchmark a function that creates widgets, and record its peak memory and the size of the widget state.
+
+    Large inputs are run for fewer rounds, to keep the total time of the suite in check.
+    """
+
+    def run(func, size):
+        rounds = max(1, min(10, 100_000 // size))
+        result = benchmark.pedantic(func, rounds=rounds, iterations=1)
+        widgets = result if isinstance(result, (list, tuple)) else [result]
+        benchmark.extra_info["size"] = size
+        benchmark.extra_info["peak_memory"] = peak_memory(func)
+        benchmark.extra_info["state_size"] = state_size(widgets)
+        return result
+
+    return run
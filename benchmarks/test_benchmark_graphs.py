@@ -0,0 +1,44 @@
+import pytest
+from compas.scene import Scene
+from conftest import EDGES
+from conftest import make_graph
+
+import compas_notebook.scene  # noqa: F401
+from compas_notebook.conversions import nodes_and_edges_to_threejs
+from compas_notebook.conversions import nodes_to_threejs
+
+
+@pytest.mark.parametrize("size", EDGES)
+def test_nodes_and_edges_to_threejs(measure, size):
+    nodes, edges = make_graph(size).to_nodes_and_edges()
+    measure(lambda: nodes_and_edges_to_threejs(nodes, edges), size)
+
+
+@pytest.mark.parametrize("size", EDGES)
+def test_nodes_and_edges_to_threejs_of_keys(measure, size):
+    graph = make_graph(size)
+    keys = list(graph.nodes())
+    xyz = graph.nodes_attributes("xyz")
+    edges = list(graph.edges())
+    measure(lambda: nodes_and_edges_to_threejs(xyz, edges, keys=keys), size)
+
+
+@pytest.mark.parametrize("size", EDGES)
+def test_nodes_to_threejs(measure, size):
+    nodes, _ = make_graph(size).to_nodes_and_edges()
+    measure(lambda: nodes_to_threejs(nodes), size)
+
+
+@pytest.mark.parametrize("size", EDGES)
+def test_graph_draw(measure, size):
+    sceneobject = Scene(context="Notebook").add(make_graph(size))
+    measure(sceneobject.draw, size)
+
+
+@pytest.mark.parametrize("size", EDGES)
+def test_graph_draw_subsets(measure, size):
+    graph = make_graph(size)
+    sceneobject = Scene(context="Notebook").add(
+        graph, show_nodes=list(graph.nodes())[::2], show_edges=list(graph.edges())[::2]
+    )
+    measure(sceneobject.draw, size)
@@ -0,0 +1,50 @@
+import numpy
+import pytest
+from compas.scene import Scene
+from conftest import FACES
+from conftest import make_grid
+from conftest import make_trimesh
+
+import compas_notebook.scene  # noqa: F401
+from compas_notebook.conversions import vertices_and_edges_to_threejs
+from compas_notebook.conversions import vertices_and_faces_to_threejs
+
+MESHES = {"grid": make_grid, "trimesh": make_trimesh}
+
+
+@pytest.mark.parametrize("kind", MESHES)
+@pytest.mark.parametrize("size", FACES)
+def test_vertices_and_faces_to_threejs(measure, kind, size):
+    vertices, faces = MESHES[kind](size).to_vertices_and_faces()
+    measure(lambda: vertices_and_faces_to_threejs(vertices, faces), size)
+
+
+@pytest.mark.parametrize("kind", MESHES)
+@pytest.mark.parametrize("size", FACES)
+def test_vertices_and_faces_to_threejs_of_arrays(measure, kind, size):
+    vertices, faces = MESHES[kind](size).to_vertices_and_faces()
+    vertices = numpy.array(vertices)
+    faces = numpy.array(faces)
+    measure(lambda: vertices_and_faces_to_threejs(vertices, faces), size)
+
+
+@pytest.mark.parametrize("size", FACES)
+def test_vertices_and_edges_to_threejs(measure, size):
+    mesh = make_grid(size)
+    vertices = mesh.vertices_attributes("xyz")
+    edges = list(mesh.edges())
+    measure(lambda: vertices_and_edges_to_threejs(vertices, edges), size)
+
+
+@pytest.mark.parametrize("kind", MESHES)
+@pytest.mark.parametrize("size", FACES)
+def test_mesh_draw(measure, kind, size):
+    sceneobject = Scene(context="Notebook").add(MESHES[kind](size))
+    measure(sceneobject.draw, size)
+
+
+@pytest.mark.parametrize("kind", MESHES)
+@pytest.mark.parametrize("size", FACES)
+def test_mesh_draw_all_parts(measure, kind, size):
+    sceneobject = Scene(context="Notebook").add(MESHES[kind](size), show_vertices=True, show_edges=True)
+    measure(sceneobject.draw, size)
@@ -0,0 +1,37 @@
+import pytest
+from conftest import POINTS
+from conftest import make_pointcloud
+
+from compas_notebook.conversions import decimate_points
+from compas_notebook.conversions import pointcloud_to_threejs
+from compas_notebook.viewer import Viewer
+
+
+@pytest.mark.parametrize("size", POINTS)
+def test_pointcloud_to_threejs(measure, size):
+    pointcloud = make_pointcloud(size)
+    measure(lambda: pointcloud_to_threejs(pointcloud), size)
+
+
+@pytest.mark.parametrize("method", ["voxel", "random"])
+@pytest.mark.parametrize("size", POINTS)
+def test_decimate_points(benchmark, method, size):
+    points = make_pointcloud(size).points
+    rounds = max(1, min(10, 100_000 // size))
+    benchmark.pedantic(lambda: decimate_points(points, size // 10, method=method), rounds=rounds, iterations=1)
+
+
+@pytest.mark.parametrize("size", POINTS)
+def test_pointcloud_draw(measure, size):
+    # the progressive draw path, with the preview and all refinements up to the point budget
+    viewer = Viewer()
+    sceneobject = viewer.scene.add(make_pointcloud(size))
+    sceneobject.viewer = viewer
+
+    def draw():
+        guids = sceneobject.draw()
+        while sceneobject.refine():
+            pass
+        return guids
+
+    measure(draw, size)
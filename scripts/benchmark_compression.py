@@ -0,0 +1,133 @@
+"""Benchmark the compressed transport of ``compas_notebook.conversions.compress_objects``.
+
+Measures the bytes saved by compressing the buffers of drawn COMPAS meshes,
+and the CPU time added by compressing them in the kernel and decompressing them in the notebook,
+for plain float buffers and for buffers quantized with ``compas_notebook.conversions.quantize_objects``,
+at increasing compression levels.
+
+The transport is measured through the functions that are used by the viewer:
+the buffers of the drawn pythreejs objects are wrapped by ``compress_objects``,
+and compressed when the state of the array widgets is serialised for the comm.
+Decompression is measured with the deserialiser of ``ipydatawidgets``, as an indication of the work in the notebook.
+The export is measured with ``compas_notebook.export.embed_state``, which compresses the embedded buffers of a page.
+
+Usage::
+
+    python scripts/benchmark_compression.py
+    python scripts/benchmark_compression.py 1000000
+
+"""
+
+import base64
+import sys
+import time
+
+import compas
+import numpy
+from compas.datastructures import Mesh
+from compas.geometry import Translation
+from compas.scene import Scene
+from ipydatawidgets import NDArrayWidget
+from ipydatawidgets.ndarray.serializers import array_from_compressed_json
+
+import compas_notebook.scene  # noqa: F401
+from compas_notebook.conversions import attribute_array
+from compas_notebook.conversions import compress_objects
+from compas_notebook.conversions import quantize_objects
+from compas_notebook.export import embed_state
+
+LEVELS = [1, 6, 9]
+# compress all buffers, to measure the compression of the small buffers of the tubemesh as well
+THRESHOLD = 0
+
+
+def meshes(size):
+    tubemesh = Mesh.from_obj(compas.get("tubemesh.obj"))
+    yield "tubemesh", tubemesh
+
+    n = int(size**0.5)
+    grid = Mesh.from_meshgrid(dx=10.0, nx=n)
+    yield "meshgrid", grid
+
+    # a terrain-like surface, of which the positions are far less regular than those of the grid
+    terrain = grid.copy()
+    rng = numpy.random.default_rng(0)
+    for vertex in terrain.vertices():
+        x, y, _ = terrain.vertex_coordinates(vertex)
+        terrain.vertex_attribute(vertex, "z", numpy.sin(x) * numpy.cos(y) + rng.normal(scale=0.01))
+    terrain.transform(Translation.from_vector([1000, 2000, 0]))
+    yield "terrain", terrain
+
+
+def draw(mesh, quantization):
+    """Draw the faces and edges of a mesh like the viewer does, without any of the caches of a viewer."""
+    sceneobject = Scene(context="Notebook").add(mesh, show_edges=True)
+    objects = sceneobject.draw()
+    if quantization:
+        quantize_objects(objects)
+    return objects
+
+
+def attributes(objects):
+    """The distinct buffer attributes of the geometries of drawn objects."""
+    stack = list(objects)
+    found = {}
+    while stack:
+        obj = stack.pop()
+        stack.extend(getattr(obj, "children", ()))
+        geometry = getattr(obj, "geometry", None)
+        for attribute in getattr(geometry, "attributes", {}).values():
+            found[attribute.model_id] = attribute
+    return list(found.values())
+
+
+def transport(mesh, quantization, level):
+    objects = draw(mesh, quantization)
+
+    t0 = time.perf_counter()
+    compress_objects(objects, level=level, threshold=THRESHOLD)
+    # the buffers are compressed when the state of the array widgets is serialised for the comm
+    widgets = [attribute.array for attribute in attributes(objects) if isinstance(attribute.array, NDArrayWidget)]
+    states = [widget.get_state()["array"] for widget in widgets]
+    t1 = time.perf_counter()
+    # the deserialiser replaces the compressed buffers of the states by the decompressed buffers
+    size = sum(len(state["compressed_buffer"]) for state in states)
+    for widget, state in zip(widgets, states):
+        array_from_compressed_json(state, widget)
+    t2 = time.perf_counter()
+
+    return size, t1 - t0, t2 - t1
+
+
+def export(mesh, quantization, level):
+    objects = draw(mesh, quantization)
+
+    t0 = time.perf_counter()
+    state = embed_state(objects, level=level, threshold=THRESHOLD)
+    t1 = time.perf_counter()
+
+    buffers = [buffer for entry in state.values() for buffer in entry.get("buffers", [])]
+    size = sum(len(base64.b64decode(buffer["data"])) for buffer in buffers)
+    return size, t1 - t0
+
+
+def benchmark(name, mesh):
+    for quantization in (False, True):
+        raw = sum(attribute_array(attribute).nbytes for attribute in attributes(draw(mesh, quantization)))
+        encoding = "quantized" if quantization else "float"
+        row = f"{name:>10} | {mesh.number_of_faces():>9} faces | {encoding:>9} | raw {raw / 1e6:8.2f}MB"
+        for level in LEVELS:
+            size, compress, decompress = transport(mesh, quantization, level)
+            embedded, embed = export(mesh, quantization, level)
+            row += (
+                f" | L{level} {size / 1e6:7.2f}MB ({1 - size / raw:4.0%}) {compress:6.3f}s + {decompress:6.3f}s"
+                f", export {embedded / 1e6:7.2f}MB {embed:6.3f}s"
+            )
+        print(row)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000]
+    for size in sizes:
+        for name, mesh in meshes(size):
+            benchmark(name, mesh)
@@ -0,0 +1,122 @@
+"""Benchmark the face buffers of ``ThreeMeshObject.draw_faces``.
+
+Compares the batched implementation against the original per-face loop,
+on quad grids of increasing size, and checks that both produce the same buffers.
+Also compares the size of the unindexed buffers with the size of the indexed buffers.
+
+Usage::
+
+    python scripts/benchmark_draw_faces.py
+    python scripts/benchmark_draw_faces.py 100000 1000000
+
+"""
+
+import math
+import sys
+import time
+
+import numpy
+import pythreejs as three
+from compas.colors import Color
+from compas.datastructures import Mesh
+from compas.geometry import Polygon
+from compas.geometry import earclip_polygon
+from compas.scene import Scene
+
+import compas_notebook.scene  # noqa: F401
+
+
+def draw_faces_loop(sceneobject, faces, color):
+    """The original implementation of the face buffers, with a Python loop over the faces."""
+    positions = []
+    colors = []
+    # the original implementation read the coordinates from a cached property
+    vertex_xyz = sceneobject.vertex_xyz
+
+    for face in faces:
+        vertices = sceneobject.mesh.face_vertices(face)
+        c = color[face]
+
+        if len(vertices) == 3:
+            positions.append(vertex_xyz[vertices[0]])
+            positions.append(vertex_xyz[vertices[1]])
+            positions.append(vertex_xyz[vertices[2]])
+            colors.append(c)
+            colors.append(c)
+            colors.append(c)
+        elif len(vertices) == 4:
+            positions.append(vertex_xyz[vertices[0]])
+            positions.append(vertex_xyz[vertices[1]])
+            positions.append(vertex_xyz[vertices[2]])
+            colors.append(c)
+            colors.append(c)
+            colors.append(c)
+            positions.append(vertex_xyz[vertices[0]])
+            positions.append(vertex_xyz[vertices[2]])
+            positions.append(vertex_xyz[vertices[3]])
+            colors.append(c)
+            colors.append(c)
+            colors.append(c)
+        else:
+            polygon = Polygon([vertex_xyz[v] for v in vertices])
+            ears = earclip_polygon(polygon)
+            for ear in ears:
+                positions.append(vertex_xyz[vertices[ear[0]]])
+                positions.append(vertex_xyz[vertices[ear[1]]])
+                positions.append(vertex_xyz[vertices[ear[2]]])
+                colors.append(c)
+                colors.append(c)
+                colors.append(c)
+
+    positions = numpy.array(positions, dtype=numpy.float32)
+    colors = numpy.array(colors, dtype=numpy.float32)
+    return positions, colors
+
+
+def draw_faces_batched(sceneobject, faces, color):
+    sceneobject.indexed = False
+    mesh = sceneobject.draw_faces(faces, color)
+    return mesh.geometry.attributes["position"].array, mesh.geometry.attributes["color"].array
+
+
+def draw_faces_indexed(sceneobject, faces, color):
+    sceneobject.indexed = True
+    group = sceneobject.draw_faces(faces, color)
+    meshes = group.children if isinstance(group, three.Group) else [group]
+    position = meshes[0].geometry.attributes["position"].array
+    return position.nbytes + sum(mesh.geometry.attributes["index"].array.nbytes for mesh in meshes)
+
+
+def benchmark(size):
+    n = int(math.sqrt(size))
+    mesh = Mesh.from_meshgrid(dx=1.0, nx=n)
+
+    scene = Scene(context="Notebook")
+    sceneobject = scene.add(mesh)
+    faces = list(mesh.faces())
+    for face in faces[::10]:
+        sceneobject.facecolor[face] = Color.red()
+    sceneobject.vertex_xyz  # noqa: B018
+
+    t0 = time.perf_counter()
+    expected = draw_faces_loop(sceneobject, faces, sceneobject.facecolor)
+    t1 = time.perf_counter()
+    result = draw_faces_batched(sceneobject, faces, sceneobject.facecolor)
+    t2 = time.perf_counter()
+    indexed = draw_faces_indexed(sceneobject, faces, sceneobject.facecolor)
+
+    assert numpy.allclose(expected[0], result[0])
+    assert numpy.allclose(expected[1], result[1])
+
+    unindexed = result[0].nbytes + result[1].nbytes
+    print(
+        f"{mesh.number_of_faces():>10} faces | loop {t1 - t0:8.3f}s | batched {t2 - t1:8.3f}s"
+        f" | speedup {(t1 - t0) / (t2 - t1):6.1f}x"
+        f" | unindexed {unindexed / 1e6:8.1f}MB | indexed {indexed / 1e6:8.1f}MB"
+    )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for size in sizes:
+        benchmark(size)
@@ -0,0 +1,84 @@
+"""Benchmark the standalone HTML export of ``compas_notebook.viewer.Viewer.export_html``.
+
+Compares the size of the exported page with the page written by ``ipywidgets.embed.embed_minimal_html``,
+for meshes of increasing size, with plain float buffers and with quantized buffers.
+As an indication of the time needed to open the page, the time to decode the embedded state is compared
+with the time to draw the scene in the kernel, which is needed when the notebook is executed again.
+
+Usage::
+
+    python scripts/benchmark_export.py
+    python scripts/benchmark_export.py 10000 100000 1000000
+
+"""
+
+import base64
+import json
+import pathlib
+import re
+import sys
+import tempfile
+import time
+import zlib
+
+from compas.datastructures import Mesh
+from ipywidgets import Widget
+from ipywidgets.embed import embed_minimal_html
+
+from compas_notebook.viewer import Viewer
+
+LEVELS = [0, 1, 6]
+
+
+def decode(path):
+    """Parse the embedded widget state of a page, and decode and decompress all of its buffers."""
+    html = pathlib.Path(path).read_text()
+    data = re.search(r'widget-state\+json">\s*(.*?)\s*</script>', html, re.DOTALL).group(1)
+    for entry in json.loads(data)["state"].values():
+        for buffer in entry.get("buffers", []):
+            data = base64.b64decode(buffer["data"])
+            if buffer["path"][-1] == "compressed_buffer":
+                zlib.decompress(data)
+
+
+def benchmark(faces, quantization, folder):
+    # embed_minimal_html embeds all widgets that exist, which should only be those of this viewer
+    Widget.close_all()
+    viewer = Viewer()
+    viewer.config.view.quantization = quantization
+    viewer.scene.add(Mesh.from_meshgrid(dx=10.0, nx=int(faces**0.5)), show_edges=True)
+    viewer.init_webgl()
+    t0 = time.perf_counter()
+    viewer.update()
+    draw = time.perf_counter() - t0
+
+    encoding = "quantized" if quantization else "float"
+    row = f"{faces:>9} faces | {encoding:>9} | draw {draw:6.3f}s"
+
+    path = folder / "minimal.html"
+    t0 = time.perf_counter()
+    embed_minimal_html(path, views=[viewer.renderer3], requirejs=True)
+    t1 = time.perf_counter()
+    decode(path)
+    t2 = time.perf_counter()
+    row += f" | minimal {path.stat().st_size / 1e6:7.2f}MB {t1 - t0:6.3f}s, decode {t2 - t1:6.3f}s"
+
+    for level in LEVELS:
+        path = folder / f"export{level}.html"
+        t0 = time.perf_counter()
+        size = viewer.export_html(path, level=level)
+        t1 = time.perf_counter()
+        decode(path)
+        t2 = time.perf_counter()
+        row += f" | L{level} {size / 1e6:7.2f}MB {t1 - t0:6.3f}s, decode {t2 - t1:6.3f}s"
+
+    viewer.config.view.quantization = False
+    print(row)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    with tempfile.TemporaryDirectory() as folder:
+        for size in sizes:
+            for quantization in (False, True):
+                benchmark(size, quantization, pathlib.Path(folder))
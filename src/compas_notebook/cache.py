@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Hashable
+
+
+class Cache:
+    """A cache of objects, keyed on the parameters that define them.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of items in the cache.
+        If the cache is full, the least recently used item is discarded.
+        If ``None``, the cache is unbounded.
+
+    Attributes
+    ----------
+    hits : int
+        The number of lookups that were served from the cache.
+    misses : int
+        The number of lookups that required a new item to be created.
+
+    Examples
+    --------
+    >>> cache = Cache()
+    >>> a = cache.get(("box", 1, 1, 1), lambda: object())
+    >>> b = cache.get(("box", 1, 1, 1), lambda: object())
+    >>> a is b
+    True
+    >>> cache.hits, cache.misses
+    (1, 1)
+
+    """
+
+    def __init__(self, maxsize: int = None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Get the item stored under a key, or create and store it if it doesn't exist yet.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the item.
+        factory : callable
+            A function without arguments that creates the item if it is not in the cache.
+
+        Returns
+        -------
+        Any
+
+        """
+        if key in self._items:
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+        self.misses += 1
+        item = factory()
+        self._items[key] = item
+        if self.maxsize is not None and len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        return item
+
+    def clear(self) -> None:
+        """Remove all items from the cache and reset the statistics."""
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
@@ -2,6 +2,7 @@ import json
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Literal
+from typing import Union
 
 from compas.colors import Color
 
@@ -24,6 +25,23 @@ class ViewConfig:
     height: float = 580
     show_grid: bool = True
     show_axes: bool = True
+    instancing: Literal["auto", "always", "never"] = "auto"
+    instancing_threshold: int = 100
+    merging: bool = False
+    batchsize: int = 100
+    quantization: bool = False
+    compression: int = 0
+    compression_threshold: int = 1_000_000
+    resolution: Union[int, Literal["auto"]] = 32
+    resolution_min: int = 8
+    resolution_max: int = 64
+    pointcloud_budget: int = 1_000_000
+    pointcloud_chunksize: int = 100_000
+    pointcloud_decimation: Literal["voxel", "random"] = "voxel"
+    triangulation_workers: int = 0
+    triangulation_chunksize: int = 1000
+    triangulation_cachesize: int = 100_000
+    geometry_cachesize: int = 10_000
 
     camera: CameraConfig = field(init=False)
 
@@ -42,6 +60,7 @@ class SidebarConfig:
 class UIConfig:
     show_toolbar: bool = True
     show_statusbar: bool = True
+    show_stats: bool = False
 
     sidebar = SidebarConfig()
 
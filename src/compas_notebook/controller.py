@@ -32,7 +32,7 @@ class Controller:
         Raises
         ------
         NotImplementedError
-            If the value of ``self.viewer.viewport`` is anything other than ``{'perspective', 'top'}``
+            If the value of ``self.viewer.config.view.viewport`` is anything other than ``{'perspective', 'top'}``
 
         Warnings
         --------
@@ -50,11 +50,11 @@ class Controller:
         cx, cy, cz = (xmin + xmax) / 2, (ymin + ymax) / 2, (zmin + zmax) / 2
         d = max(dx, dy, dz)
 
-        if self.viewer.viewport == "perspective":
+        if self.viewer.config.view.viewport == "perspective":
             self.viewer.camera3.position = [cx, cy - 2 * d, cz + 0.5 * dz]
             self.viewer.controls3.target = [cx, cy, cz]
 
-        elif self.viewer.viewport == "top":
+        elif self.viewer.config.view.viewport == "top":
             self.viewer.camera3.position = [cx, cy, cz + d]
             self.viewer.camera3.zoom = min(0.75 * width / d, 0.75 * height / d)
             self.viewer.controls3.target = [cx, cy, cz]
@@ -106,35 +106,54 @@ class Controller:
         self.viewer.camera3.position = list(target + direction * 2.0)
         self.viewer.controls3.target = list(target)
 
-    # move this to the scene
-    # add a BVH to the scene
     def scene_bounds(self):
-        """Compute the axis-aligned bounding box of the scene."""
-        xmin = ymin = zmin = +1e12
-        xmax = ymax = zmax = -1e12
-        for obj in self.viewer.scene.objects:
-            if hasattr(obj, "mesh"):
-                box = obj.mesh.aabb
-            elif hasattr(obj, "geometry"):
-                box = obj.geometry.aabb
-            elif hasattr(obj, "brep"):
-                box = obj.brep.aabb
-            else:
-                continue
-            xmin = min(xmin, box.xmin)
-            ymin = min(ymin, box.ymin)
-            zmin = min(zmin, box.zmin)
-            xmax = max(xmax, box.xmax)
-            ymax = max(ymax, box.ymax)
-            zmax = max(zmax, box.zmax)
-        return xmin, ymin, zmin, xmax, ymax, zmax
+        """Compute the axis-aligned bounding box of the scene.
+
+        The bounds are obtained from the spatial index of the viewer,
+        which only recomputes the bounding boxes of objects that were redrawn or moved since they were indexed.
+
+        Returns
+        -------
+        tuple[float, float, float, float, float, float]
+            The bounds, as ``(xmin, ymin, zmin, xmax, ymax, zmax)``.
+            If the scene is empty, the minimum is larger than the maximum.
+
+        """
+        bounds = self.viewer.sceneindex.update(self.viewer.scene.objects).bounds
+        if bounds is None:
+            return +1e12, +1e12, +1e12, -1e12, -1e12, -1e12
+        return bounds
 
     # =============================================================================
     # Show/Hide
     # =============================================================================
 
-    def on_toggle_vertices(self, change):
+    def toggle(self, part: str, show: bool) -> None:
+        """Show or hide a part of all scene objects that have it.
+
+        Objects that draw their parts separately, such as meshes and graphs, are not redrawn.
+        Only the visibility of the existing pythreejs objects of the part is updated,
+        and the part is drawn the first time it is shown.
+        See :meth:`compas_notebook.scene.ThreeSceneObject.draw_visibility`.
+
+        Parameters
+        ----------
+        part : str
+            The name of the part, for example ``"vertices"``, ``"edges"`` or ``"faces"``.
+        show : bool
+            If True, show the part, otherwise hide it.
+
+        """
         for obj in self.viewer.scene.objects:
-            if hasattr(obj, "show_vertices"):
-                obj.show_vertices = change["new"]
+            if hasattr(obj, f"show_{part}"):
+                setattr(obj, f"show_{part}", show)
         self.viewer.update()
+
+    def on_toggle_vertices(self, change):
+        self.toggle("vertices", change["new"])
+
+    def on_toggle_edges(self, change):
+        self.toggle("edges", change["new"])
+
+    def on_toggle_faces(self, change):
+        self.toggle("faces", change["new"])
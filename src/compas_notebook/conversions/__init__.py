@@ -3,6 +3,7 @@ from .colors import color_to_threejs
 from .geometry import box_to_threejs
 from .geometry import cone_to_threejs
 from .geometry import cylinder_to_threejs
+from .geometry import decimate_points
 from .geometry import line_to_threejs
 from .geometry import point_to_threejs
 from .geometry import pointcloud_to_threejs
@@ -10,27 +11,53 @@ from .geometry import polyline_to_threejs
 from .geometry import sphere_to_threejs
 from .geometry import torus_to_threejs
 
+from .compression import attribute_array
+from .compression import compress_objects
+from .compression import set_attribute_array
+
+from .instances import instanced_material
+from .instances import instances_to_threejs
+
+from .graphs import node_indices
 from .graphs import nodes_and_edges_to_threejs
 from .graphs import nodes_to_threejs
 
+from .meshes import earclip_faces
+from .meshes import triangulate_faces
 from .meshes import vertices_and_edges_to_threejs
 from .meshes import vertices_and_faces_to_threejs
 from .meshes import vertices_to_threejs
 
+from .quantization import quantize_colors
+from .quantization import quantize_objects
+from .quantization import quantize_positions
+
 
 __all__ = [
+    "attribute_array",
     "box_to_threejs",
     "color_to_threejs",
+    "compress_objects",
     "cone_to_threejs",
     "cylinder_to_threejs",
+    "decimate_points",
+    "earclip_faces",
+    "instanced_material",
+    "instances_to_threejs",
     "line_to_threejs",
+    "node_indices",
     "nodes_and_edges_to_threejs",
     "nodes_to_threejs",
     "point_to_threejs",
     "pointcloud_to_threejs",
     "polyline_to_threejs",
+    "quantize_colors",
+    "quantize_objects",
+    "quantize_positions",
+    "set_attribute_array",
     "sphere_to_threejs",
     "torus_to_threejs",
+    "triangulate_faces",
     "vertices_and_edges_to_threejs",
     "vertices_and_faces_to_threejs",
     "vertices_to_threejs",
@@ -0,0 +1,95 @@
+import numpy
+import pythreejs as three
+from ipydatawidgets import NDArrayWidget
+
+
+def attribute_array(attribute: three.BufferAttribute) -> numpy.ndarray:
+    """Get the data of a buffer attribute, also if it is wrapped in an array widget for compressed transport.
+
+    Parameters
+    ----------
+    attribute : :class:`three.BufferAttribute`
+        The buffer attribute.
+
+    Returns
+    -------
+    numpy.ndarray
+
+    """
+    if isinstance(attribute.array, NDArrayWidget):
+        return attribute.array.array
+    return attribute.array
+
+
+def set_attribute_array(attribute: three.BufferAttribute, array: numpy.ndarray) -> None:
+    """Replace the data of a buffer attribute, and keep it compressed if it was compressed before.
+
+    Parameters
+    ----------
+    attribute : :class:`three.BufferAttribute`
+        The buffer attribute.
+    array : numpy.ndarray
+        The new data.
+
+    """
+    if isinstance(attribute.array, NDArrayWidget):
+        attribute.array.array = array
+    else:
+        attribute.array = array
+
+
+def compress_objects(objects: list[three.Object3D], level: int = 1, threshold: int = 1_000_000) -> int:
+    """Compress the large buffers of the geometries of PyThreeJS objects for transport to the notebook.
+
+    The data of every buffer attribute of at least ``threshold`` bytes is wrapped in an array widget
+    that is compressed with zlib before it is sent, and decompressed by the notebook when it is received.
+    Small buffers are sent as is, because for those the cost of compression outweighs the bytes saved.
+    Buffers that are shared by multiple objects are compressed once.
+
+    Parameters
+    ----------
+    objects : list[:class:`three.Object3D`]
+        The objects, including groups of which the children will be compressed as well.
+    level : int, optional
+        The zlib compression level, from 1 (fastest) to 9 (smallest).
+    threshold : int, optional
+        The minimum size of a buffer in bytes.
+
+    Returns
+    -------
+    int
+        The number of uncompressed bytes of the buffers that were compressed.
+
+    Examples
+    --------
+    >>> import numpy
+    >>> import pythreejs as three
+    >>> positions = numpy.zeros((100_000, 3), dtype=numpy.float32)
+    >>> geometry = three.BufferGeometry(attributes={"position": three.BufferAttribute(positions)})
+    >>> compress_objects([three.Points(geometry, three.PointsMaterial())])
+    1200000
+
+    """
+    compressed = 0
+    seen = set()
+    stack = list(objects)
+
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, three.Group):
+            stack.extend(obj.children)
+            continue
+        geometry = getattr(obj, "geometry", None)
+        if not isinstance(geometry, three.BufferGeometry):
+            continue
+
+        for attribute in geometry.attributes.values():
+            if attribute.model_id in seen:
+                continue
+            seen.add(attribute.model_id)
+            if not isinstance(attribute.array, numpy.ndarray) or attribute.array.nbytes < threshold:
+                continue
+            compressed += attribute.array.nbytes
+            attribute.array = NDArrayWidget(attribute.array, compression_level=level)
+
+    return compressed
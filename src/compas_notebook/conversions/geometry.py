@@ -75,6 +75,93 @@ def pointcloud_to_threejs(pointcloud: Pointcloud) -> three.SphereGeometry:
     return geometry
 
 
+def decimate_points(points, size: int, method: str = "voxel", seed: int = 0) -> numpy.ndarray:
+    """Select a representative subset of a large collection of points.
+
+    Parameters
+    ----------
+    points : array-like
+        The point coordinates, with shape ``(n, 3)``.
+    size : int
+        The maximum number of points in the subset.
+    method : {"voxel", "random"}, optional
+        With ``"voxel"``, the points are binned in a regular grid of cubic cells,
+        of which the size is adjusted such that the number of occupied cells approaches ``size``,
+        and one random point is selected per occupied cell.
+        This preserves sparse regions better than random sampling.
+        With ``"random"``, the points are sampled uniformly.
+    seed : int, optional
+        The seed of the random number generator.
+        With the same seed, a random subset of a smaller size is contained in a random subset of a larger size.
+
+    Returns
+    -------
+    numpy.ndarray
+        The sorted indices of the selected points.
+
+    Raises
+    ------
+    ValueError
+        If the method is not supported.
+
+    Examples
+    --------
+    >>> points = numpy.random.default_rng(0).random((10000, 3))
+    >>> indices = decimate_points(points, 1000)
+    >>> len(indices) <= 1000
+    True
+
+    """
+    if method not in ("voxel", "random"):
+        raise ValueError(f"Decimation method not supported: {method}")
+
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 3)
+    n = len(points)
+    if size >= n:
+        return numpy.arange(n)
+
+    rng = numpy.random.default_rng(seed)
+    order = rng.permutation(n)
+    if method == "random":
+        return numpy.sort(order[:size])
+
+    # the points are visited in random order,
+    # such that the first point of every cell is a random point of that cell
+    points = points[order]
+    lower = points.min(axis=0)
+    extent = points.max(axis=0) - lower
+    dimensions = max(int(numpy.count_nonzero(extent)), 1)
+    cellsize = (numpy.prod(extent[extent > 0]) / size) ** (1 / dimensions)
+
+    def occupied(count):
+        cells = numpy.floor((points[:count] - lower) / cellsize).astype(numpy.int64)
+        # the cells are deduplicated by row instead of by a flat index over the full extent of the grid,
+        # which overflows if a few outliers are far away from dense clusters of points.
+        # like numpy.unique(cells, axis=0, return_index=True), but a stable lexsort is a lot faster
+        ordered = numpy.lexsort(cells.T[::-1])
+        cells = cells[ordered]
+        first = numpy.ones(len(cells), dtype=bool)
+        first[1:] = (cells[1:] != cells[:-1]).any(axis=1)
+        return ordered[first]
+
+    # the cell size is calibrated on a sample of the points first,
+    # to limit the number of passes over all points
+    best = None
+    for count in (min(n, 8 * size), n):
+        for _ in range(8):
+            first = occupied(count)
+            if count == n and len(first) <= size and (best is None or len(first) > len(best)):
+                best = first
+            if 0.9 * size <= len(first) <= size:
+                break
+            # occupied cells scale with the inverse square of the cell size for points sampled from surfaces
+            cellsize *= (len(first) / size) ** 0.5
+
+    if best is None:
+        best = first[rng.permutation(len(first))[:size]]
+    return numpy.sort(order[best])
+
+
 def polyline_to_threejs(polyline: Polyline) -> three.BufferGeometry:
     """Convert a COMPAS polyline to PyThreeJS.
 
@@ -121,13 +208,15 @@ def box_to_threejs(box: Box) -> three.BoxGeometry:
     return three.BoxGeometry(width=box.width, height=box.height, depth=box.depth)
 
 
-def cone_to_threejs(cone: Cone) -> three.CylinderGeometry:
+def cone_to_threejs(cone: Cone, u: int = 32) -> three.CylinderGeometry:
     """Convert a COMPAS cone to PyThreeJS.
 
     Parameters
     ----------
     cone : :class:`compas.geometry.Cone`
         The cone to convert.
+    u : int, optional
+        The number of segments around the axis of the cone.
 
     Returns
     -------
@@ -145,17 +234,19 @@ def cone_to_threejs(cone: Cone) -> three.CylinderGeometry:
         radiusTop=0,
         radiusBottom=cone.radius,
         height=cone.height,
-        radialSegments=32,
+        radialSegments=u,
     )
 
 
-def cylinder_to_threejs(cylinder: Cylinder) -> three.CylinderGeometry:
+def cylinder_to_threejs(cylinder: Cylinder, u: int = 32) -> three.CylinderGeometry:
     """Convert a COMPAS cylinder to PyThreeJS.
 
     Parameters
     ----------
     cylinder : :class:`compas.geometry.Cylinder`
         The cylinder to convert.
+    u : int, optional
+        The number of segments around the axis of the cylinder.
 
     Returns
     -------
@@ -173,17 +264,21 @@ def cylinder_to_threejs(cylinder: Cylinder) -> three.CylinderGeometry:
         radiusTop=cylinder.radius,
         radiusBottom=cylinder.radius,
         height=cylinder.height,
-        radialSegments=32,
+        radialSegments=u,
     )
 
 
-def sphere_to_threejs(sphere: Sphere) -> three.SphereGeometry:
+def sphere_to_threejs(sphere: Sphere, u: int = 32, v: int = 32) -> three.SphereGeometry:
     """Convert a COMPAS sphere to PyThreeJS.
 
     Parameters
     ----------
     sphere : :class:`compas.geometry.Sphere`
         The sphere to convert.
+    u : int, optional
+        The number of segments around the polar axis.
+    v : int, optional
+        The number of segments from pole to pole.
 
     Returns
     -------
@@ -197,16 +292,20 @@ def sphere_to_threejs(sphere: Sphere) -> three.SphereGeometry:
     SphereGeometry(...)
 
     """
-    return three.SphereGeometry(radius=sphere.radius, widthSegments=32, heightSegments=32)
+    return three.SphereGeometry(radius=sphere.radius, widthSegments=u, heightSegments=v)
 
 
-def torus_to_threejs(torus: Torus) -> three.TorusGeometry:
+def torus_to_threejs(torus: Torus, u: int = 32, v: int = 64) -> three.TorusGeometry:
     """Convert a COMPAS torus to a PyThreeJS torus geometry.
 
     Parameters
     ----------
     torus : :class:`compas.geometry.Torus`
         The torus to convert.
+    u : int, optional
+        The number of segments around the main axis.
+    v : int, optional
+        The number of segments around the pipe axis.
 
     Returns
     -------
@@ -224,6 +323,6 @@ def torus_to_threejs(torus: Torus) -> three.TorusGeometry:
     return three.TorusGeometry(
         radius=torus.radius_axis,
         tube=torus.radius_pipe,
-        radialSegments=64,
-        tubularSegments=32,
+        radialSegments=v,
+        tubularSegments=u,
     )
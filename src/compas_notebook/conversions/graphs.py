@@ -1,25 +1,112 @@
+from itertools import chain
+
 import numpy
 import pythreejs as three
 
+# integer keys are mapped through a lookup array if it is at most this many times larger than the number of keys
+LOOKUP_SPARSITY = 4
+
+
+def node_indices(keys, nodes) -> numpy.ndarray:
+    """Map node keys to their position in a sequence of keys.
+
+    Integer and string keys are mapped with NumPy, without any per-node Python work.
+    Small non-negative integers, such as the default node keys of a graph, are mapped through a lookup array,
+    other integers and strings by a binary search in the sorted keys.
+    Other keys, for example tuples, are mapped with a dictionary.
+
+    Parameters
+    ----------
+    keys : sequence
+        The keys of all nodes.
+    nodes : sequence | numpy.ndarray
+        The keys to map, for example the nodes of the edges of a graph, one after the other.
+
+    Returns
+    -------
+    numpy.ndarray
+        The positions of the nodes in ``keys``.
 
-def nodes_and_edges_to_threejs(nodes, edges) -> three.BufferGeometry:
+    Raises
+    ------
+    KeyError
+        If any of the nodes is not in the keys.
+
+    Examples
+    --------
+    >>> node_indices([10, 2, 7], [7, 10, 7]).tolist()
+    [2, 0, 2]
+    >>> node_indices(["a", "c", "b"], ["b", "a"]).tolist()
+    [2, 0]
+
+    """
+    keyarray = numpy.asarray(keys)
+    if keyarray.ndim != 1 or keyarray.dtype.kind not in "iuU":
+        index = {key: i for i, key in enumerate(keys)}
+        return numpy.array([index[node] for node in nodes], dtype=numpy.int64).reshape(-1)
+
+    nodes = numpy.asarray(nodes if isinstance(nodes, numpy.ndarray) else list(nodes))
+    if not len(nodes):
+        return numpy.zeros(0, dtype=numpy.int64)
+    if nodes.dtype.kind != keyarray.dtype.kind and {nodes.dtype.kind, keyarray.dtype.kind} != {"i", "u"}:
+        raise KeyError(nodes[0].item())
+
+    if keyarray.dtype.kind in "iu" and keyarray.min() >= 0 and keyarray.max() < LOOKUP_SPARSITY * len(keyarray):
+        if nodes.min() < 0 or nodes.max() > keyarray.max():
+            raise KeyError(nodes[(nodes < 0) | (nodes > keyarray.max())][0].item())
+        lookup = numpy.full(keyarray.max() + 1, -1, dtype=numpy.int64)
+        lookup[keyarray] = numpy.arange(len(keyarray))
+        indices = lookup[nodes]
+        if (indices < 0).any():
+            raise KeyError(nodes[indices < 0][0].item())
+        return indices
+
+    order = numpy.argsort(keyarray, kind="stable")
+    sortedkeys = keyarray[order]
+    positions = numpy.searchsorted(sortedkeys, nodes).clip(0, len(sortedkeys) - 1)
+    found = sortedkeys[positions] == nodes
+    if not found.all():
+        raise KeyError(nodes[~found][0].item())
+    return order[positions]
+
+
+def nodes_and_edges_to_threejs(nodes, edges, keys=None, mask=None) -> three.BufferGeometry:
     """Convert nodes and edges to a PyThreeJS geometry.
 
     Parameters
     ----------
-    nodes : list
-        List of nodes.
-    edges : list
-        List of edges.
+    nodes : list | numpy.ndarray
+        List of nodes, or an array of node coordinates with shape ``(n, 3)``.
+    edges : list | numpy.ndarray
+        List of edges, as pairs of indices into the nodes, or as pairs of node keys if ``keys`` are given.
+    keys : sequence, optional
+        The keys of the nodes, in the order of the nodes.
+        The keys of the edges are mapped to indices with :func:`node_indices`.
+    mask : array-like, optional
+        A boolean array that selects the edges to draw,
+        such that subsets of the edges of a graph can be drawn without rebuilding the node positions.
 
     Returns
     -------
     :class:`three.BufferGeometry`
         The PyThreeJS geometry.
 
+    Examples
+    --------
+    >>> nodes = [[0, 0, 0], [1, 0, 0], [1, 1, 0]]
+    >>> geometry = nodes_and_edges_to_threejs(nodes, [("a", "b"), ("b", "c")], keys=["a", "b", "c"])
+    >>> geometry.attributes["index"].array.tolist()
+    [0, 1, 1, 2]
+
     """
-    nodes = numpy.array(nodes, dtype=numpy.float32)
-    edges = numpy.array(edges, dtype=numpy.uint32).ravel()
+    nodes = numpy.asarray(nodes, dtype=numpy.float32)
+    if keys is not None:
+        edges = edges.ravel() if isinstance(edges, numpy.ndarray) else chain.from_iterable(edges)
+        edges = node_indices(keys, edges)
+    edges = numpy.asarray(edges, dtype=numpy.int64).reshape(-1, 2)
+    if mask is not None:
+        edges = edges[numpy.asarray(mask, dtype=bool)]
+    edges = edges.astype(numpy.uint32).ravel()
 
     geometry = three.BufferGeometry(
         attributes={
@@ -31,13 +118,16 @@ def nodes_and_edges_to_threejs(nodes, edges) -> three.BufferGeometry:
     return geometry
 
 
-def nodes_to_threejs(nodes) -> three.BufferGeometry:
+def nodes_to_threejs(nodes, mask=None) -> three.BufferGeometry:
     """Convert nodes to a PyThreeJS geometry.
 
     Parameters
     ----------
-    nodes : list
-        List of nodes.
+    nodes : list | numpy.ndarray
+        List of nodes, or an array of node coordinates with shape ``(n, 3)``.
+    mask : array-like, optional
+        A boolean array that selects the nodes to draw.
+        The geometry keeps the positions of all nodes, and only draws the selected nodes through an index.
 
     Returns
     -------
@@ -45,6 +135,10 @@ def nodes_to_threejs(nodes) -> three.BufferGeometry:
         The PyThreeJS geometry.
 
     """
-    nodes = numpy.array(nodes, dtype=numpy.float32)
-    geometry = three.BufferGeometry(attributes={"position": three.BufferAttribute(nodes, normalized=False)})
+    nodes = numpy.asarray(nodes, dtype=numpy.float32)
+    attributes = {"position": three.BufferAttribute(nodes, normalized=False)}
+    if mask is not None:
+        index = numpy.flatnonzero(numpy.asarray(mask, dtype=bool)).astype(numpy.uint32)
+        attributes["index"] = three.BufferAttribute(index, normalized=False, itemSize=1)
+    geometry = three.BufferGeometry(attributes=attributes)
     return geometry
@@ -0,0 +1,95 @@
+import numpy
+import pythreejs as three
+from compas.colors import Color
+
+INSTANCED_VERTEXSHADER = """
+attribute vec4 instanceMatrix0;
+attribute vec4 instanceMatrix1;
+attribute vec4 instanceMatrix2;
+attribute vec4 instanceMatrix3;
+#ifdef USE_INSTANCE_COLOR
+attribute vec3 instanceColor;
+#endif
+uniform vec3 diffuse;
+varying vec3 vColor;
+
+void main() {
+    mat4 instanceMatrix = mat4(instanceMatrix0, instanceMatrix1, instanceMatrix2, instanceMatrix3);
+#ifdef USE_INSTANCE_COLOR
+    vColor = instanceColor;
+#else
+    vColor = diffuse;
+#endif
+    gl_Position = projectionMatrix * modelViewMatrix * instanceMatrix * vec4(position, 1.0);
+}
+"""
+
+INSTANCED_FRAGMENTSHADER = """
+varying vec3 vColor;
+
+void main() {
+    gl_FragColor = vec4(vColor, 1.0);
+}
+"""
+
+
+def instances_to_threejs(geometry: three.BufferGeometry, matrices, colors=None) -> three.InstancedBufferGeometry:
+    """Convert a base geometry and a stack of transformation matrices to a PyThreeJS instanced geometry.
+
+    The buffers of the base geometry are shared with the instanced geometry, not copied.
+    Per instance, only the transformation matrix and optionally a color are added.
+
+    Parameters
+    ----------
+    geometry : :class:`three.BufferGeometry`
+        The base geometry, with a position attribute and optionally an index.
+    matrices : array-like
+        The transformation matrices of the instances, with shape ``(n, 4, 4)``, in row-major order.
+    colors : array-like, optional
+        The RGB colors of the instances, with shape ``(n, 3)``.
+
+    Returns
+    -------
+    :class:`three.InstancedBufferGeometry`
+        The PyThreeJS geometry.
+
+    """
+    matrices = numpy.asarray(matrices, dtype=numpy.float32)
+
+    attributes = dict(geometry.attributes)
+    # GLSL matrices are constructed from columns
+    for i in range(4):
+        column = numpy.ascontiguousarray(matrices[:, :, i])
+        attributes[f"instanceMatrix{i}"] = three.InstancedBufferAttribute(column, meshPerAttribute=1)
+    if colors is not None:
+        colors = numpy.asarray(colors, dtype=numpy.float32)
+        attributes["instanceColor"] = three.InstancedBufferAttribute(colors, meshPerAttribute=1)
+
+    return three.InstancedBufferGeometry(attributes=attributes, maxInstancedCount=len(matrices))
+
+
+def instanced_material(color: Color, vertexcolors: bool = False, side: str = "DoubleSide") -> three.ShaderMaterial:
+    """Construct a material for drawing instanced geometry.
+
+    Parameters
+    ----------
+    color : :class:`compas.colors.Color`
+        The color of all instances, if they don't have individual colors.
+    vertexcolors : bool, optional
+        If True, use the ``instanceColor`` attribute of the geometry instead of ``color``.
+    side : {"FrontSide", "BackSide", "DoubleSide"}, optional
+        The side of the faces that is rendered.
+
+    Returns
+    -------
+    :class:`three.ShaderMaterial`
+
+    """
+    return three.ShaderMaterial(
+        vertexShader=INSTANCED_VERTEXSHADER,
+        fragmentShader=INSTANCED_FRAGMENTSHADER,
+        # pythreejs only converts the hex string of uniforms of type "c" to a THREE.Color
+        uniforms={"diffuse": {"type": "c", "value": color.hex}},
+        defines={"USE_INSTANCE_COLOR": 1} if vertexcolors else {},
+        side=side,
+    )
@@ -1,40 +1,255 @@
+import typing
+from concurrent.futures import BrokenExecutor
+from concurrent.futures import Executor
+from itertools import chain
+from typing import Optional
+
 import numpy
 import pythreejs as three
 from compas.geometry import Polygon
 from compas.geometry import earclip_polygon
 
+if typing.TYPE_CHECKING:
+    from compas_notebook.cache import Cache
+
+# triangle and quad splitting patterns, as indices into the face vertices
+FACE_TRIANGLES = {
+    3: numpy.array([[0, 1, 2]]),
+    4: numpy.array([[0, 1, 2], [0, 2, 3]]),
+}
+
+
+def earclip_faces(points: numpy.ndarray, degrees: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Triangulate faces one by one, using ear clipping.
+
+    Parameters
+    ----------
+    points : numpy.ndarray
+        The coordinates of the corners of all faces, one face after the other, with shape ``(n, 3)``.
+    degrees : numpy.ndarray
+        The number of corners of every face.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The triangles, as indices into ``points`` with shape ``(m, 3)``,
+        and the number of triangles of every face.
+
+    Examples
+    --------
+    >>> points = numpy.array([[0, 0, 0], [1, 0, 0], [2, 1, 0], [1, 2, 0], [0, 1, 0]])
+    >>> triangles, counts = earclip_faces(points, numpy.array([5]))
+    >>> len(triangles), counts.tolist()
+    (3, [3])
+
+    """
+    triangles = [numpy.zeros((0, 3), dtype=numpy.int64)]
+    counts = numpy.zeros(len(degrees), dtype=numpy.int64)
+    offset = 0
+    for i, degree in enumerate(degrees.tolist()):
+        ears = earclip_polygon(Polygon(points[offset : offset + degree].tolist()))
+        triangles.append(numpy.array(ears, dtype=numpy.int64).reshape(-1, 3) + offset)
+        counts[i] = len(ears)
+        offset += degree
+    return numpy.concatenate(triangles), counts
+
+
+def _face_corners(offsets: numpy.ndarray, degrees: numpy.ndarray) -> numpy.ndarray:
+    # the positions of the corners of a selection of faces in the corners of all faces
+    shift = numpy.repeat(offsets - (numpy.cumsum(degrees) - degrees), degrees)
+    return numpy.arange(len(shift)) + shift
+
+
+def _earclip_chunks(
+    points: numpy.ndarray, degrees: numpy.ndarray, executor: Optional[Executor], chunksize: int
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    # chunks of faces are triangulated by the workers of the executor,
+    # and the results are merged in the order of the chunks, such that the output doesn't depend on the workers
+    if executor is not None and len(degrees) > chunksize:
+        starts = numpy.arange(0, len(degrees), chunksize)
+        offsets = numpy.concatenate([[0], numpy.cumsum(degrees)])[starts]
+        ends = numpy.append(offsets[1:], len(points))
+        chunks = [degrees[start : start + chunksize] for start in starts]
+        try:
+            results = list(executor.map(earclip_faces, [points[a:b] for a, b in zip(offsets, ends)], chunks))
+        except (BrokenExecutor, OSError):
+            pass
+        else:
+            triangles = numpy.concatenate([t + offset for (t, _), offset in zip(results, offsets)])
+            return triangles, numpy.concatenate([counts for _, counts in results])
+    return earclip_faces(points, degrees)
+
+
+def _earclip_ngons(
+    points: numpy.ndarray,
+    degrees: numpy.ndarray,
+    executor: Optional[Executor],
+    chunksize: int,
+    cache: Optional["Cache"],
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    if cache is None:
+        return _earclip_chunks(points, degrees, executor, chunksize)
+
+    # faces are identified by the coordinates of their corners relative to their first corner,
+    # such that translated copies of a face share a triangulation
+    offsets = numpy.cumsum(degrees) - degrees
+    keys = []
+    for offset, degree in zip(offsets.tolist(), degrees.tolist()):
+        local = numpy.round(points[offset : offset + degree] - points[offset], 9) + 0.0
+        keys.append(local.tobytes())
+
+    # faces that are not in the cache are triangulated together, once per distinct shape
+    missing = {}
+    for i, key in enumerate(keys):
+        if key not in missing and key not in cache:
+            missing[key] = i
+    computed = {}
+    if missing:
+        selection = numpy.array(list(missing.values()), dtype=numpy.int64)
+        ears, counts = _earclip_chunks(
+            points[_face_corners(offsets[selection], degrees[selection])], degrees[selection], executor, chunksize
+        )
+        starts = numpy.cumsum(degrees[selection]) - degrees[selection]
+        ends = numpy.cumsum(counts)
+        for key, start, end, count in zip(missing, starts, ends, counts):
+            computed[key] = ears[end - count : end] - start
+
+    def triangulate(i):
+        # faces that were evicted from a full cache while it was updated are triangulated again
+        if keys[i] not in computed:
+            computed[keys[i]] = earclip_faces(points[offsets[i] : offsets[i] + degrees[i]], degrees[i : i + 1])[0]
+        return computed[keys[i]]
+
+    results = [cache.get(key, lambda i=i: triangulate(i)) for i, key in enumerate(keys)]
+    triangles = numpy.concatenate([numpy.zeros((0, 3), dtype=numpy.int64)] + [r + o for r, o in zip(results, offsets)])
+    return triangles, numpy.array([len(result) for result in results], dtype=numpy.int64)
 
-def vertices_and_faces_to_threejs(vertices, faces) -> three.BufferGeometry:
+
+def triangulate_faces(
+    vertices, faces, executor: Optional[Executor] = None, chunksize: int = 1000, cache: Optional["Cache"] = None
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Triangulate faces with an arbitrary number of vertices.
+
+    Faces are grouped by degree.
+    Triangles and quads are split for all faces at once, using fixed index patterns.
+    Only faces with more than four vertices are triangulated one by one, using ear clipping,
+    in chunks that are distributed over the workers of an executor, if one is given.
+    Faces of the same degree can be given as an integer array, which is split without any per-face Python work.
+
+    Parameters
+    ----------
+    vertices : array-like
+        The vertex coordinates, with shape ``(n, 3)``.
+        The coordinates are only used for the triangulation of faces with more than four vertices.
+    faces : list[list[int]] | numpy.ndarray
+        The faces, as lists of indices into ``vertices``,
+        or as an integer array with shape ``(m, k)`` if all faces have ``k`` vertices.
+    executor : :class:`concurrent.futures.Executor`, optional
+        An executor, typically a :class:`concurrent.futures.ProcessPoolExecutor`,
+        to triangulate faces with more than four vertices in parallel.
+        If the executor is not available, for example because its worker processes have died,
+        the faces are triangulated serially.
+    chunksize : int, optional
+        The number of faces with more than four vertices per task of the executor.
+        If there are fewer faces, they are triangulated serially.
+    cache : :class:`compas_notebook.cache.Cache`, optional
+        A cache of the triangulations of faces with more than four vertices,
+        keyed on the coordinates of their corners relative to the first corner.
+        Faces of which the shape is in the cache, including translated copies, are not triangulated again.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The triangles, as an integer array of vertex indices with shape ``(m, 3)``,
+        and for every triangle the index of the face it belongs to.
+        The triangles are in the order of the faces, also if they are triangulated in parallel.
+
+    Examples
+    --------
+    >>> vertices = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [2, 0, 0]]
+    >>> triangles, owners = triangulate_faces(vertices, [[0, 1, 2, 3], [1, 4, 2]])
+    >>> triangles.tolist()
+    [[0, 1, 2], [0, 2, 3], [1, 4, 2]]
+    >>> owners.tolist()
+    [0, 0, 1]
+
+    """
+    if isinstance(faces, numpy.ndarray) and faces.ndim == 2:
+        degrees = numpy.full(len(faces), faces.shape[1], dtype=numpy.int64)
+        corners = faces.astype(numpy.int64, copy=False).ravel()
+    else:
+        degrees = numpy.fromiter(map(len, faces), dtype=numpy.int64, count=len(faces))
+        corners = numpy.fromiter(chain.from_iterable(faces), dtype=numpy.int64, count=int(degrees.sum()))
+    offsets = numpy.cumsum(degrees) - degrees
+
+    triangles = [numpy.zeros((0, 3), dtype=numpy.int64)]
+    owners = [numpy.zeros(0, dtype=numpy.int64)]
+
+    for degree, pattern in FACE_TRIANGLES.items():
+        selection = numpy.flatnonzero(degrees == degree)
+        if not len(selection):
+            continue
+        facevertices = corners[offsets[selection, None] + numpy.arange(degree)]
+        triangles.append(facevertices[:, pattern].reshape(-1, 3))
+        owners.append(numpy.repeat(selection, len(pattern)))
+
+    ngons = numpy.flatnonzero(degrees > 4)
+    if len(ngons):
+        vertices = numpy.asarray(vertices, dtype=numpy.float64)
+        ngoncorners = corners[_face_corners(offsets[ngons], degrees[ngons])]
+        ears, counts = _earclip_ngons(vertices[ngoncorners], degrees[ngons], executor, chunksize, cache)
+        triangles.append(ngoncorners[ears])
+        owners.append(numpy.repeat(ngons, counts))
+
+    triangles = numpy.concatenate(triangles)
+    owners = numpy.concatenate(owners)
+    # if all faces have the same degree, the triangles are already in the order of the faces
+    if len(degrees) and (degrees != degrees[0]).any():
+        order = numpy.argsort(owners, kind="stable")
+        triangles, owners = triangles[order], owners[order]
+    return triangles, owners
+
+
+def vertices_and_faces_to_threejs(
+    vertices, faces, executor: Optional[Executor] = None, chunksize: int = 1000, cache: Optional["Cache"] = None
+) -> three.BufferGeometry:
     """Convert vertices and faces to a PyThreeJS geometry.
 
+    Triangles and quads are split without per-face Python work, see :func:`triangulate_faces`.
+    Meshes that only have triangles or only quads can be given as arrays,
+    which avoids building lists of faces altogether.
+
     Parameters
     ----------
-    vertices : list
-        List of vertices.
-    faces : list
-        List of faces.
+    vertices : list | numpy.ndarray
+        List of vertices, or an array of vertices with shape ``(n, 3)``.
+    faces : list | numpy.ndarray
+        List of faces, or an integer array of faces with shape ``(m, 3)`` or ``(m, 4)``.
+    executor : :class:`concurrent.futures.Executor`, optional
+        An executor to triangulate faces with more than four vertices in parallel.
+    chunksize : int, optional
+        The number of faces with more than four vertices per task of the executor.
+    cache : :class:`compas_notebook.cache.Cache`, optional
+        A cache of the triangulations of faces with more than four vertices.
 
     Returns
     -------
     :class:`three.BufferGeometry`
         The PyThreeJS geometry.
 
+    Examples
+    --------
+    >>> import numpy
+    >>> vertices = numpy.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
+    >>> geometry = vertices_and_faces_to_threejs(vertices, numpy.array([[0, 1, 2, 3]]))
+    >>> geometry.attributes["index"].array.tolist()
+    [0, 1, 2, 0, 2, 3]
+
     """
-    triangles = []
-    for face in faces:
-        if len(face) == 3:
-            triangles.append(face)
-        elif len(face) == 4:
-            triangles.append([face[0], face[1], face[2]])
-            triangles.append([face[0], face[2], face[3]])
-        else:
-            polygon = Polygon([vertices[v] for v in face])
-            ears = earclip_polygon(polygon)
-            for ear in ears:
-                triangles.append([face[index] for index in ear])
+    triangles = triangulate_faces(vertices, faces, executor=executor, chunksize=chunksize, cache=cache)[0]
 
-    vertices = numpy.array(vertices, dtype=numpy.float32)
-    triangles = numpy.array(triangles, dtype=numpy.uint32).ravel()
+    vertices = numpy.asarray(vertices, dtype=numpy.float32)
+    triangles = triangles.astype(numpy.uint32).ravel()
 
     geometry = three.BufferGeometry(
         attributes={
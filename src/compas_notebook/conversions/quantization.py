@@ -0,0 +1,117 @@
+import numpy
+import pythreejs as three
+
+
+def quantize_positions(positions) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """Encode positions as normalized 16-bit integers relative to their axis-aligned bounding box.
+
+    Parameters
+    ----------
+    positions : array-like
+        The positions, with shape ``(n, 3)``.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The quantized positions as an unsigned 16-bit integer array with shape ``(n, 3)``,
+        and the row-major 4x4 matrix that maps the normalized positions in ``[0, 1]`` back to the original positions.
+
+    Examples
+    --------
+    >>> quantized, matrix = quantize_positions([[0, 0, 0], [2, 1, 0]])
+    >>> quantized.tolist()
+    [[0, 0, 0], [65535, 65535, 0]]
+    >>> matrix[:3, 3].tolist()
+    [0.0, 0.0, 0.0]
+
+    """
+    positions = numpy.asarray(positions, dtype=numpy.float64).reshape(-1, 3)
+    if not len(positions):
+        return numpy.zeros((0, 3), dtype=numpy.uint16), numpy.eye(4)
+
+    lower = positions.min(axis=0)
+    extent = positions.max(axis=0) - lower
+    # flat axes are scaled by one, to keep the matrix invertible
+    extent[extent == 0] = 1.0
+
+    quantized = numpy.rint((positions - lower) / extent * 65535).astype(numpy.uint16)
+    matrix = numpy.diag([*extent, 1.0])
+    matrix[:3, 3] = lower
+    return quantized, matrix
+
+
+def quantize_colors(colors) -> numpy.ndarray:
+    """Encode RGB colors with components in ``[0, 1]`` as normalized 8-bit integers.
+
+    Parameters
+    ----------
+    colors : array-like
+        The colors, with shape ``(n, 3)``.
+
+    Returns
+    -------
+    numpy.ndarray
+        The quantized colors as an unsigned 8-bit integer array with shape ``(n, 3)``.
+
+    """
+    colors = numpy.asarray(colors, dtype=numpy.float64)
+    return numpy.rint(numpy.clip(colors, 0, 1) * 255).astype(numpy.uint8)
+
+
+def quantize_objects(objects: list[three.Object3D]) -> None:
+    """Quantize the position and color attributes of the buffer geometries of PyThreeJS objects in place.
+
+    Positions are replaced by normalized unsigned 16-bit integers,
+    and the dequantization is folded into the matrix of the object.
+    Colors are replaced by normalized unsigned 8-bit integers.
+    This reduces the size of the position buffers by half, and the size of the color buffers by three quarters.
+
+    Only objects with a plain buffer geometry and float positions are modified.
+    Objects of which the transformation is defined by position, rotation and scale
+    instead of an explicit matrix are left untouched.
+    Position attributes that are shared by multiple objects are quantized once.
+
+    Parameters
+    ----------
+    objects : list[:class:`three.Object3D`]
+        The objects, including groups of which the children will be quantized as well.
+
+    """
+    matrices = {}
+    stack = list(objects)
+
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, three.Group):
+            stack.extend(obj.children)
+            continue
+        geometry = getattr(obj, "geometry", None)
+        if type(geometry) is not three.BufferGeometry:
+            continue
+
+        position = geometry.attributes.get("position")
+        if position is None:
+            continue
+
+        if position.model_id not in matrices:
+            if position.array.dtype != numpy.float32:
+                continue
+            identity = obj.position == (0, 0, 0) and obj.quaternion == (0, 0, 0, 1) and obj.scale == (1, 1, 1)
+            if obj.matrixAutoUpdate and not identity:
+                continue
+            position.array, matrices[position.model_id] = quantize_positions(position.array)
+            position.normalized = True
+
+        color = geometry.attributes.get("color")
+        if color is not None and color.array.dtype == numpy.float32:
+            color.array = quantize_colors(color.array)
+            color.normalized = True
+
+        matrix = matrices[position.model_id]
+        if not obj.matrixAutoUpdate:
+            # three.js matrices are stored in column-major order
+            matrix = numpy.array(obj.matrix).reshape(4, 4).T @ matrix
+        obj.matrix = matrix.T.ravel().tolist()
+        obj.matrixAutoUpdate = False
+        # the bounding sphere computed by three.js from the quantized values doesn't match the geometry
+        obj.frustumCulled = False
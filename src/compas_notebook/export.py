@@ -0,0 +1,114 @@
+import base64
+import pathlib
+import uuid
+import zlib
+
+from ipydatawidgets import NDArrayWidget
+from ipywidgets import Widget
+from ipywidgets.embed import dependency_state
+from ipywidgets.embed import embed_minimal_html
+
+# the models of which the array is embedded in a separate, compressed array model
+BUFFER_MODELS = ("BufferAttributeModel", "InstancedBufferAttributeModel")
+
+
+def _array_model() -> dict:
+    traits = NDArrayWidget.class_traits(sync=True)
+    return {
+        "model_name": traits["_model_name"].default_value,
+        "model_module": traits["_model_module"].default_value,
+        "model_module_version": traits["_model_module_version"].default_value,
+    }
+
+
+def embed_state(widgets: list[Widget], level: int = 6, threshold: int = 1024) -> dict:
+    """Collect the embeddable state of widgets and all widgets they refer to, with compressed buffers.
+
+    The state has the format of :func:`ipywidgets.embed.dependency_state`,
+    in which every widget is included once, such that shared geometries and materials are embedded once.
+    The array of every buffer attribute of at least ``threshold`` bytes is moved into an array model
+    of which the data is compressed with zlib, and decompressed by the widget manager of the page.
+    The widgets themselves are not modified.
+
+    Parameters
+    ----------
+    widgets : list[:class:`ipywidgets.Widget`]
+        The widgets.
+    level : int, optional
+        The zlib compression level, from 1 (fastest) to 9 (smallest).
+        If zero, the buffers are embedded uncompressed.
+    threshold : int, optional
+        The minimum size of a buffer in bytes.
+
+    Returns
+    -------
+    dict
+        The state per model id.
+
+    """
+    state = dependency_state(widgets, drop_defaults=True)
+    if not level:
+        return state
+
+    arraymodel = _array_model()
+    for entry in list(state.values()):
+        if entry["model_name"] not in BUFFER_MODELS:
+            continue
+        buffers = entry.get("buffers", [])
+        for buffer in buffers:
+            if buffer["path"] != ["array", "buffer"]:
+                continue
+            data = base64.b64decode(buffer["data"])
+            if len(data) < threshold:
+                continue
+            model_id = uuid.uuid4().hex
+            state[model_id] = {
+                **arraymodel,
+                "state": {"array": entry["state"]["array"], "compression_level": level},
+                "buffers": [
+                    {
+                        "encoding": "base64",
+                        "path": ["array", "compressed_buffer"],
+                        "data": base64.b64encode(zlib.compress(data, level)).decode("ascii"),
+                    }
+                ],
+            }
+            entry["state"] = {**entry["state"], "array": f"IPY_MODEL_{model_id}"}
+            entry["buffers"] = [item for item in buffers if item is not buffer]
+            if not entry["buffers"]:
+                del entry["buffers"]
+            break
+    return state
+
+
+def write_html(
+    path, widgets: list[Widget], title: str = "COMPAS Notebook", level: int = 6, threshold: int = 1024
+) -> int:
+    """Write widgets to a standalone HTML page, that doesn't require a running kernel.
+
+    The page embeds the state of the widgets with :func:`embed_state`,
+    and loads the widget manager and the JavaScript of the widgets from a CDN.
+
+    Parameters
+    ----------
+    path : path-like or str
+        The path of the file.
+    widgets : list[:class:`ipywidgets.Widget`]
+        The widgets to display on the page.
+    title : str, optional
+        The title of the page.
+    level : int, optional
+        The zlib compression level of the buffers.
+    threshold : int, optional
+        The minimum size of a compressed buffer in bytes.
+
+    Returns
+    -------
+    int
+        The size of the file in bytes.
+
+    """
+    path = pathlib.Path(path)
+    state = embed_state(widgets, level=level, threshold=threshold)
+    embed_minimal_html(path, views=widgets, title=title, state=state, requirejs=True)
+    return path.stat().st_size
@@ -0,0 +1,225 @@
+import time
+import typing
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+
+import pythreejs as three
+from ipywidgets import Widget
+from ipywidgets.widgets import widget as widget_module
+
+from compas_notebook.conversions import attribute_array
+
+if typing.TYPE_CHECKING:
+    from compas_notebook.scene import ThreeSceneObject
+
+# the number of triangles of the geometries that are tessellated by three.js in the notebook
+PARAMETRIC_TRIANGLES = {
+    three.BoxGeometry: lambda g: (
+        4 * (g.widthSegments + g.depthSegments) * g.heightSegments + 4 * g.widthSegments * g.depthSegments
+    ),
+    three.SphereGeometry: lambda g: 2 * g.widthSegments * (g.heightSegments - 1),
+    three.CylinderGeometry: lambda g: 2 * g.radialSegments * (g.heightSegments + (0 if g.openEnded else 1)),
+    three.TorusGeometry: lambda g: 2 * g.radialSegments * g.tubularSegments,
+}
+
+
+def _widget_count() -> int:
+    # ipywidgets 8 keeps the registry of live widgets in the module, ipywidgets 7 on the class
+    instances = getattr(widget_module, "_instances", None)
+    if instances is None:
+        instances = Widget.widgets
+    return len(instances)
+
+
+@dataclass
+class DrawStats:
+    """Statistics of the pythreejs objects drawn for a scene object.
+
+    Attributes
+    ----------
+    name : str
+        The name of the scene object.
+    time : float
+        The total wall time spent drawing, in seconds.
+    widgets : int
+        The total number of pythreejs widgets created while drawing.
+    bytes : int
+        The size of the buffers of the current pythreejs objects, in bytes.
+    triangles : int
+        The number of triangles of the current pythreejs objects.
+    segments : int
+        The number of line segments of the current pythreejs objects.
+    points : int
+        The number of points of the current pythreejs objects.
+    draws : int
+        The number of times the object was drawn or refined.
+
+    """
+
+    name: str
+    time: float = 0.0
+    widgets: int = 0
+    bytes: int = 0
+    triangles: int = 0
+    segments: int = 0
+    points: int = 0
+    draws: int = 0
+
+
+def measure_objects(objects: list[three.Object3D]) -> dict[str, int]:
+    """Count the buffer bytes and the rendered elements of PyThreeJS objects.
+
+    Parameters
+    ----------
+    objects : list[:class:`three.Object3D`]
+        The objects, including groups of which the children will be counted as well.
+
+    Returns
+    -------
+    dict[str, int]
+        The number of ``bytes``, ``triangles``, ``segments`` and ``points``.
+        Buffers that are shared by multiple objects are counted once.
+
+    """
+    counts = {"bytes": 0, "triangles": 0, "segments": 0, "points": 0}
+    seen = set()
+    stack = list(objects)
+
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, three.Group):
+            stack.extend(obj.children)
+            continue
+        geometry = getattr(obj, "geometry", None)
+
+        if type(geometry) in PARAMETRIC_TRIANGLES:
+            if isinstance(obj, three.Mesh):
+                counts["triangles"] += PARAMETRIC_TRIANGLES[type(geometry)](geometry)
+            continue
+        if not isinstance(geometry, three.BufferGeometry):
+            continue
+
+        for attribute in geometry.attributes.values():
+            if attribute.model_id not in seen:
+                seen.add(attribute.model_id)
+                counts["bytes"] += attribute_array(attribute).nbytes
+
+        if "index" in geometry.attributes:
+            count = attribute_array(geometry.attributes["index"]).size
+        elif "position" in geometry.attributes:
+            # pythreejs derives the item size of an attribute from the shape of its array
+            position = attribute_array(geometry.attributes["position"])
+            count = len(position) if position.ndim > 1 else position.size // 3
+        else:
+            continue
+        if isinstance(geometry, three.InstancedBufferGeometry):
+            count *= geometry.maxInstancedCount
+
+        if isinstance(obj, three.Mesh):
+            counts["triangles"] += count // 3
+        elif isinstance(obj, three.LineSegments):
+            counts["segments"] += count // 2
+        elif isinstance(obj, three.Line):
+            counts["segments"] += max(count - 1, 0)
+        elif isinstance(obj, three.Points):
+            counts["points"] += count
+
+    return counts
+
+
+class DrawProfiler:
+    """Record how long the scene objects of a viewer take to draw, and how much they send to the notebook.
+
+    Attributes
+    ----------
+    records : dict[Any, :class:`DrawStats`]
+        The statistics per scene object, or per group of instanced or merged objects.
+
+    """
+
+    def __init__(self):
+        self.records: dict[Any, DrawStats] = {}
+
+    def record(self, obj: "ThreeSceneObject", func: Callable[[], Any]) -> Any:
+        """Call a draw function of an object, and record its statistics.
+
+        Calls that return False without creating any widgets, such as redraws of unchanged objects,
+        are not recorded.
+
+        Parameters
+        ----------
+        obj : :class:`compas_notebook.scene.ThreeSceneObject`
+            The scene object, or a group of objects, with a list of pythreejs objects as ``guids``.
+        func : callable
+            The draw function, for example ``obj.redraw`` or ``obj.refine``.
+
+        Returns
+        -------
+        Any
+            The result of the draw function.
+
+        """
+        count = _widget_count()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        created = _widget_count() - count
+
+        if result is False and created <= 0:
+            return result
+
+        stats = self.records.get(obj)
+        if stats is None:
+            stats = self.records[obj] = DrawStats(name=getattr(obj, "name", None) or type(obj).__name__)
+        stats.time += elapsed
+        stats.widgets += max(created, 0)
+        stats.draws += 1
+        for name, value in measure_objects(obj.guids).items():
+            setattr(stats, name, value)
+        return result
+
+    def retain(self, objects: list) -> None:
+        """Forget the statistics of objects that are no longer drawn.
+
+        Parameters
+        ----------
+        objects : list
+            The objects of which the statistics are kept.
+
+        """
+        keep = set(objects)
+        self.records = {obj: stats for obj, stats in self.records.items() if obj in keep}
+
+    def clear(self) -> None:
+        """Forget all statistics."""
+        self.records.clear()
+
+    def total(self) -> DrawStats:
+        """Sum the statistics of all objects.
+
+        Returns
+        -------
+        :class:`DrawStats`
+
+        """
+        total = DrawStats(name="total")
+        for stats in self.records.values():
+            for name in ("time", "widgets", "bytes", "triangles", "segments", "points", "draws"):
+                setattr(total, name, getattr(total, name) + getattr(stats, name))
+        return total
+
+    def summary(self) -> str:
+        """Summarize the statistics of all objects in a single line of text.
+
+        Returns
+        -------
+        str
+
+        """
+        total = self.total()
+        return (
+            f"{len(self.records)} objects drawn in {total.time:.3f}s"
+            f" | {total.widgets} widgets | {total.bytes / 1e6:.2f} MB"
+            f" | {total.triangles} triangles, {total.segments} segments, {total.points} points"
+        )
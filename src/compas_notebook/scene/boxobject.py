@@ -1,8 +1,11 @@
+from compas.geometry import Box
+from compas.geometry import Scale
 from compas.scene import GeometryObject
 
 from compas_notebook.conversions import box_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import points_to_aabb
 
 
 class ThreeBoxObject(ThreeSceneObject, GeometryObject):
@@ -17,7 +20,11 @@ class ThreeBoxObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = box_to_threejs(self.geometry)
+        box = self.geometry
+        geometry = self.cached_geometry(
+            ("BoxGeometry", box.width, box.height, box.depth),
+            lambda: box_to_threejs(box),
+        )
         transformation = self.y_to_z(self.geometry.transformation)
 
         self._guids = self.geometry_to_objects(
@@ -27,3 +34,16 @@ class ThreeBoxObject(ThreeSceneObject, GeometryObject):
         )
 
         return self.guids
+
+    def aabb(self):
+        return points_to_aabb(self.geometry.to_vertices_and_faces()[0])
+
+    def instance_key(self):
+        return ("Box",)
+
+    def instance_mesh(self):
+        return Box(1).to_vertices_and_faces()
+
+    def instance_transformation(self):
+        box = self.geometry
+        return box.transformation * Scale.from_factors([box.xsize, box.ysize, box.zsize])
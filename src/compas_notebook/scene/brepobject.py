@@ -7,6 +7,7 @@ from compas.scene import GeometryObject
 from compas_notebook.conversions import polyline_to_threejs
 from compas_notebook.conversions import vertices_and_faces_to_threejs
 from compas_notebook.scene import ThreeSceneObject
+from compas_notebook.scene.sceneobject import points_to_aabb
 
 
 class ThreeBrepObject(ThreeSceneObject, GeometryObject):
@@ -29,14 +30,19 @@ class ThreeBrepObject(ThreeSceneObject, GeometryObject):
         vertices, faces = mesh.to_vertices_and_faces()
 
         geometry = vertices_and_faces_to_threejs(vertices, faces)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=self.color.hex, side="DoubleSide"))
+        material = self.cached_material(three.MeshBasicMaterial, color=self.color.hex, side="DoubleSide")
+        mesh = three.Mesh(geometry, material)
 
         guids = [mesh]
 
         for polyline in polylines:
             geometry = polyline_to_threejs(polyline)
-            line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+            material = self.cached_material(three.LineBasicMaterial, color=self.contrastcolor.hex)
+            line = three.LineSegments(geometry, material)
             guids.append(line)
 
         self._guids = guids
         return self.guids
+
+    def aabb(self):
+        return points_to_aabb(self.brep.aabb.to_vertices_and_faces()[0])
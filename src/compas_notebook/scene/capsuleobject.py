@@ -6,11 +6,14 @@ from compas_notebook.conversions import vertices_and_edges_to_threejs
 from compas_notebook.conversions import vertices_and_faces_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import sphere_to_aabb
 
 
 class ThreeCapsuleObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing capsule."""
 
+    tessellated = True
+
     def draw(self):
         """Draw the capsule associated with the scene object.
 
@@ -20,16 +23,25 @@ class ThreeCapsuleObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        mesh = Mesh.from_shape(self.geometry)
+        # with the default resolution, the capsule has the default 16 by 16 faces of the shape,
+        # and at least the 3 faces that a shape needs in both directions with low resolutions
+        n = max(3, self.segments() // 2)
+        mesh = Mesh.from_shape(self.geometry, u=n, v=n)
         vertices, faces = mesh.to_vertices_and_faces()
         edges = list(mesh.edges())
 
         geometry = vertices_and_faces_to_threejs(vertices, faces)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=self.color.hex, side="DoubleSide"))
+        material = self.cached_material(three.MeshBasicMaterial, color=self.color.hex, side="DoubleSide")
+        mesh = three.Mesh(geometry, material)
 
         geometry = vertices_and_edges_to_threejs(vertices, edges)
-        line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        material = self.cached_material(three.LineBasicMaterial, color=self.contrastcolor.hex)
+        line = three.LineSegments(geometry, material)
 
         self._guids = [mesh, line]
 
         return self.guids
+
+    def aabb(self):
+        capsule = self.geometry
+        return sphere_to_aabb(capsule.frame.point, capsule.radius + 0.5 * capsule.height)
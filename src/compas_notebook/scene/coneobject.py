@@ -1,12 +1,21 @@
-import pythreejs as three
+import math
+
+from compas.geometry import Cone
+from compas.geometry import Scale
+from compas.geometry import Translation
 from compas.scene import GeometryObject
 
+from compas_notebook.conversions import cone_to_threejs
+
 from .sceneobject import ThreeSceneObject
+from .sceneobject import sphere_to_aabb
 
 
 class ThreeConeObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing cone."""
 
+    tessellated = True
+
     def draw(self):
         """Draw the cone associated with the scene object.
 
@@ -16,11 +25,11 @@ class ThreeConeObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = three.CylinderGeometry(
-            radiusTop=0,
-            radiusBottom=self.geometry.radius,
-            height=self.geometry.height,
-            radialSegments=32,
+        cone = self.geometry
+        n = self.segments()
+        geometry = self.cached_geometry(
+            ("ConeGeometry", cone.radius, cone.height, n),
+            lambda: cone_to_threejs(cone, u=n),
         )
         transformation = self.y_to_z(self.geometry.transformation)
 
@@ -30,3 +39,21 @@ class ThreeConeObject(ThreeSceneObject, GeometryObject):
             transformation=transformation,
         )
         return self.guids
+
+    def aabb(self):
+        cone = self.geometry
+        # like the drawn cone, the box is centred on the frame of the cone
+        return sphere_to_aabb(cone.frame.point, math.hypot(cone.radius, 0.5 * cone.height))
+
+    def instance_key(self):
+        return ("Cone", self.segments())
+
+    def instance_mesh(self):
+        return Cone(1, 1).to_vertices_and_faces(u=self.segments())
+
+    def instance_transformation(self):
+        cone = self.geometry
+        # pythreejs cones are centred on their frame
+        T = Translation.from_vector([0, 0, -0.5 * cone.height])
+        S = Scale.from_factors([cone.radius, cone.radius, cone.height])
+        return cone.transformation * T * S
@@ -1,12 +1,20 @@
-import pythreejs as three
+import math
+
+from compas.geometry import Cylinder
+from compas.geometry import Scale
 from compas.scene import GeometryObject
 
+from compas_notebook.conversions import cylinder_to_threejs
+
 from .sceneobject import ThreeSceneObject
+from .sceneobject import sphere_to_aabb
 
 
 class ThreeCylinderObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing cylinder."""
 
+    tessellated = True
+
     def draw(self):
         """Draw the cylinder associated with the scene object.
 
@@ -16,13 +24,12 @@ class ThreeCylinderObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = three.CylinderGeometry(
-            radiusTop=self.geometry.radius,
-            radiusBottom=self.geometry.radius,
-            height=self.geometry.height,
-            radialSegments=32,
+        cylinder = self.geometry
+        n = self.segments()
+        geometry = self.cached_geometry(
+            ("CylinderGeometry", cylinder.radius, cylinder.height, n),
+            lambda: cylinder_to_threejs(cylinder, u=n),
         )
-
         transformation = self.y_to_z(self.geometry.transformation)
 
         self._guids = self.geometry_to_objects(
@@ -31,3 +38,17 @@ class ThreeCylinderObject(ThreeSceneObject, GeometryObject):
             transformation=transformation,
         )
         return self.guids
+
+    def aabb(self):
+        cylinder = self.geometry
+        return sphere_to_aabb(cylinder.frame.point, math.hypot(cylinder.radius, 0.5 * cylinder.height))
+
+    def instance_key(self):
+        return ("Cylinder", self.segments())
+
+    def instance_mesh(self):
+        return Cylinder(1, 1).to_vertices_and_faces(u=self.segments())
+
+    def instance_transformation(self):
+        cylinder = self.geometry
+        return cylinder.transformation * Scale.from_factors([cylinder.radius, cylinder.radius, cylinder.height])
@@ -1,42 +1,154 @@
+from itertools import chain
+
+import numpy
 import pythreejs as three
 from compas.scene import GraphObject
 
+from compas_notebook.conversions import node_indices
 from compas_notebook.conversions import nodes_and_edges_to_threejs
 from compas_notebook.conversions import nodes_to_threejs
 from compas_notebook.scene import ThreeSceneObject
+from compas_notebook.scene.sceneobject import points_to_aabb
 
 
 class ThreeGraphObject(ThreeSceneObject, GraphObject):
-    """Scene object for drawing graph."""
+    """Scene object for drawing graph.
+
+    By default, all nodes and edges are drawn in the contrast color of the object.
+    If individual nodes or edges are assigned a color through ``nodecolor`` or ``edgecolor``,
+    the nodes or edges are drawn with per-vertex colors instead,
+    and the colors can be updated without redrawing the graph with :meth:`update_colors`.
+    The nodes and edges can be shown and hidden with ``show_nodes`` and ``show_edges`` without redrawing the graph.
+
+    """
+
+    recolorable = True
+    parts = ("nodes", "edges")
+
+    def __init__(self, graph, **kwargs):
+        super().__init__(graph, **kwargs)
+        self._buffers = None
+
+    @property
+    def buffers(self) -> tuple[list, numpy.ndarray]:
+        """The keys of the nodes, and the coordinates of the nodes as float32 array with shape ``(n, 3)``.
+
+        The buffers are built when the graph is drawn, and are shared by the drawn nodes and edges.
+
+        """
+        if self._buffers is None:
+            defaults = self.graph.default_node_attributes
+            x, y, z = (defaults.get(name, 0.0) for name in "xyz")
+            attributes = self.graph.node.values()
+            xyz = [(attr.get("x", x), attr.get("y", y), attr.get("z", z)) for attr in attributes]
+            self._buffers = list(self.graph.node), numpy.array(xyz, dtype=numpy.float32).reshape(-1, 3)
+        return self._buffers
 
     def draw(self):
         """Draw the graph associated with the scene object.
 
         Returns
         -------
-        list[three.LineSegments, three.Points]
+        list[three.Points, three.LineSegments]
             List of pythreejs objects created.
 
         """
-        guids = []
-
-        nodes, edges = self.graph.to_nodes_and_edges()
+        self._guids = []
+        self._drawn = {}
+        self._buffers = None
 
         if self.show_nodes:
-            if self.show_nodes is not True:
-                nodes = self.show_nodes
-
-            geometry = nodes_to_threejs(nodes)
-            points = three.Points(geometry, three.PointsMaterial(size=self.nodesize, color=self.contrastcolor.hex))
-            guids.append(points)
+            nodes = list(self.graph.nodes()) if self.show_nodes is True else self.show_nodes
+            self._guids.append(self.draw_nodes(nodes))
 
         if self.show_edges:
-            if self.show_edges is not True:
-                edges = self.show_edges
+            edges = list(self.graph.edges()) if self.show_edges is True else self.show_edges
+            self._guids.append(self.draw_edges(edges))
 
-            geometry = nodes_and_edges_to_threejs(nodes, edges)
-            line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
-            guids.append(line)
-
-        self._guids = guids
         return self.guids
+
+    def draw_part(self, part):
+        if part == "nodes":
+            return self.draw_nodes(list(self.graph.nodes()))
+        return self.draw_edges(list(self.graph.edges()))
+
+    def draw_nodes(self, nodes):
+        keys, xyz = self.buffers
+        mask = None
+        if len(nodes) != len(keys):
+            # a selection of nodes is drawn through an index into the positions of all nodes
+            mask = numpy.zeros(len(keys), dtype=bool)
+            mask[node_indices(keys, nodes)] = True
+        geometry = nodes_to_threejs(xyz, mask=mask)
+        if len(self.nodecolor):
+            colors = self._element_colors(keys, self.nodecolor)
+            geometry.attributes = {**geometry.attributes, "color": three.BufferAttribute(colors, normalized=False)}
+        points = three.Points(geometry, self._node_material())
+        self._drawn["nodes"] = points, keys, bool(len(self.nodecolor))
+        return points
+
+    def draw_edges(self, edges):
+        keys, xyz = self.buffers
+        if len(self.edgecolor):
+            # per-edge colors require separate vertices per edge
+            positions = xyz[node_indices(keys, chain.from_iterable(edges)).reshape(-1, 2)]
+            colors = numpy.repeat(self._element_colors(edges, self.edgecolor), 2, axis=0)
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": three.BufferAttribute(positions.reshape(-1, 3), normalized=False),
+                    "color": three.BufferAttribute(colors, normalized=False),
+                }
+            )
+        else:
+            geometry = nodes_and_edges_to_threejs(xyz, edges, keys=keys)
+        line = three.LineSegments(geometry, self._edge_material())
+        self._drawn["edges"] = line, edges, bool(len(self.edgecolor))
+        return line
+
+    def draw_colors(self) -> bool:
+        """Apply the current node and edge colors to the drawn pythreejs objects.
+
+        Returns
+        -------
+        bool
+            True if the colors were applied,
+            False if nodes or edges switch between a single color and individual colors.
+
+        """
+        for kind, color in (("nodes", self.nodecolor), ("edges", self.edgecolor)):
+            if kind in self._drawn and self._drawn[kind][2] != bool(len(color)):
+                return False
+
+        if "nodes" in self._drawn:
+            points, keys, vertexcolors = self._drawn["nodes"]
+            if vertexcolors:
+                self.set_color_attribute(points.geometry, self._element_colors(keys, self.nodecolor))
+            points.material = self._node_material()
+
+        if "edges" in self._drawn:
+            line, keys, vertexcolors = self._drawn["edges"]
+            if vertexcolors:
+                self.set_color_attribute(
+                    line.geometry, numpy.repeat(self._element_colors(keys, self.edgecolor), 2, axis=0)
+                )
+            line.material = self._edge_material()
+
+        return True
+
+    def _element_colors(self, keys, color) -> numpy.ndarray:
+        # elements without a color of their own are drawn in the contrast color
+        colors = [color.get(key, self.contrastcolor).rgb for key in keys]
+        return numpy.array(colors, dtype=numpy.float32).reshape(-1, 3)
+
+    def _node_material(self) -> three.PointsMaterial:
+        if len(self.nodecolor):
+            return self.cached_material(three.PointsMaterial, size=self.nodesize, vertexColors="VertexColors")
+        return self.cached_material(three.PointsMaterial, size=self.nodesize, color=self.contrastcolor.hex)
+
+    def _edge_material(self) -> three.LineBasicMaterial:
+        if len(self.edgecolor):
+            return self.cached_material(three.LineBasicMaterial, vertexColors="VertexColors")
+        return self.cached_material(three.LineBasicMaterial, color=self.contrastcolor.hex)
+
+    def aabb(self):
+        return points_to_aabb(self.graph.nodes_attributes("xyz"))
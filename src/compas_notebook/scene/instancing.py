@@ -0,0 +1,143 @@
+import hashlib
+import typing
+from typing import Hashable
+
+import numpy
+import pythreejs as three
+
+from compas_notebook.conversions import instanced_material
+from compas_notebook.conversions import instances_to_threejs
+from compas_notebook.conversions import vertices_and_edges_to_threejs
+from compas_notebook.conversions import vertices_and_faces_to_threejs
+
+if typing.TYPE_CHECKING:
+    from compas_notebook.viewer import Viewer
+
+    from .sceneobject import ThreeSceneObject
+
+
+def _face_edges(faces):
+    edges = set()
+    for face in faces:
+        for u, v in zip(face, face[1:] + face[:1]):
+            edges.add((u, v) if u < v else (v, u))
+    return sorted(edges)
+
+
+class ThreeInstanceGroup:
+    """Draw a group of scene objects with the same base geometry as instances of that geometry.
+
+    The faces of all objects in the group are drawn with a single instanced mesh,
+    and the edges with a single instanced line segments object.
+    The base geometry is sent once,
+    and every object only adds a transformation matrix and optionally a color.
+
+    Parameters
+    ----------
+    key : hashable
+        The key of the base geometry shared by all objects in the group.
+        See :meth:`ThreeSceneObject.instance_key`.
+    viewer : :class:`compas_notebook.viewer.Viewer`
+        The viewer providing the geometry cache and the material pool.
+
+    Attributes
+    ----------
+    objects : list[:class:`ThreeSceneObject`]
+        The scene objects in the group.
+
+    """
+
+    def __init__(self, key: Hashable, viewer: "Viewer"):
+        self.key = key
+        self.viewer = viewer
+        self.objects: list["ThreeSceneObject"] = []
+        self._guids = []
+        self._fingerprint = None
+
+    @property
+    def guids(self) -> list[three.Object3D]:
+        return self._guids
+
+    def fingerprint(self) -> str:
+        """Compute a fingerprint of all objects in the group.
+
+        Returns
+        -------
+        str
+
+        """
+        h = hashlib.sha256()
+        for obj in self.objects:
+            h.update(obj.fingerprint().encode())
+            # the frames of the parents are not part of the fingerprints of the objects
+            h.update(obj.worldmatrix.tobytes())
+        return h.hexdigest()
+
+    def redraw(self) -> bool:
+        """Draw the group, but only if any of its objects have changed since it was last drawn.
+
+        Returns
+        -------
+        bool
+
+        """
+        if self._fingerprint == self.fingerprint():
+            return False
+        self.draw()
+        # like for individual objects, the fingerprint is computed after drawing.
+        # the fingerprints of the objects themselves are left alone,
+        # because they describe the state of their own pythreejs objects, which are not updated by the group
+        self._fingerprint = self.fingerprint()
+        return True
+
+    def base_geometries(self) -> tuple[three.BufferGeometry, three.BufferGeometry]:
+        """Get the base geometries of the faces and the edges of the group from the geometry cache.
+
+        Returns
+        -------
+        tuple[:class:`three.BufferGeometry`, :class:`three.BufferGeometry`]
+
+        """
+
+        def factory():
+            vertices, faces = self.objects[0].instance_mesh()
+            return (
+                vertices_and_faces_to_threejs(vertices, faces),
+                vertices_and_edges_to_threejs(vertices, _face_edges(faces)),
+            )
+
+        return self.viewer.geometries.get(("InstanceGroup", self.key), factory)
+
+    def draw(self) -> list[three.Object3D]:
+        """Draw the objects of the group as instances.
+
+        Returns
+        -------
+        list[three.Mesh, three.LineSegments]
+            List of pythreejs objects created.
+
+        """
+        faces, edges = self.base_geometries()
+
+        matrices = numpy.array(
+            [obj.worldmatrix @ obj.instance_transformation().matrix for obj in self.objects], dtype=numpy.float32
+        )
+        facecolors = numpy.array([obj.color.rgb for obj in self.objects], dtype=numpy.float32)
+        linecolors = numpy.array([obj.contrastcolor.rgb for obj in self.objects], dtype=numpy.float32)
+
+        guids = []
+        for geometry, colors, color, cls in (
+            (faces, facecolors, self.objects[0].color, three.Mesh),
+            (edges, linecolors, self.objects[0].contrastcolor, three.LineSegments),
+        ):
+            vertexcolors = not (colors == colors[0]).all()
+            geometry = instances_to_threejs(geometry, matrices, colors if vertexcolors else None)
+            material = self.viewer.materials.get(
+                ("InstancedMaterial", color.hex, vertexcolors),
+                lambda: instanced_material(color, vertexcolors=vertexcolors),
+            )
+            # the bounding sphere of the base geometry doesn't represent the instances
+            guids.append(cls(geometry, material, frustumCulled=False))
+
+        self._guids = guids
+        return self.guids
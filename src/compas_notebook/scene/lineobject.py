@@ -4,11 +4,14 @@ from compas.scene import GeometryObject
 from compas_notebook.conversions import line_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import points_to_aabb
 
 
 class ThreeLineObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing line."""
 
+    mergeable = True
+
     def draw(self):
         """Draw the line associated with the scene object.
 
@@ -19,8 +22,14 @@ class ThreeLineObject(ThreeSceneObject, GeometryObject):
 
         """
         geometry = line_to_threejs(self.geometry)
-        line = three.Line(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        line = three.Line(geometry, self.cached_material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         self._guids = [line]
 
         return self.guids
+
+    def aabb(self):
+        return points_to_aabb([self.geometry.start, self.geometry.end])
+
+    def merge_buffers(self):
+        return {"lines": ([self.geometry.start, self.geometry.end], [[0, 1]], self.contrastcolor)}
@@ -0,0 +1,234 @@
+import hashlib
+import typing
+
+import numpy
+import pythreejs as three
+from compas.colors import Color
+
+from compas_notebook.conversions import attribute_array
+from compas_notebook.conversions import quantize_colors
+from compas_notebook.conversions import set_attribute_array
+from compas_notebook.conversions import triangulate_faces
+
+if typing.TYPE_CHECKING:
+    from compas_notebook.viewer import Viewer
+
+    from .sceneobject import ThreeSceneObject
+
+# per kind of buffer, the type of pythreejs object and the key and parameters of its material in the material pool
+KINDS = {
+    "faces": (three.Mesh, three.MeshBasicMaterial, {"side": "DoubleSide", "vertexColors": "VertexColors"}),
+    "lines": (three.LineSegments, three.LineBasicMaterial, {"vertexColors": "VertexColors"}),
+}
+
+
+class ThreeMergeGroup:
+    """Draw a group of static scene objects as a few merged geometries.
+
+    The buffers of all objects in the group are concatenated into one geometry per kind of buffer,
+    i.e. one mesh for all faces and one line segments object for all lines.
+    The colors of the objects are stored per vertex, such that all objects of the same kind share one material.
+
+    For every object, the group keeps track of the range of vertices and elements it occupies in the merged buffers.
+    This makes it possible to hide or recolor individual objects afterwards,
+    by only updating the corresponding buffer.
+
+    Parameters
+    ----------
+    viewer : :class:`compas_notebook.viewer.Viewer`
+        The viewer providing the material pool.
+
+    Attributes
+    ----------
+    objects : list[:class:`ThreeSceneObject`]
+        The scene objects in the group.
+    ranges : dict[str, dict[:class:`ThreeSceneObject`, tuple[int, int, int, int]]]
+        Per kind of buffer and per object,
+        the start and stop of its vertices, and the start and stop of its element indices.
+    hidden : set[:class:`ThreeSceneObject`]
+        The objects that are hidden with :meth:`hide`.
+    colors : dict[tuple[:class:`ThreeSceneObject`, str], :class:`compas.colors.Color`]
+        The colors that were set with :meth:`set_color`, per object and kind of buffer.
+
+    """
+
+    def __init__(self, viewer: "Viewer"):
+        self.viewer = viewer
+        self.objects: list["ThreeSceneObject"] = []
+        self.ranges: dict = {kind: {} for kind in KINDS}
+        self.hidden = set()
+        self.colors = {}
+        self._guids = []
+        self._fingerprint = None
+        self._geometries = {}
+        self._elements = {}
+
+    @property
+    def guids(self) -> list[three.Object3D]:
+        return self._guids
+
+    def fingerprint(self) -> str:
+        """Compute a fingerprint of all objects in the group.
+
+        Returns
+        -------
+        str
+
+        """
+        h = hashlib.sha256()
+        for obj in self.objects:
+            h.update(obj.fingerprint().encode())
+            # the frames of the parents are not part of the fingerprints of the objects
+            h.update(obj.worldmatrix.tobytes())
+        return h.hexdigest()
+
+    def redraw(self) -> bool:
+        """Draw the group, but only if any of its objects have changed since it was last drawn.
+
+        Returns
+        -------
+        bool
+
+        """
+        if self._fingerprint == self.fingerprint():
+            return False
+        self.draw()
+        # like for individual objects, the fingerprint is computed after drawing.
+        # the fingerprints of the objects themselves are left alone,
+        # because they describe the state of their own pythreejs objects, which are not updated by the group
+        self._fingerprint = self.fingerprint()
+        return True
+
+    def draw(self) -> list[three.Object3D]:
+        """Draw the objects of the group as merged geometries.
+
+        Returns
+        -------
+        list[three.Mesh, three.LineSegments]
+            List of pythreejs objects created.
+
+        """
+        buffers = [obj.merge_buffers() for obj in self.objects]
+        worldmatrices = {obj: obj.worldmatrix for obj in self.objects}
+
+        # forget the display state of objects that are no longer part of the group
+        members = set(self.objects)
+        self.hidden &= members
+        self.colors = {(obj, kind): color for (obj, kind), color in self.colors.items() if obj in members}
+        self.ranges = {kind: {} for kind in KINDS}
+        self._geometries = {}
+        self._elements = {}
+
+        guids = []
+        for kind, (cls, materialcls, params) in KINDS.items():
+            positions = []
+            colors = []
+            elements = []
+            vcount = 0
+            ecount = 0
+
+            for obj, objbuffers in zip(self.objects, buffers):
+                if kind not in objbuffers:
+                    continue
+                vertices, items, color = objbuffers[kind]
+                vertices = numpy.asarray(vertices, dtype=numpy.float64).reshape(-1, 3)
+                world = worldmatrices[obj]
+                vertices = vertices @ world[:3, :3].T + world[:3, 3]
+                if kind == "faces":
+                    items = triangulate_faces(vertices, items, cache=self.viewer.triangulations)[0]
+                else:
+                    items = numpy.asarray(items, dtype=numpy.int64).reshape(-1, 2)
+                color = self.colors.get((obj, kind), color)
+
+                positions.append(vertices)
+                colors.append(numpy.tile(color.rgb, (len(vertices), 1)))
+                elements.append(items.ravel() + vcount)
+                self.ranges[kind][obj] = (vcount, vcount + len(vertices), ecount, ecount + items.size)
+                vcount += len(vertices)
+                ecount += items.size
+
+            if not positions:
+                continue
+
+            self._elements[kind] = numpy.concatenate(elements).astype(numpy.uint32)
+            positions = numpy.concatenate(positions).astype(numpy.float32)
+            colors = numpy.concatenate(colors).astype(numpy.float32)
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": three.BufferAttribute(positions, normalized=False),
+                    "color": three.BufferAttribute(colors, normalized=False),
+                    "index": three.BufferAttribute(self._visible_elements(kind), normalized=False),
+                }
+            )
+            key = (materialcls.__name__,) + tuple(sorted(params.items()))
+            material = self.viewer.materials.get(key, lambda: materialcls(**params))
+            self._geometries[kind] = geometry
+            guids.append(cls(geometry, material))
+
+        self._guids = guids
+        return self.guids
+
+    def _visible_elements(self, kind: str) -> numpy.ndarray:
+        # hidden objects are collapsed onto their first vertex,
+        # which turns their triangles and line segments into degenerate elements that are not rendered
+        elements = self._elements[kind].copy()
+        for obj in self.hidden:
+            if obj in self.ranges[kind]:
+                vstart, _, estart, estop = self.ranges[kind][obj]
+                elements[estart:estop] = vstart
+        return elements
+
+    def _update_elements(self, obj: "ThreeSceneObject") -> None:
+        for kind, geometry in self._geometries.items():
+            if obj in self.ranges[kind]:
+                set_attribute_array(geometry.attributes["index"], self._visible_elements(kind))
+
+    def hide(self, obj: "ThreeSceneObject") -> None:
+        """Hide an object of the group, without redrawing the group.
+
+        Parameters
+        ----------
+        obj : :class:`ThreeSceneObject`
+            The object to hide.
+
+        """
+        self.hidden.add(obj)
+        self._update_elements(obj)
+
+    def show(self, obj: "ThreeSceneObject") -> None:
+        """Show an object of the group that was hidden with :meth:`hide`, without redrawing the group.
+
+        Parameters
+        ----------
+        obj : :class:`ThreeSceneObject`
+            The object to show.
+
+        """
+        self.hidden.discard(obj)
+        self._update_elements(obj)
+
+    def set_color(self, obj: "ThreeSceneObject", color: Color, kind: str = None) -> None:
+        """Change the color of an object of the group, without redrawing the group.
+
+        Parameters
+        ----------
+        obj : :class:`ThreeSceneObject`
+            The object to recolor.
+        color : :class:`compas.colors.Color`
+            The new color.
+        kind : {"faces", "lines"}, optional
+            The kind of buffer to recolor.
+            By default, all buffers of the object are recolored.
+
+        """
+        for name, geometry in self._geometries.items():
+            if kind is not None and name != kind:
+                continue
+            if obj not in self.ranges[name]:
+                continue
+            self.colors[obj, name] = color
+            vstart, vstop, _, _ = self.ranges[name][obj]
+            colors = attribute_array(geometry.attributes["color"]).copy()
+            # quantized colors are normalized 8-bit integers
+            colors[vstart:vstop] = quantize_colors([color.rgb]) if colors.dtype == numpy.uint8 else color.rgb
+            set_attribute_array(geometry.attributes["color"], colors)
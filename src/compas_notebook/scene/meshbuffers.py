@@ -0,0 +1,145 @@
+import functools
+from itertools import chain
+from typing import Union
+
+import numpy
+from compas.datastructures import Mesh
+
+
+def _lookup(keys: numpy.ndarray) -> numpy.ndarray:
+    # an array that maps integer keys to their position in the keys, and unknown keys to -1
+    lookup = numpy.full(keys.max() + 1 if len(keys) else 0, -1, dtype=numpy.int32)
+    lookup[keys] = numpy.arange(len(keys), dtype=numpy.int32)
+    return lookup
+
+
+class MeshBuffers:
+    """The vertex coordinates and the vertex indices of the edges and faces of a mesh, as arrays.
+
+    The mesh is walked once, and the arrays are shared by the vertices, edges and faces that are drawn.
+    The vertex keys of the mesh are mapped to contiguous indices into the coordinates,
+    such that meshes with deleted vertices don't need any special treatment.
+
+    Parameters
+    ----------
+    mesh : :class:`compas.datastructures.Mesh`
+        The mesh.
+    vertex_xyz : dict[int, list[float]], optional
+        The coordinates of the vertices.
+        If None, the coordinates of the mesh are used.
+
+    Attributes
+    ----------
+    vertices : list[int]
+        The vertex keys, in the order of the coordinates.
+    faces : list[int]
+        The face keys.
+    xyz : numpy.ndarray
+        The coordinates of the vertices, with shape ``(n, 3)``.
+    positions : numpy.ndarray
+        The coordinates of the vertices as float32, for the buffers of the pythreejs geometries.
+
+    Examples
+    --------
+    >>> mesh = Mesh.from_vertices_and_faces([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], [[0, 1, 2, 3]])
+    >>> mesh.delete_vertex(0)
+    >>> buffers = MeshBuffers(mesh)
+    >>> buffers.vertices
+    [1, 2, 3]
+    >>> buffers.vertex_indices([3, 1]).tolist()
+    [2, 0]
+
+    """
+
+    def __init__(self, mesh: Mesh, vertex_xyz: dict = None):
+        self.mesh = mesh
+        if vertex_xyz is None:
+            self.vertices = list(mesh.vertex)
+            x, y, z = (mesh.default_vertex_attributes.get(name, 0.0) for name in "xyz")
+            xyz = [(attr.get("x", x), attr.get("y", y), attr.get("z", z)) for attr in mesh.vertex.values()]
+        else:
+            self.vertices = list(vertex_xyz)
+            xyz = list(vertex_xyz.values())
+        self.faces = list(mesh.face)
+
+        self.xyz = numpy.array(xyz, dtype=numpy.float64).reshape(-1, 3)
+        self.positions = self.xyz.astype(numpy.float32)
+        self._vertexindex = _lookup(numpy.array(self.vertices, dtype=numpy.int64))
+
+        facevertices = mesh.face.values()
+        self._faceindex = _lookup(numpy.array(self.faces, dtype=numpy.int64))
+        self._degrees = numpy.fromiter(map(len, facevertices), dtype=numpy.int64, count=len(self.faces))
+        self._offsets = numpy.cumsum(self._degrees) - self._degrees
+        corners = numpy.fromiter(chain.from_iterable(facevertices), dtype=numpy.int64, count=int(self._degrees.sum()))
+        self._corners = self.vertex_indices(corners)
+
+    @functools.cached_property
+    def edges(self) -> list[tuple[int, int]]:
+        """The edge keys, which are only collected if the edges are drawn."""
+        return list(self.mesh.edges())
+
+    @functools.cached_property
+    def edgeindices(self) -> numpy.ndarray:
+        """The indices of the vertices of the edges, with shape ``(m, 2)``."""
+        return self.vertex_indices(self.edges).reshape(-1, 2)
+
+    def vertex_indices(self, vertices) -> numpy.ndarray:
+        """Map vertex keys to indices into the coordinates.
+
+        Parameters
+        ----------
+        vertices : array-like
+            The vertex keys, in an array or nested lists of any shape, for example a list of edges.
+
+        Returns
+        -------
+        numpy.ndarray
+            The indices, with the shape of the keys.
+
+        """
+        return self._vertexindex[numpy.asarray(vertices, dtype=numpy.int64)]
+
+    def edge_indices(self, edges) -> numpy.ndarray:
+        """Map the vertex keys of edges to indices into the coordinates.
+
+        Parameters
+        ----------
+        edges : list[tuple[int, int]]
+            The edges.
+
+        Returns
+        -------
+        numpy.ndarray
+            The indices, with shape ``(m, 2)``.
+
+        """
+        if edges is self.edges:
+            return self.edgeindices
+        return self.vertex_indices(edges).reshape(-1, 2)
+
+    def face_indices(self, faces) -> Union[numpy.ndarray, list[numpy.ndarray]]:
+        """Map the vertices of faces to indices into the coordinates.
+
+        Parameters
+        ----------
+        faces : list[int]
+            The face keys.
+
+        Returns
+        -------
+        numpy.ndarray | list[numpy.ndarray]
+            The indices of the vertices of the faces,
+            as an array with shape ``(m, k)`` if all faces have ``k`` vertices, otherwise as a list of arrays.
+            See :func:`compas_notebook.conversions.triangulate_faces`.
+
+        """
+        selection = self._faceindex[numpy.asarray(faces, dtype=numpy.int64)]
+        degrees = self._degrees[selection]
+        # the positions of the corners of the selected faces in the corners of all faces
+        shift = numpy.repeat(self._offsets[selection] - (numpy.cumsum(degrees) - degrees), degrees)
+        corners = self._corners[numpy.arange(len(shift)) + shift]
+        if not len(degrees):
+            return corners.reshape(0, 3)
+        if (degrees == degrees[0]).all():
+            return corners.reshape(len(degrees), int(degrees[0]))
+        return numpy.split(corners, numpy.cumsum(degrees)[:-1])
@@ -1,14 +1,85 @@
 import numpy
 import pythreejs as three
-from compas.geometry import Polygon
-from compas.geometry import earclip_polygon
+from compas.colors import Color
 from compas.scene import MeshObject
 
 from compas_notebook.scene import ThreeSceneObject
+from compas_notebook.scene.meshbuffers import MeshBuffers
+from compas_notebook.scene.sceneobject import points_to_aabb
 
 
 class ThreeMeshObject(ThreeSceneObject, MeshObject):
-    """Scene object for drawing mesh."""
+    """Scene object for drawing mesh.
+
+    Parameters
+    ----------
+    mesh : :class:`compas.datastructures.Mesh`
+        The mesh.
+    indexed : bool, optional
+        If True, the faces are drawn with a shared vertex buffer and an index buffer,
+        and faces with different colors are drawn as separate meshes.
+        If False, the faces are drawn as an unindexed triangle soup with per-vertex colors.
+        If None (default), indexed drawing is used if the faces have at most ``MAX_INDEXED_COLORS`` distinct colors.
+
+    Notes
+    -----
+    The colors of the vertices, edges and faces can be updated without redrawing the mesh,
+    with :meth:`update_colors`.
+    Faces that are drawn indexed can only be recolored if the faces that share a color remain the same,
+    therefore meshes of which the face colors change frequently should be drawn with ``indexed=False``.
+
+    Likewise, the vertices, edges and faces can be shown and hidden with ``show_vertices``, ``show_edges``
+    and ``show_faces`` without redrawing the mesh.
+    Hidden parts are only drawn once they are shown.
+
+    """
+
+    MAX_INDEXED_COLORS = 8
+    recolorable = True
+    parts = ("vertices", "edges", "faces")
+
+    def __init__(self, mesh, indexed: bool = None, **kwargs):
+        super().__init__(mesh, **kwargs)
+        self.indexed = indexed
+        self._buffers = None
+        self._cached_vertex_xyz = None
+
+    @MeshObject.mesh.setter
+    def mesh(self, mesh):
+        MeshObject.mesh.fset(self, mesh)
+        self._cached_vertex_xyz = None
+
+    @property
+    def vertex_xyz(self) -> dict:
+        """The coordinates of the vertices, unless they were set explicitly.
+
+        Unlike in other contexts, the world transformation of the object is not applied to the coordinates,
+        but to the matrices of the drawn pythreejs objects, such that moving the object doesn't require a redraw.
+        The coordinates are cached until the mesh is replaced or the object is drawn again,
+        such that they reflect the state of the mesh when it was last drawn.
+
+        """
+        if self._vertex_xyz is not None:
+            return self._vertex_xyz
+        if self._cached_vertex_xyz is None:
+            self._cached_vertex_xyz = dict(zip(self.mesh.vertices(), self.mesh.vertices_attributes("xyz")))
+        return self._cached_vertex_xyz
+
+    @vertex_xyz.setter
+    def vertex_xyz(self, vertex_xyz):
+        self._vertex_xyz = vertex_xyz
+
+    @property
+    def buffers(self) -> MeshBuffers:
+        """The arrays of vertex coordinates and indices that are shared by the drawn vertices, edges and faces.
+
+        The buffers are built when the mesh is drawn,
+        and are kept for the parts that are only drawn once they are shown.
+
+        """
+        if self._buffers is None:
+            self._buffers = MeshBuffers(self.mesh, self._vertex_xyz)
+        return self._buffers
 
     def draw(self):
         """Draw the mesh associated with the scene object.
@@ -20,33 +91,89 @@ class ThreeMeshObject(ThreeSceneObject, MeshObject):
 
         """
         self._guids = []
-
-        vertices = list(self.mesh.vertices())
-        faces = list(self.mesh.faces())
-        edges = list(self.mesh.edges())
+        self._drawn = {}
+        self._buffers = None
+        self._cached_vertex_xyz = None
 
         if self.show_vertices:
-            if self.show_vertices is not True:
-                vertices = self.show_vertices
+            vertices = self.buffers.vertices if self.show_vertices is True else self.show_vertices
             self._guids.append(self.draw_vertices(vertices, self.vertexcolor))
 
         if self.show_edges:
-            if self.show_edges is not True:
-                edges = self.show_edges
+            edges = self.buffers.edges if self.show_edges is True else self.show_edges
             self._guids.append(self.draw_edges(edges, self.edgecolor))
 
         if self.show_faces:
-            if self.show_faces is not True:
-                faces = self.show_faces
+            faces = self.buffers.faces if self.show_faces is True else self.show_faces
             self._guids.append(self.draw_faces(faces, self.facecolor))
 
         return self.guids
 
+    def draw_part(self, part):
+        if part == "vertices":
+            return self.draw_vertices(self.buffers.vertices, self.vertexcolor)
+        if part == "edges":
+            return self.draw_edges(self.buffers.edges, self.edgecolor)
+        return self.draw_faces(self.buffers.faces, self.facecolor)
+
+    def aabb(self):
+        return points_to_aabb(self.mesh.vertices_attributes("xyz"))
+
+    def draw_colors(self) -> bool:
+        """Apply the current vertex, edge and face colors to the drawn pythreejs objects.
+
+        Returns
+        -------
+        bool
+            True if the colors were applied,
+            False if the faces are drawn indexed and the faces that share a color have changed.
+
+        """
+        if "faces" in self._drawn:
+            obj, faces, owners, labels = self._drawn["faces"]
+            palette, facecolors = self._face_palette(faces, self.facecolor)
+            if labels is None:
+                self.set_color_attribute(obj.geometry, numpy.repeat(palette[facecolors[owners]], 3, axis=0))
+            else:
+                meshes = obj.children if isinstance(obj, three.Group) else [obj]
+                if len(palette) != len(meshes) or not numpy.array_equal(facecolors[owners], labels):
+                    return False
+                for mesh, color in zip(meshes, palette):
+                    mesh.material = self.cached_material(
+                        three.MeshBasicMaterial, color=Color(*color).hex, side="DoubleSide"
+                    )
+
+        if "vertices" in self._drawn:
+            obj, vertices = self._drawn["vertices"]
+            self.set_color_attribute(obj.geometry, self._element_colors(vertices, self.vertexcolor))
+
+        if "edges" in self._drawn:
+            obj, edges = self._drawn["edges"]
+            self.set_color_attribute(
+                obj.geometry, numpy.repeat(self._element_colors(edges, self.edgecolor), 2, axis=0)
+            )
+
+        return True
+
+    def _element_colors(self, keys, color) -> numpy.ndarray:
+        return numpy.array([color[key].rgb for key in keys], dtype=numpy.float32).reshape(-1, 3)
+
+    def _face_palette(self, faces, color) -> tuple[numpy.ndarray, numpy.ndarray]:
+        # the distinct colors of the faces, and the index of the color of every face
+        palette = {}
+        if len(color):
+            facecolors = [palette.setdefault(color[face].rgb, len(palette)) for face in faces]
+            facecolors = numpy.array(facecolors, dtype=numpy.int64)
+        else:
+            palette[color.default.rgb] = 0
+            facecolors = numpy.zeros(len(faces), dtype=numpy.int64)
+        palette = numpy.array(list(palette), dtype=numpy.float32).reshape(-1, 3)
+        return palette, facecolors
+
     def draw_vertices(self, vertices, color):
-        positions = [self.vertex_xyz[vertex] for vertex in vertices]
-        positions = numpy.array(positions, dtype=numpy.float32)
-        colors = [color[i] for i in range(len(vertices))]
-        colors = numpy.array(colors, dtype=numpy.float32)
+        buffers = self.buffers
+        positions = buffers.positions[buffers.vertex_indices(vertices)].reshape(-1, 3)
+        colors = self._element_colors(vertices, color)
 
         geometry = three.BufferGeometry(
             attributes={
@@ -54,24 +181,19 @@ class ThreeMeshObject(ThreeSceneObject, MeshObject):
                 "color": three.BufferAttribute(colors, normalized=False, itemSize=3),
             }
         )
-        material = three.PointsMaterial(
+        material = self.cached_material(
+            three.PointsMaterial,
             size=self.vertexsize,
             vertexColors="VertexColors",
         )
-        return three.Points(geometry, material)
+        points = three.Points(geometry, material)
+        self._drawn["vertices"] = points, vertices
+        return points
 
     def draw_edges(self, edges, color):
-        positions = []
-        colors = []
-
-        for u, v in edges:
-            positions.append(self.vertex_xyz[u])
-            positions.append(self.vertex_xyz[v])
-            colors.append(color[u, v])
-            colors.append(color[u, v])
-
-        positions = numpy.array(positions, dtype=numpy.float32)
-        colors = numpy.array(colors, dtype=numpy.float32)
+        buffers = self.buffers
+        positions = buffers.positions[buffers.edge_indices(edges)].reshape(-1, 3)
+        colors = numpy.repeat(self._element_colors(edges, color), 2, axis=0)
 
         geometry = three.BufferGeometry(
             attributes={
@@ -79,50 +201,28 @@ class ThreeMeshObject(ThreeSceneObject, MeshObject):
                 "color": three.BufferAttribute(colors, normalized=False, itemSize=3),
             }
         )
-        material = three.LineBasicMaterial(vertexColors="VertexColors")
-        return three.LineSegments(geometry, material)
+        material = self.cached_material(three.LineBasicMaterial, vertexColors="VertexColors")
+        lines = three.LineSegments(geometry, material)
+        self._drawn["edges"] = lines, edges
+        return lines
 
     def draw_faces(self, faces, color):
-        positions = []
-        colors = []
-
-        for face in faces:
-            vertices = self.mesh.face_vertices(face)
-            c = color[face]
-
-            if len(vertices) == 3:
-                positions.append(self.vertex_xyz[vertices[0]])
-                positions.append(self.vertex_xyz[vertices[1]])
-                positions.append(self.vertex_xyz[vertices[2]])
-                colors.append(c)
-                colors.append(c)
-                colors.append(c)
-            elif len(vertices) == 4:
-                positions.append(self.vertex_xyz[vertices[0]])
-                positions.append(self.vertex_xyz[vertices[1]])
-                positions.append(self.vertex_xyz[vertices[2]])
-                colors.append(c)
-                colors.append(c)
-                colors.append(c)
-                positions.append(self.vertex_xyz[vertices[0]])
-                positions.append(self.vertex_xyz[vertices[2]])
-                positions.append(self.vertex_xyz[vertices[3]])
-                colors.append(c)
-                colors.append(c)
-                colors.append(c)
-            else:
-                polygon = Polygon([self.vertex_xyz[v] for v in vertices])
-                ears = earclip_polygon(polygon)
-                for ear in ears:
-                    positions.append(self.vertex_xyz[vertices[ear[0]]])
-                    positions.append(self.vertex_xyz[vertices[ear[1]]])
-                    positions.append(self.vertex_xyz[vertices[ear[2]]])
-                    colors.append(c)
-                    colors.append(c)
-                    colors.append(c)
-
-        positions = numpy.array(positions, dtype=numpy.float32)
-        colors = numpy.array(colors, dtype=numpy.float32)
+        buffers = self.buffers
+        triangles, owners = self.triangulate(buffers.xyz, buffers.face_indices(faces))
+
+        palette, facecolors = self._face_palette(faces, color)
+
+        indexed = self.indexed
+        if indexed is None:
+            indexed = len(palette) <= self.MAX_INDEXED_COLORS
+
+        if indexed:
+            obj = self._draw_faces_indexed(buffers.positions, triangles, palette, facecolors[owners])
+            self._drawn["faces"] = obj, faces, owners, facecolors[owners]
+            return obj
+
+        positions = buffers.positions[triangles].reshape(-1, 3)
+        colors = numpy.repeat(palette[facecolors[owners]], 3, axis=0)
 
         geometry = three.BufferGeometry(
             attributes={
@@ -130,8 +230,33 @@ class ThreeMeshObject(ThreeSceneObject, MeshObject):
                 "color": three.BufferAttribute(colors, normalized=False, itemSize=3),
             }
         )
-        material = three.MeshBasicMaterial(
+        material = self.cached_material(
+            three.MeshBasicMaterial,
             side="DoubleSide",
             vertexColors="VertexColors",
         )
-        return three.Mesh(geometry, material)
+        mesh = three.Mesh(geometry, material)
+        self._drawn["faces"] = mesh, faces, owners, None
+        return mesh
+
+    def _draw_faces_indexed(self, positions, triangles, palette, trianglecolors):
+        # all meshes share the same position buffer
+        # and only have their own index buffer, per color
+        position = three.BufferAttribute(positions, normalized=False)
+        dtype = numpy.uint16 if len(positions) <= 65536 else numpy.uint32
+
+        meshes = []
+        for i, color in enumerate(palette):
+            indices = triangles[trianglecolors == i].astype(dtype).ravel()
+            geometry = three.BufferGeometry(
+                attributes={
+                    "position": position,
+                    "index": three.BufferAttribute(indices, normalized=False, itemSize=3),
+                }
+            )
+            material = self.cached_material(three.MeshBasicMaterial, color=Color(*color).hex, side="DoubleSide")
+            meshes.append(three.Mesh(geometry, material))
+
+        if len(meshes) == 1:
+            return meshes[0]
+        return three.Group(children=meshes)
@@ -1,26 +1,92 @@
+from collections import deque
+
+import numpy
 import pythreejs as three
 from compas.scene import GeometryObject
 
+from compas_notebook.conversions import decimate_points
 from compas_notebook.conversions import pointcloud_to_threejs
+from compas_notebook.conversions import vertices_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import points_to_aabb
 
 
 class ThreePointcloudObject(ThreeSceneObject, GeometryObject):
-    """Scene object for drawing pointcloud."""
+    """Scene object for drawing pointcloud.
+
+    Pointclouds with more points than fit in a single chunk are drawn progressively.
+    A decimated preview of the pointcloud is drawn first,
+    and :meth:`refine` adds the remaining points, up to the point budget, one chunk at a time.
+    Every chunk is sent to the notebook as a separate pythreejs object in a group.
+
+    Parameters
+    ----------
+    pointbudget : int, optional
+        The maximum number of points that are drawn.
+        Default is ``config.view.pointcloud_budget``.
+
+    """
+
+    def __init__(self, *args, pointbudget: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pointbudget = pointbudget
+        # the chunks that have not been drawn yet
+        self._chunks = deque()
 
     def draw(self):
         """Draw the pointcloud associated with the scene object.
 
         Returns
         -------
-        list[three.Points]
+        list[three.Points] | list[three.Group]
             List of pythreejs objects created.
 
         """
-        geometry = pointcloud_to_threejs(self.geometry)
-        material = three.PointsMaterial(size=self.pointsize, color=self.color.hex)
-        pointclouds = three.Points(geometry, material)
+        material = self.cached_material(three.PointsMaterial, size=self.pointsize, color=self.color.hex)
+
+        if self.viewer is None:
+            budget = self.pointbudget
+            chunksize = None
+            method = "voxel"
+        else:
+            config = self.viewer.config.view
+            budget = self.pointbudget or config.pointcloud_budget
+            chunksize = config.pointcloud_chunksize
+            method = config.pointcloud_decimation
 
-        self._guids = [pointclouds]
+        n = len(self.geometry.points)
+        if (budget is None or n <= budget) and (chunksize is None or n <= chunksize):
+            geometry = pointcloud_to_threejs(self.geometry)
+            pointclouds = three.Points(geometry, material)
+            self._chunks = deque()
+            self._guids = [pointclouds]
+            return self.guids
+
+        points = numpy.asarray(self.geometry.points, dtype=numpy.float32)
+        budget = min(budget or n, n)
+        chunksize = min(chunksize or budget, budget)
+
+        # the preview is a decimated version of the points of the budget,
+        # such that the decimations are nested and the drawn points never exceed the budget,
+        # and the refinements add the remaining points of the budget in random order
+        selection = decimate_points(points, budget, method=method) if budget < n else numpy.arange(n)
+        preview = selection[decimate_points(points[selection], chunksize, method=method)]
+        rest = numpy.setdiff1d(selection, preview, assume_unique=True)
+        rest = numpy.random.default_rng(0).permutation(rest)
+
+        chunks = [preview] + [rest[i : i + chunksize] for i in range(0, len(rest), chunksize)]
+        self._chunks = deque(points[chunk] for chunk in chunks)
+        self._guids = [three.Group()]
+        self.refine()
         return self.guids
+
+    def refine(self):
+        if not self._chunks:
+            return False
+        material = self.cached_material(three.PointsMaterial, size=self.pointsize, color=self.color.hex)
+        self._guids[0].add(three.Points(vertices_to_threejs(self._chunks.popleft()), material))
+        return True
+
+    def aabb(self):
+        return points_to_aabb(self.geometry.points)
@@ -4,6 +4,7 @@ from compas.scene import GeometryObject
 from compas_notebook.conversions import point_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import points_to_aabb
 
 
 class ThreePointObject(ThreeSceneObject, GeometryObject):
@@ -19,8 +20,11 @@ class ThreePointObject(ThreeSceneObject, GeometryObject):
 
         """
         geometry = point_to_threejs(self.geometry)
-        material = three.PointsMaterial(size=self.pointsize, color=self.color.hex)
+        material = self.cached_material(three.PointsMaterial, size=self.pointsize, color=self.color.hex)
         points = three.Points(geometry, material)
 
         self._guids = [points]
         return self.guids
+
+    def aabb(self):
+        return points_to_aabb([self.geometry])
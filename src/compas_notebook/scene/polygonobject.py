@@ -7,11 +7,14 @@ from compas_notebook.conversions import vertices_and_edges_to_threejs
 from compas_notebook.conversions import vertices_and_faces_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import points_to_aabb
 
 
 class ThreePolygonObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing polygons."""
 
+    mergeable = True
+
     def draw(self):
         """Draw the polygon associated with the scene object.
 
@@ -23,14 +26,36 @@ class ThreePolygonObject(ThreeSceneObject, GeometryObject):
         """
         n = len(self.geometry.points)
         vertices = self.geometry.points
-        triangles = earclip_polygon(self.geometry)
+        triangles = self.triangulate(vertices, self._faces())[0]
         edges = list(pairwise(range(len(vertices)))) + [(n - 1, 0)]
 
         geometry = vertices_and_faces_to_threejs(vertices, triangles)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=self.color.hex, side="DoubleSide"))
+        material = self.cached_material(three.MeshBasicMaterial, color=self.color.hex, side="DoubleSide")
+        mesh = three.Mesh(geometry, material)
 
         geometry = vertices_and_edges_to_threejs(vertices, edges)
-        line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        material = self.cached_material(three.LineBasicMaterial, color=self.contrastcolor.hex)
+        line = three.LineSegments(geometry, material)
 
         self._guids = [mesh, line]
         return self.guids
+
+    def _faces(self) -> list[list[int]]:
+        # polygons can be concave, therefore also quads are ear clipped instead of split by a fixed pattern,
+        # polygons with more vertices are ear clipped through the triangulation cache
+        n = len(self.geometry.points)
+        if n <= 4:
+            return earclip_polygon(self.geometry)
+        return [list(range(n))]
+
+    def aabb(self):
+        return points_to_aabb(self.geometry.points)
+
+    def merge_buffers(self):
+        n = len(self.geometry.points)
+        vertices = self.geometry.points
+        edges = list(pairwise(range(n))) + [(n - 1, 0)]
+        return {
+            "faces": (vertices, self._faces(), self.color),
+            "lines": (vertices, edges, self.contrastcolor),
+        }
@@ -5,11 +5,14 @@ from compas_notebook.conversions import vertices_and_edges_to_threejs
 from compas_notebook.conversions import vertices_and_faces_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import points_to_aabb
 
 
 class ThreePolyhedronObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing polyhedron."""
 
+    mergeable = True
+
     def draw(self):
         """Draw the polyhedron associated with the scene object.
 
@@ -26,15 +29,28 @@ class ThreePolyhedronObject(ThreeSceneObject, GeometryObject):
         """
         vertices = self.geometry.vertices
         faces = self.geometry.faces
-        edges = self.geometry.edges
+        # the edges of a polyhedron are a generator
+        edges = list(self.geometry.edges)
 
         geometry = vertices_and_faces_to_threejs(vertices, faces)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=self.color.hex, side="DoubleSide"))
+        material = self.cached_material(three.MeshBasicMaterial, color=self.color.hex, side="DoubleSide")
+        mesh = three.Mesh(geometry, material)
 
         geometry = vertices_and_edges_to_threejs(vertices, edges)
-        line = three.LineSegments(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        material = self.cached_material(three.LineBasicMaterial, color=self.contrastcolor.hex)
+        line = three.LineSegments(geometry, material)
 
         guids = [mesh, line]
 
         self._guids = guids
         return self.guids
+
+    def aabb(self):
+        return points_to_aabb(self.geometry.vertices)
+
+    def merge_buffers(self):
+        vertices = self.geometry.vertices
+        return {
+            "faces": (vertices, self.geometry.faces, self.color),
+            "lines": (vertices, list(self.geometry.edges), self.contrastcolor),
+        }
@@ -1,14 +1,18 @@
 import pythreejs as three
 from compas.scene import GeometryObject
+from compas.utilities import pairwise
 
 from compas_notebook.conversions import polyline_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import points_to_aabb
 
 
 class ThreePolylineObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing polyline."""
 
+    mergeable = True
+
     def draw(self):
         """Draw the polyline associated with the scene object.
 
@@ -19,9 +23,17 @@ class ThreePolylineObject(ThreeSceneObject, GeometryObject):
 
         """
         geometry = polyline_to_threejs(self.geometry)
-        polyline = three.Line(geometry, three.LineBasicMaterial(color=self.contrastcolor.hex))
+        polyline = three.Line(geometry, self.cached_material(three.LineBasicMaterial, color=self.contrastcolor.hex))
 
         guids = [polyline]
 
         self._guids = guids
         return self.guids
+
+    def aabb(self):
+        return points_to_aabb(self.geometry.points)
+
+    def merge_buffers(self):
+        n = len(self.geometry.points)
+        edges = list(pairwise(range(n)))
+        return {"lines": (self.geometry.points, edges, self.contrastcolor)}
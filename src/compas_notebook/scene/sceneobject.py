@@ -1,17 +1,486 @@
+import hashlib
+import typing
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
 from typing import Tuple
 
 import numpy
 import pythreejs as three
 from compas.colors import Color
+from compas.colors import ColorDict
+from compas.geometry import Frame
 from compas.geometry import Rotation
 from compas.geometry import Transformation
 from compas.scene import SceneObject
 
+from compas_notebook.conversions import attribute_array
+from compas_notebook.conversions import quantize_colors
+from compas_notebook.conversions import set_attribute_array
+from compas_notebook.conversions import triangulate_faces
+
+if typing.TYPE_CHECKING:
+    from compas_notebook.viewer import Viewer
+
 Rx = Rotation.from_axis_and_angle([1, 0, 0], 3.14159 / 2)
 
+# attributes of scene objects that record the drawn state, and are therefore not part of the fingerprint
+_UNTRACKED = (
+    "_guids",
+    "_fingerprint",
+    "_partial_fingerprints",
+    "_worldmatrix",
+    "_basematrices",
+    "_buffers",
+    "_cached_vertex_xyz",
+)
+
+
+def points_to_aabb(points) -> Tuple[float, float, float, float, float, float]:
+    """Compute the axis-aligned bounding box of a collection of points.
+
+    Parameters
+    ----------
+    points : array-like
+        The point coordinates, with shape ``(n, 3)``.
+
+    Returns
+    -------
+    tuple[float, float, float, float, float, float] | None
+        The bounds, as ``(xmin, ymin, zmin, xmax, ymax, zmax)``, or None if there are no points.
+
+    """
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 3)
+    if not len(points):
+        return None
+    return tuple(points.min(axis=0).tolist() + points.max(axis=0).tolist())
+
+
+def sphere_to_aabb(center, radius: float) -> Tuple[float, float, float, float, float, float]:
+    """Compute the axis-aligned bounding box of a sphere.
+
+    Parameters
+    ----------
+    center : :class:`compas.geometry.Point`
+        The center of the sphere.
+    radius : float
+        The radius of the sphere.
+
+    Returns
+    -------
+    tuple[float, float, float, float, float, float]
+        The bounds, as ``(xmin, ymin, zmin, xmax, ymax, zmax)``.
+
+    """
+    x, y, z = center
+    return x - radius, y - radius, z - radius, x + radius, y + radius, z + radius
+
+
+def transform_aabb(bounds, matrix) -> Tuple[float, float, float, float, float, float]:
+    """Compute the axis-aligned bounding box of a transformed axis-aligned bounding box.
+
+    Parameters
+    ----------
+    bounds : tuple[float, float, float, float, float, float] | None
+        The bounds, as ``(xmin, ymin, zmin, xmax, ymax, zmax)``.
+    matrix : array-like
+        The row-major 4x4 transformation matrix.
+
+    Returns
+    -------
+    tuple[float, float, float, float, float, float] | None
+        The bounds of the eight transformed corners of the box, or None if there are no bounds.
+
+    """
+    if bounds is None:
+        return None
+    matrix = numpy.asarray(matrix, dtype=numpy.float64)
+    corners = numpy.array(numpy.meshgrid(*zip(bounds[:3], bounds[3:]), indexing="ij")).reshape(3, -1).T
+    return points_to_aabb(corners @ matrix[:3, :3].T + matrix[:3, 3])
+
+
+def _object_matrix(obj: three.Object3D) -> numpy.ndarray:
+    """The row-major 4x4 matrix of a pythreejs object, also if it is composed from its position, rotation and scale."""
+    if not obj.matrixAutoUpdate:
+        return numpy.array(obj.matrix, dtype=numpy.float64).reshape(4, 4).T
+    x, y, z, w = obj.quaternion
+    rotation = numpy.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+    matrix = numpy.identity(4)
+    matrix[:3, :3] = rotation * numpy.asarray(obj.scale, dtype=numpy.float64)
+    matrix[:3, 3] = obj.position
+    return matrix
+
+
+def _canonical(value: Any) -> Any:
+    """Convert a scene object attribute to a hashable, comparable representation.
+
+    Returns ``NotImplemented`` for values that should not contribute to the fingerprint,
+    such as data items, scene tree nodes and pythreejs objects.
+
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Color):
+        return value.rgba
+    if isinstance(value, ColorDict):
+        return _canonical(value.default), tuple(sorted((repr(key), _canonical(color)) for key, color in value.items()))
+    if isinstance(value, Transformation):
+        return tuple(tuple(row) for row in value.matrix)
+    if isinstance(value, Frame):
+        return tuple(value.point), tuple(value.xaxis), tuple(value.yaxis)
+    if isinstance(value, (list, tuple)):
+        items = tuple(_canonical(item) for item in value)
+        if NotImplemented in items:
+            return NotImplemented
+        return items
+    return NotImplemented
+
 
 class ThreeSceneObject(SceneObject):
-    """Base class for all PyThreeJS scene objects."""
+    """Base class for all PyThreeJS scene objects.
+
+    Scene objects keep track of the state in which they were last drawn.
+    A viewer uses :meth:`redraw` to only redraw the objects that have changed since then.
+
+    Attributes
+    ----------
+    viewer : :class:`compas_notebook.viewer.Viewer` | None
+        The viewer that is drawing the scene object, if any.
+        The viewer provides shared resources, such as the geometry cache and the material pool.
+    mergeable : bool
+        Flag indicating that the object can be merged with other static objects into shared buffers.
+        See :meth:`merge_buffers`.
+    tessellated : bool
+        Flag indicating that the object is a curved shape that is tessellated with a variable number of segments.
+        See :meth:`segments`.
+    recolorable : bool
+        Flag indicating that the colors of the drawn object can be updated without redrawing it.
+        See :meth:`update_colors`.
+    parts : tuple[str, ...]
+        The names of the parts of the object, such as ``"vertices"``, ``"edges"`` and ``"faces"``,
+        that are shown or hidden with a ``show_<part>`` flag each, without redrawing the object.
+        See :meth:`draw_visibility`.
+    resolution : int | None
+        The number of segments of this object, if it is tessellated.
+        If None, the resolution is determined by the configuration of the viewer.
+
+    """
+
+    mergeable = False
+    tessellated = False
+    recolorable = False
+    parts: Tuple[str, ...] = ()
+
+    def __init__(self, *args, resolution: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fingerprint = None
+        # the fingerprints of the drawn state without the settings of which the drawn objects can be updated in place
+        self._partial_fingerprints: dict[str, str] = {}
+        # the world transformation that was applied to the drawn objects,
+        # and the matrices of the drawn objects without it, which are derived when the object is first moved
+        self._worldmatrix = None
+        self._basematrices = None
+        # the drawn pythreejs object of every part, followed by the elements it represents
+        self._drawn: dict[str, tuple] = {}
+        self.viewer: "Viewer" = None
+        self.resolution = resolution
+
+    def fingerprint(self, colors: bool = True, transformation: bool = True, visibility: bool = True) -> str:
+        """Compute a fingerprint of the data item and the visualisation settings of the scene object.
+
+        Parameters
+        ----------
+        colors : bool, optional
+            If False, the color settings are left out of the fingerprint.
+        transformation : bool, optional
+            If False, the frame and the transformation of the scene object are left out of the fingerprint.
+        visibility : bool, optional
+            If False, the ``show_<part>`` flags of the parts of the object are left out of the fingerprint,
+            if they are True or False, and not a selection of elements.
+
+        Returns
+        -------
+        str
+            A hexadecimal digest that changes whenever the item or any of the settings change.
+
+        """
+        return self._digest(self.item.sha256(as_string=True), colors, transformation, visibility)
+
+    def _digest(self, itemhash: str, colors: bool = True, transformation: bool = True, visibility: bool = True) -> str:
+        flags = {f"show_{part}" for part in self.parts}
+        state = []
+        for name, value in sorted(vars(self).items()):
+            if name in _UNTRACKED:
+                continue
+            if not colors and isinstance(value, (Color, ColorDict)):
+                continue
+            if not transformation and name in ("_frame", "_transformation"):
+                continue
+            if not visibility and name in flags and isinstance(value, bool):
+                continue
+            value = _canonical(value)
+            if value is NotImplemented:
+                continue
+            state.append((name, value))
+        state.append(("item", itemhash))
+        if self.tessellated:
+            # in automatic mode, the resolution depends on the rest of the scene
+            state.append(("segments", self.segments()))
+        return hashlib.sha256(repr(state).encode()).hexdigest()
+
+    def _record(self, itemhash: str) -> None:
+        # record the state in which the pythreejs objects were drawn
+        self._fingerprint = self._digest(itemhash)
+        aspects = ["transformation"]
+        if self.recolorable:
+            aspects.append("colors")
+        if self.parts:
+            aspects.append("visibility")
+        self._partial_fingerprints = {aspect: self._digest(itemhash, **{aspect: False}) for aspect in aspects}
+
+    def _only_changed(self, aspect: str, itemhash: str) -> bool:
+        # check if at most the given aspect of the settings changed since the object was drawn
+        partial = self._partial_fingerprints.get(aspect)
+        return partial is not None and self._digest(itemhash, **{aspect: False}) == partial
+
+    @property
+    def worldmatrix(self) -> numpy.ndarray:
+        """The row-major 4x4 matrix of the frames of the parents of the object, combined with its transformation."""
+        return numpy.array(self.worldtransformation.matrix, dtype=numpy.float64)
+
+    @property
+    def is_dirty(self) -> bool:
+        """Flag indicating that the scene object has changed since it was last drawn."""
+        return self._fingerprint is None or self._fingerprint != self.fingerprint()
+
+    def invalidate(self) -> None:
+        """Mark the scene object as changed, such that it is redrawn during the next viewer update.
+
+        Use this after modifying the item in ways that are not reflected in its data,
+        or to force a redraw for any other reason.
+
+        """
+        self._fingerprint = None
+        self._partial_fingerprints = {}
+
+    def redraw(self) -> bool:
+        """Draw the scene object, but only if it has changed since it was last drawn.
+
+        If only the transformation of the object, or the frame of any of its parents, has changed,
+        the matrices of the existing pythreejs objects are updated instead (see :meth:`update_transformation`).
+        Likewise, if only the colors of a recolorable object have changed,
+        the colors of the existing pythreejs objects are updated (see :meth:`update_colors`),
+        and if only parts of the object were shown or hidden,
+        the visibility of the existing pythreejs objects is updated (see :meth:`draw_visibility`).
+
+        Returns
+        -------
+        bool
+            True if pythreejs objects were drawn,
+            False if the existing pythreejs objects are still valid, or were updated in place.
+
+        """
+        if self._guids is not None and self._fingerprint is not None:
+            itemhash = self.item.sha256(as_string=True)
+            if self._digest(itemhash) == self._fingerprint:
+                # the frames of the parents are not part of the fingerprint
+                self.draw_transformation()
+                return False
+            if self._only_changed("transformation", itemhash):
+                self.draw_transformation()
+                self._record(itemhash)
+                return False
+            if self._only_changed("colors", itemhash) and self.draw_colors():
+                self._record(itemhash)
+                return False
+            if self._only_changed("visibility", itemhash):
+                drawn = self.draw_visibility()
+                self._record(itemhash)
+                return drawn
+
+        self.draw()
+        self._worldmatrix = numpy.identity(4)
+        self._basematrices = None
+        self.draw_transformation()
+        # the matrices without the world transformation are derived again when the object is moved,
+        # because the drawn objects may still be quantized
+        self._basematrices = None
+        # the fingerprint is computed after drawing,
+        # because some settings (e.g. the contrast color) are only resolved during drawing
+        self._record(self.item.sha256(as_string=True))
+        return True
+
+    def update_transformation(self) -> bool:
+        """Update the matrices of the drawn pythreejs objects, without redrawing them.
+
+        Only the matrices of the existing pythreejs objects are replaced,
+        which sends 64 bytes per object to the notebook, instead of all of its buffers.
+        This is much cheaper than a redraw if an object is moved frequently,
+        for example when animating its transformation, or the frame of one of its parents.
+
+        If anything else than the transformation has changed since the object was last drawn,
+        nothing is updated and the object is redrawn during the next viewer update instead.
+
+        Returns
+        -------
+        bool
+            True if the matrices were updated, False if the object has to be redrawn.
+
+        """
+        if self._guids is None:
+            return False
+        itemhash = self.item.sha256(as_string=True)
+        if not self._only_changed("transformation", itemhash):
+            return False
+        self.draw_transformation()
+        self._record(itemhash)
+        return True
+
+    def draw_transformation(self) -> None:
+        """Apply the world transformation of the scene object to the matrices of the drawn pythreejs objects."""
+        world = self.worldmatrix
+        if self._worldmatrix is None or numpy.array_equal(world, self._worldmatrix):
+            return
+        if self._basematrices is None:
+            # the matrices of the drawn objects before the world transformation was applied,
+            # including the matrices set by draw, and those folded in by the quantization of the buffers
+            inverse = numpy.linalg.inv(self._worldmatrix)
+            self._basematrices = [inverse @ _object_matrix(obj) for obj in self.guids]
+        for obj, base in zip(self.guids, self._basematrices):
+            obj.matrix = (world @ base).T.ravel().tolist()
+            obj.matrixAutoUpdate = False
+        self._worldmatrix = world
+
+    def draw_visibility(self) -> bool:
+        """Show and hide the drawn parts of the object according to their ``show_<part>`` flags.
+
+        Hidden parts are kept, and only their ``visible`` flag is turned off,
+        such that showing them again only sends that flag to the notebook.
+        Parts that are shown for the first time are drawn with :meth:`draw_part`.
+
+        Returns
+        -------
+        bool
+            True if any parts were drawn.
+
+        """
+        self.draw_transformation()
+        drawn = []
+        for part in self.parts:
+            show = bool(getattr(self, f"show_{part}"))
+            if part in self._drawn:
+                obj = self._drawn[part][0]
+                if obj.visible != show:
+                    obj.visible = show
+            elif show:
+                drawn.append(self.draw_part(part))
+        if not drawn:
+            return False
+
+        if not numpy.array_equal(self._worldmatrix, numpy.identity(4)):
+            for obj in drawn:
+                obj.matrix = (self._worldmatrix @ _object_matrix(obj)).T.ravel().tolist()
+                obj.matrixAutoUpdate = False
+        self._guids = list(self._guids) + drawn
+        self._basematrices = None
+        return True
+
+    def draw_part(self, part: str) -> three.Object3D:
+        """Draw a single part of the object, with all of its elements.
+
+        Objects with :attr:`parts` implement this, and register the drawn pythreejs object in ``_drawn``.
+
+        Parameters
+        ----------
+        part : str
+            The name of the part.
+
+        Returns
+        -------
+        :class:`three.Object3D`
+
+        """
+        raise NotImplementedError
+
+    def update_colors(self) -> bool:
+        """Update the colors of the drawn pythreejs objects, without redrawing them.
+
+        Only the color buffers or the materials of the existing pythreejs objects are replaced,
+        and their positions and indices are left untouched.
+        This is much cheaper than a redraw if only the colors of an object change frequently,
+        for example when visualising the results of an analysis.
+
+        If anything else than the colors has changed since the object was last drawn,
+        or the new colors can't be applied to the existing pythreejs objects,
+        nothing is updated and the object is redrawn during the next viewer update instead.
+
+        Returns
+        -------
+        bool
+            True if the colors were updated, False if the object has to be redrawn.
+
+        """
+        if self._guids is None:
+            return False
+        itemhash = self.item.sha256(as_string=True)
+        if not self._only_changed("colors", itemhash):
+            return False
+        if not self.draw_colors():
+            self.invalidate()
+            return False
+        self._record(itemhash)
+        return True
+
+    def draw_colors(self) -> bool:
+        """Apply the current colors to the drawn pythreejs objects.
+
+        Objects that support color updates implement this and set :attr:`recolorable`.
+
+        Returns
+        -------
+        bool
+            True if the colors were applied, False if the pythreejs objects have to be redrawn.
+
+        """
+        return False
+
+    def set_color_attribute(self, geometry: three.BufferGeometry, colors: numpy.ndarray) -> None:
+        """Replace the color buffer of a drawn geometry.
+
+        The colors are quantized if the existing buffer is quantized.
+
+        Parameters
+        ----------
+        geometry : :class:`three.BufferGeometry`
+            The geometry.
+        colors : numpy.ndarray
+            The new colors, with shape ``(n, 3)`` and components in ``[0, 1]``.
+
+        """
+        attribute = geometry.attributes["color"]
+        if attribute_array(attribute).dtype == numpy.uint8:
+            colors = quantize_colors(colors)
+        else:
+            colors = numpy.asarray(colors, dtype=numpy.float32)
+        set_attribute_array(attribute, colors)
+
+    def refine(self) -> bool:
+        """Add the next level of detail to the pythreejs objects of a progressively drawn object.
+
+        Returns
+        -------
+        bool
+            True if a refinement was added, False if there was nothing left to refine.
+
+        """
+        return False
 
     def y_to_z(self, transformation: Transformation) -> Transformation:
         """Convert a transformation from COMPAS to the ThreeJS coordinate system.
@@ -29,6 +498,179 @@ class ThreeSceneObject(SceneObject):
         """
         return transformation * Rx
 
+    def aabb(self) -> Optional[Tuple[float, float, float, float, float, float]]:
+        """Compute the axis-aligned bounding box of the object.
+
+        Returns
+        -------
+        tuple[float, float, float, float, float, float] | None
+            The bounds, as ``(xmin, ymin, zmin, xmax, ymax, zmax)``,
+            or None if the bounds of the object are unknown.
+
+        """
+        return None
+
+    def segments(self) -> int:
+        """Determine the number of segments around the circular cross-sections of the object.
+
+        The resolution of the object takes precedence over ``config.view.resolution``.
+        If the resolution is ``"auto"``, the number of segments is chosen
+        based on the size of the object relative to the size of the scene.
+        Objects that span the entire scene get ``config.view.resolution_max`` segments,
+        and the number of segments is halved for every factor four reduction in relative size,
+        down to ``config.view.resolution_min`` segments.
+
+        Returns
+        -------
+        int
+
+        """
+        if self.resolution is not None:
+            return self.resolution
+        if self.viewer is None:
+            return 32
+
+        config = self.viewer.config.view
+        if config.resolution != "auto":
+            return config.resolution
+
+        scene = self.viewer.scenebounds
+        bounds = self.aabb()
+        if scene is None or bounds is None:
+            return config.resolution_max
+        size = numpy.linalg.norm(numpy.subtract(bounds[3:], bounds[:3]))
+        scenesize = numpy.linalg.norm(numpy.subtract(scene[3:], scene[:3]))
+        if scenesize == 0:
+            return config.resolution_max
+        segments = config.resolution_max * (size / scenesize) ** 0.5
+        # snap to powers of two, such that similar objects share geometries and instances
+        segments = 2 ** round(numpy.log2(max(segments, 1)))
+        return int(min(max(segments, config.resolution_min), config.resolution_max))
+
+    def instance_key(self) -> Hashable:
+        """Identify the base geometry of the object when drawn as an instance of a shared geometry.
+
+        Objects with the same instance key can be drawn together by a single instanced mesh.
+
+        Returns
+        -------
+        hashable | None
+            The key, or None if the object can't be drawn as an instance.
+
+        """
+        return None
+
+    def instance_mesh(self) -> Tuple[list, list]:
+        """Construct the base geometry of the object when drawn as an instance of a shared geometry.
+
+        Returns
+        -------
+        tuple[list[list[float]], list[list[int]]]
+            The vertices and faces of the base geometry.
+
+        """
+        raise NotImplementedError
+
+    def instance_transformation(self) -> Transformation:
+        """Compute the transformation of the base geometry into the geometry of the object.
+
+        Returns
+        -------
+        :class:`compas.geometry.Transformation`
+
+        """
+        raise NotImplementedError
+
+    def merge_buffers(self) -> dict[str, Tuple[list, list, Color]]:
+        """Construct the buffers of the object when drawn as part of a merged static geometry.
+
+        Returns
+        -------
+        dict[str, tuple[list[list[float]], list[list[int]], :class:`compas.colors.Color`]]
+            Per kind of buffer, ``"faces"`` or ``"lines"``, the vertices,
+            the faces or line segments as lists of vertex indices, and the color.
+
+        """
+        raise NotImplementedError
+
+    def cached_geometry(self, key: Hashable, factory: Callable[[], three.BufferGeometry]) -> three.BufferGeometry:
+        """Get a geometry from the geometry cache of the viewer, or create it.
+
+        Scene objects with identical geometry parameters share a single pythreejs geometry,
+        and only differ in the transformation matrix of the objects that use it.
+        Without a viewer, a new geometry is created every time.
+
+        Parameters
+        ----------
+        key : hashable
+            The parameters that uniquely define the geometry.
+        factory : callable
+            A function without arguments that creates the geometry.
+
+        Returns
+        -------
+        :class:`three.BufferGeometry`
+
+        """
+        if self.viewer is None:
+            return factory()
+        return self.viewer.geometries.get(key, factory)
+
+    def triangulate(self, vertices, faces) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Triangulate faces, with the process pool and the triangulation cache of the viewer.
+
+        Faces with more than four vertices of which the shape was triangulated before,
+        by this or any other object, are not triangulated again.
+        Without a viewer, all faces are triangulated serially, without a cache.
+
+        Parameters
+        ----------
+        vertices : array-like
+            The vertex coordinates.
+        faces : list[list[int]] | numpy.ndarray
+            The faces, as lists of indices into ``vertices``.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            The triangles, and for every triangle the index of the face it belongs to.
+            See :func:`compas_notebook.conversions.triangulate_faces`.
+
+        """
+        if self.viewer is None:
+            return triangulate_faces(vertices, faces)
+        return triangulate_faces(
+            vertices,
+            faces,
+            executor=self.viewer.executor,
+            chunksize=self.viewer.config.view.triangulation_chunksize,
+            cache=self.viewer.triangulations,
+        )
+
+    def cached_material(self, cls: type, **params: Hashable) -> three.Material:
+        """Get a material from the material pool of the viewer, or create it.
+
+        Scene objects with identical material parameters share a single pythreejs material.
+        Therefore, shared materials should not be modified in place.
+        Without a viewer, a new material is created every time.
+
+        Parameters
+        ----------
+        cls : type[:class:`three.Material`]
+            The type of material, for example :class:`three.MeshBasicMaterial`.
+        **params : dict
+            The parameters of the material, for example ``color``, ``side``, ``size`` or ``vertexColors``.
+
+        Returns
+        -------
+        :class:`three.Material`
+
+        """
+        if self.viewer is None:
+            return cls(**params)
+        key = (cls.__name__,) + tuple(sorted(params.items()))
+        return self.viewer.materials.get(key, lambda: cls(**params))
+
     def geometry_to_objects(
         self,
         geometry: three.BufferGeometry,
@@ -58,9 +700,9 @@ class ThreeSceneObject(SceneObject):
         if not contrastcolor:
             contrastcolor = self.contrastcolor
 
-        edges = three.EdgesGeometry(geometry)
-        mesh = three.Mesh(geometry, three.MeshBasicMaterial(color=color.hex, side="DoubleSide"))
-        line = three.LineSegments(edges, three.LineBasicMaterial(color=contrastcolor.hex))
+        edges = self.cached_geometry(("EdgesGeometry", geometry.model_id), lambda: three.EdgesGeometry(geometry))
+        mesh = three.Mesh(geometry, self.cached_material(three.MeshBasicMaterial, color=color.hex, side="DoubleSide"))
+        line = three.LineSegments(edges, self.cached_material(three.LineBasicMaterial, color=contrastcolor.hex))
 
         if transformation:
             matrix = numpy.array(transformation.matrix, dtype=numpy.float32).transpose().ravel().tolist()
@@ -1,13 +1,18 @@
+from compas.geometry import Scale
+from compas.geometry import Sphere
 from compas.scene import GeometryObject
 
 from compas_notebook.conversions import sphere_to_threejs
 
 from .sceneobject import ThreeSceneObject
+from .sceneobject import sphere_to_aabb
 
 
 class ThreeSphereObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing sphere."""
 
+    tessellated = True
+
     def draw(self):
         """Draw the sphere associated with the scene object.
 
@@ -17,7 +22,12 @@ class ThreeSphereObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = sphere_to_threejs(self.geometry)
+        sphere = self.geometry
+        n = self.segments()
+        geometry = self.cached_geometry(
+            ("SphereGeometry", sphere.radius, n, n),
+            lambda: sphere_to_threejs(sphere, u=n, v=n),
+        )
         transformation = self.y_to_z(self.geometry.transformation)
 
         self._guids = self.geometry_to_objects(
@@ -26,3 +36,18 @@ class ThreeSphereObject(ThreeSceneObject, GeometryObject):
             transformation=transformation,
         )
         return self.guids
+
+    def aabb(self):
+        return sphere_to_aabb(self.geometry.frame.point, self.geometry.radius)
+
+    def instance_key(self):
+        n = self.segments()
+        return ("Sphere", n, n)
+
+    def instance_mesh(self):
+        n = self.segments()
+        return Sphere(1).to_vertices_and_faces(u=n, v=n)
+
+    def instance_transformation(self):
+        sphere = self.geometry
+        return sphere.transformation * Scale.from_factors([sphere.radius] * 3)
@@ -1,21 +1,29 @@
-import pythreejs as three
+from compas.geometry import Scale
+from compas.geometry import Torus
 from compas.scene import GeometryObject
 
+from compas_notebook.conversions import torus_to_threejs
+
 from .sceneobject import ThreeSceneObject
+from .sceneobject import sphere_to_aabb
 
 
 class ThreeTorusObject(ThreeSceneObject, GeometryObject):
     """Scene object for drawing torus."""
 
-    def draw(self, u=128, v=32):
+    tessellated = True
+
+    def draw(self, u=None, v=None):
         """Draw the torus associated with the scene object.
 
         Parameters
         ----------
         u : int, optional
             The number of segments around the main axis.
+            Default is four times :meth:`segments`.
         v : int, optional
             The number of segments around the pipe axis.
+            Default is :meth:`segments`.
 
         Returns
         -------
@@ -23,11 +31,12 @@ class ThreeTorusObject(ThreeSceneObject, GeometryObject):
             List of pythreejs objects created.
 
         """
-        geometry = three.TorusGeometry(
-            radius=self.geometry.radius_axis,
-            tube=self.geometry.radius_pipe,
-            radialSegments=v,
-            tubularSegments=u,
+        torus = self.geometry
+        u = u or 4 * self.segments()
+        v = v or self.segments()
+        geometry = self.cached_geometry(
+            ("TorusGeometry", torus.radius_axis, torus.radius_pipe, u, v),
+            lambda: torus_to_threejs(torus, u=u, v=v),
         )
         transformation = self.y_to_z(self.geometry.transformation)
 
@@ -37,3 +46,21 @@ class ThreeTorusObject(ThreeSceneObject, GeometryObject):
             transformation=transformation,
         )
         return self.guids
+
+    def aabb(self):
+        torus = self.geometry
+        return sphere_to_aabb(torus.frame.point, torus.radius_axis + torus.radius_pipe)
+
+    def instance_key(self):
+        torus = self.geometry
+        n = self.segments()
+        return ("Torus", torus.radius_pipe / torus.radius_axis, 4 * n, n)
+
+    def instance_mesh(self):
+        torus = self.geometry
+        n = self.segments()
+        return Torus(1, torus.radius_pipe / torus.radius_axis).to_vertices_and_faces(u=4 * n, v=n)
+
+    def instance_transformation(self):
+        torus = self.geometry
+        return self.y_to_z(torus.transformation) * Scale.from_factors([torus.radius_axis] * 3)
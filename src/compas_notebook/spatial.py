@@ -0,0 +1,260 @@
+import typing
+from typing import Any
+from typing import Hashable
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+import numpy
+
+from compas_notebook.scene.sceneobject import transform_aabb
+
+if typing.TYPE_CHECKING:
+    from compas_notebook.scene import ThreeSceneObject
+
+
+class BVH:
+    """A bounding volume hierarchy over a collection of axis-aligned bounding boxes.
+
+    The hierarchy is a binary tree of boxes.
+    Every node contains the boxes of its children,
+    and the boxes of the items are split between the children at the median of the longest axis of their centers.
+    Queries only descend into the nodes of which the box passes the test,
+    which takes O(log n) time for small query regions instead of testing all items.
+
+    Parameters
+    ----------
+    boxes : array-like
+        The bounding boxes of the items, with shape ``(n, 6)``,
+        as ``(xmin, ymin, zmin, xmax, ymax, zmax)``.
+    items : list, optional
+        The items corresponding to the boxes.
+        Default is the indices of the boxes.
+    leafsize : int, optional
+        The maximum number of items in a leaf node.
+
+    Examples
+    --------
+    >>> bvh = BVH([[0, 0, 0, 1, 1, 1], [2, 0, 0, 3, 1, 1]], items=["a", "b"])
+    >>> bvh.bounds
+    (0.0, 0.0, 0.0, 3.0, 1.0, 1.0)
+    >>> bvh.query_box([2.5, 0, 0, 4, 1, 1])
+    ['b']
+
+    """
+
+    def __init__(self, boxes, items: list = None, leafsize: int = 4):
+        self.boxes = numpy.asarray(boxes, dtype=numpy.float64).reshape(-1, 6)
+        self.items = list(items) if items is not None else list(range(len(self.boxes)))
+        self.leafsize = leafsize
+        self.order = numpy.arange(len(self.boxes))
+        self.lower = []
+        self.upper = []
+        self.ranges = []
+        self.children = []
+        if len(self.boxes):
+            self._build(0, len(self.boxes))
+        self.lower = numpy.array(self.lower).reshape(-1, 3)
+        self.upper = numpy.array(self.upper).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _build(self, start: int, stop: int) -> int:
+        indices = self.order[start:stop]
+        boxes = self.boxes[indices]
+        node = len(self.ranges)
+        self.lower.append(boxes[:, :3].min(axis=0))
+        self.upper.append(boxes[:, 3:].max(axis=0))
+        self.ranges.append((start, stop))
+        self.children.append(None)
+
+        if stop - start > self.leafsize:
+            centers = boxes[:, :3] + boxes[:, 3:]
+            axis = numpy.argmax(centers.max(axis=0) - centers.min(axis=0))
+            self.order[start:stop] = indices[numpy.argsort(centers[:, axis], kind="stable")]
+            middle = (start + stop) // 2
+            self.children[node] = (self._build(start, middle), self._build(middle, stop))
+
+        return node
+
+    @property
+    def bounds(self) -> Optional[Tuple[float, float, float, float, float, float]]:
+        """The bounding box of all items, or None if there are no items."""
+        if not len(self.ranges):
+            return None
+        return tuple(self.lower[0].tolist() + self.upper[0].tolist())
+
+    def _query(self, test) -> list:
+        # the test is vectorised over arrays of lower and upper corners of boxes
+        result = []
+        stack = [0] if len(self.ranges) else []
+        while stack:
+            node = stack.pop()
+            if not test(self.lower[node : node + 1], self.upper[node : node + 1])[0]:
+                continue
+            if self.children[node] is not None:
+                stack.extend(self.children[node])
+                continue
+            start, stop = self.ranges[node]
+            indices = self.order[start:stop]
+            boxes = self.boxes[indices]
+            result.extend(indices[test(boxes[:, :3], boxes[:, 3:])].tolist())
+        return result
+
+    def query_box(self, box) -> list:
+        """Find the items of which the bounding box overlaps with a query box.
+
+        Parameters
+        ----------
+        box : array-like
+            The query box, as ``(xmin, ymin, zmin, xmax, ymax, zmax)``.
+
+        Returns
+        -------
+        list
+
+        """
+        box = numpy.asarray(box, dtype=numpy.float64)
+
+        def test(lower, upper):
+            return numpy.all((lower <= box[3:]) & (upper >= box[:3]), axis=-1)
+
+        return [self.items[index] for index in sorted(self._query(test))]
+
+    def query_ray(self, origin, direction) -> list:
+        """Find the items of which the bounding box is hit by a ray, ordered by distance along the ray.
+
+        Parameters
+        ----------
+        origin : array-like
+            The start point of the ray.
+        direction : array-like
+            The direction of the ray.
+
+        Returns
+        -------
+        list[tuple[float, Any]]
+            The distance to the entry point of the box of every item that is hit, and the item.
+
+        """
+        origin = numpy.asarray(origin, dtype=numpy.float64)
+        direction = numpy.asarray(direction, dtype=numpy.float64)
+        with numpy.errstate(divide="ignore"):
+            inverse = 1.0 / direction
+
+        def entry(lower, upper):
+            with numpy.errstate(invalid="ignore"):
+                a = (lower - origin) * inverse
+                b = (upper - origin) * inverse
+            # a ray parallel to a slab and inside of it produces NaN, which doesn't constrain the interval
+            tmin = numpy.nanmax(numpy.minimum(a, b), axis=-1, initial=-numpy.inf)
+            tmax = numpy.nanmin(numpy.maximum(a, b), axis=-1, initial=numpy.inf)
+            return tmin, (tmax >= numpy.maximum(tmin, 0))
+
+        indices = self._query(lambda lower, upper: entry(lower, upper)[1])
+        if not indices:
+            return []
+        distances = numpy.maximum(entry(self.boxes[indices, :3], self.boxes[indices, 3:])[0], 0)
+        hits = [(float(distance), self.items[index]) for distance, index in zip(distances, indices)]
+        return sorted(hits, key=lambda hit: hit[0])
+
+    def query_planes(self, planes) -> list:
+        """Find the items of which the bounding box is not entirely outside of any of a set of planes.
+
+        This can be used for culling against a view frustum.
+
+        Parameters
+        ----------
+        planes : array-like
+            The planes, with shape ``(m, 4)``, as coefficients ``(a, b, c, d)``
+            such that points on the inside satisfy ``a * x + b * y + c * z + d >= 0``.
+
+        Returns
+        -------
+        list
+
+        """
+        planes = numpy.asarray(planes, dtype=numpy.float64).reshape(-1, 4)
+        normals = planes[:, :3]
+
+        def test(lower, upper):
+            # the corner of every box that is furthest along the normal of every plane
+            corner = numpy.where(normals >= 0, upper[:, None, :], lower[:, None, :])
+            return numpy.all((corner * normals).sum(axis=-1) + planes[:, 3] >= 0, axis=-1)
+
+        return [self.items[index] for index in sorted(self._query(test))]
+
+
+class SceneIndex:
+    """Spatial index of the objects of a scene.
+
+    The index caches the bounding box of every scene object,
+    and maintains a :class:`BVH` over the cached boxes.
+    A cached box remains valid for as long as the frames of the object and its parents are the same,
+    until it is invalidated with :meth:`invalidate`, which the viewer does for every object it redraws.
+    The data of the objects is therefore not hashed again to validate the boxes.
+    The hierarchy is only rebuilt if any of the boxes have changed.
+
+    Attributes
+    ----------
+    bvh : :class:`BVH`
+        The bounding volume hierarchy of the objects that were indexed last.
+
+    """
+
+    def __init__(self):
+        self._boxes: dict = {}
+        self.bvh = BVH([])
+
+    def __len__(self) -> int:
+        return len(self.bvh)
+
+    def update(self, objects: Iterable["ThreeSceneObject"]) -> BVH:
+        """Update the index with the current state of the scene objects.
+
+        Parameters
+        ----------
+        objects : iterable[:class:`compas_notebook.scene.ThreeSceneObject`]
+            The objects of the scene.
+
+        Returns
+        -------
+        :class:`BVH`
+
+        """
+        changed = False
+        boxes = {}
+        for obj in objects:
+            # changes of the object itself are handled by invalidating its box when it is redrawn
+            world = obj.worldmatrix
+            key: Hashable = world.tobytes()
+            cached: Tuple[Hashable, Any] = self._boxes.get(obj)
+            if cached is not None and cached[0] == key:
+                boxes[obj] = cached
+                continue
+            box = obj.aabb()
+            if box is not None and not numpy.array_equal(world, numpy.identity(4)):
+                box = transform_aabb(box, world)
+            boxes[obj] = key, box
+            changed = changed or cached is None or cached[1] != boxes[obj][1]
+
+        if changed or boxes.keys() != self._boxes.keys():
+            items = [obj for obj, (_, box) in boxes.items() if box is not None]
+            self.bvh = BVH([boxes[obj][1] for obj in items], items=items)
+        self._boxes = boxes
+        return self.bvh
+
+    def invalidate(self, obj: "ThreeSceneObject" = None) -> None:
+        """Remove the cached bounding box of an object, or of all objects.
+
+        Parameters
+        ----------
+        obj : :class:`compas_notebook.scene.ThreeSceneObject`, optional
+            The object. If None, the entire index is cleared.
+
+        """
+        if obj is None:
+            self._boxes.clear()
+        else:
+            self._boxes.pop(obj, None)
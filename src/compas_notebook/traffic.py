@@ -0,0 +1,238 @@
+import contextlib
+import json
+import pathlib
+import time
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Iterator
+from typing import Optional
+
+from ipywidgets import Widget
+
+# the meters that are measuring, and the original comm functions while they are hooked
+_meters: list["TrafficMeter"] = []
+_originals: dict = {}
+
+
+def _size(data) -> int:
+    return len(json.dumps(data, default=str, separators=(",", ":")).encode())
+
+
+def _buffer_size(buffers) -> int:
+    return sum(memoryview(buffer).nbytes for buffer in buffers or [])
+
+
+def _log(kind: str, model: str, model_id: Optional[str], keys: list, data, buffers) -> None:
+    entry = {
+        "kind": kind,
+        "model": model,
+        "model_id": model_id,
+        "keys": keys,
+        "state_bytes": _size(data),
+        "buffer_bytes": _buffer_size(buffers),
+    }
+    for meter in _meters:
+        meter._add(entry)
+
+
+def _create_comm(*args, **kwargs):
+    data = kwargs.get("data") or {}
+    if kwargs.get("target_name") == "jupyter.widget":
+        state = data.get("state", {})
+        _log("open", state.get("_model_name"), kwargs.get("comm_id"), sorted(state), data, kwargs.get("buffers"))
+    return _originals["create_comm"](*args, **kwargs)
+
+
+def _send(self, msg, buffers=None):
+    keys = sorted(msg.get("state", {})) if isinstance(msg, dict) else []
+    kind = msg.get("method", "custom") if isinstance(msg, dict) else "custom"
+    _log(kind, self._model_name, self._model_id, keys, msg, buffers)
+    return _originals["_send"](self, msg, buffers=buffers)
+
+
+def _hook() -> None:
+    if _originals:
+        return
+    _originals["_send"] = Widget._send
+    Widget._send = _send
+    try:
+        # ipywidgets 8.1 creates the comms of widgets through a module function,
+        # older versions create them directly, in which case opening widgets is not measured
+        from ipywidgets import comm as widget_comm
+    except ImportError:
+        return
+    _originals["create_comm"] = widget_comm.create_comm
+    widget_comm.create_comm = _create_comm
+
+
+def _unhook() -> None:
+    if not _originals:
+        return
+    Widget._send = _originals.pop("_send")
+    if "create_comm" in _originals:
+        from ipywidgets import comm as widget_comm
+
+        widget_comm.create_comm = _originals.pop("create_comm")
+
+
+@dataclass
+class TrafficRecord:
+    """The comm traffic of a single operation.
+
+    Attributes
+    ----------
+    operation : str
+        The name of the operation.
+    messages : int
+        The number of comm messages.
+    opens : int
+        The number of widgets that were opened, i.e. created in the notebook.
+    state_bytes : int
+        The size of the JSON state of all messages, in bytes.
+    buffer_bytes : int
+        The size of the binary buffers of all messages, in bytes.
+    time : float
+        The duration of the operation, in seconds.
+    log : list[dict]
+        The individual messages, if the meter keeps a log.
+
+    """
+
+    operation: str
+    messages: int = 0
+    opens: int = 0
+    state_bytes: int = 0
+    buffer_bytes: int = 0
+    time: float = 0.0
+    log: list[dict] = field(default_factory=list)
+
+    @property
+    def bytes(self) -> int:
+        """The total size of all messages, in bytes."""
+        return self.state_bytes + self.buffer_bytes
+
+
+class TrafficMeter:
+    """Count the comm messages and bytes that widgets send to the notebook, per operation.
+
+    While an operation is measured, the comm layer of ipywidgets is hooked,
+    and every message that opens a widget or updates its state is counted.
+    Messages are counted when they are sent by the widgets, also if no notebook is connected,
+    such that the traffic can be measured headless.
+    Widgets that are opened are only counted with ipywidgets 8.1 or later,
+    with older versions only the updates of their state are counted.
+
+    Parameters
+    ----------
+    log : bool, optional
+        If True, keep a log of the individual messages, which can be written to a file with :meth:`dump`.
+
+    Attributes
+    ----------
+    records : list[:class:`TrafficRecord`]
+        The measured operations, in order.
+
+    Examples
+    --------
+    >>> from ipywidgets import IntSlider
+    >>> meter = TrafficMeter()
+    >>> with meter.measure("slider") as record:
+    ...     slider = IntSlider()
+    ...     slider.value = 1
+    >>> record.opens, record.messages
+    (3, 4)
+
+    """
+
+    def __init__(self, log: bool = True):
+        self.keep_log = log
+        self.records: list[TrafficRecord] = []
+        self._record: Optional[TrafficRecord] = None
+
+    def _add(self, entry: dict) -> None:
+        record = self._record
+        record.messages += 1
+        record.opens += entry["kind"] == "open"
+        record.state_bytes += entry["state_bytes"]
+        record.buffer_bytes += entry["buffer_bytes"]
+        if self.keep_log:
+            record.log.append(dict(entry, time=time.perf_counter()))
+
+    @contextlib.contextmanager
+    def measure(self, operation: str) -> Iterator[TrafficRecord]:
+        """Measure the traffic of an operation.
+
+        Operations that are measured while another operation of the same meter is measured
+        are counted as part of the outer operation.
+
+        Parameters
+        ----------
+        operation : str
+            The name of the operation.
+
+        Yields
+        ------
+        :class:`TrafficRecord`
+            The record of the operation, which is complete when the context is exited.
+
+        """
+        if self._record is not None:
+            yield self._record
+            return
+
+        record = self._record = TrafficRecord(operation)
+        self.records.append(record)
+        _meters.append(self)
+        _hook()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.time = time.perf_counter() - start
+            self._record = None
+            _meters.remove(self)
+            if not _meters:
+                _unhook()
+
+    def clear(self) -> None:
+        """Forget all measured operations."""
+        self.records = []
+
+    def summary(self) -> str:
+        """Summarize the traffic of all measured operations, one line per operation.
+
+        Returns
+        -------
+        str
+
+        """
+        lines = []
+        for record in self.records:
+            lines.append(
+                f"{record.operation}: {record.messages} messages ({record.opens} opens)"
+                f" | {record.state_bytes / 1e6:.3f} MB state | {record.buffer_bytes / 1e6:.3f} MB buffers"
+                f" | {record.time:.3f}s"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path) -> None:
+        """Write the measured traffic to a JSON Lines file.
+
+        Every line is a JSON object with the totals of one operation.
+        If the meter keeps a log, the line also contains the individual messages of the operation,
+        with the kind of message, the name and id of the widget model, the names of the synced properties,
+        the number of state and buffer bytes, and a timestamp.
+
+        Parameters
+        ----------
+        path : path-like or str
+            The path of the file.
+
+        """
+        with pathlib.Path(path).open("w") as fp:
+            for record in self.records:
+                data = asdict(record)
+                if not self.keep_log:
+                    del data["log"]
+                fp.write(json.dumps(data) + "\n")
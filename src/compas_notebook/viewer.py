@@ -1,4 +1,10 @@
+import asyncio
+import contextlib
 import pathlib
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+from typing import Optional
 
 import ipywidgets as widgets
 import pythreejs as three
@@ -6,8 +12,18 @@ from compas.colors import Color
 from compas.scene import Scene
 from IPython.display import display as ipydisplay
 
+from .cache import Cache
 from .config import Config
 from .controller import Controller
+from .conversions import compress_objects
+from .conversions import quantize_objects
+from .export import write_html
+from .profiling import DrawProfiler
+from .profiling import DrawStats
+from .scene.instancing import ThreeInstanceGroup
+from .scene.merging import ThreeMergeGroup
+from .spatial import SceneIndex
+from .traffic import TrafficMeter
 
 
 class Viewer:
@@ -50,48 +66,433 @@ class Viewer:
         self.scene = scene or Scene(context="Notebook")
         self.controller = controller or Controller(viewer=self)
 
+        # shared pythreejs resources
+        # geometries that are evicted from the cache remain in use by the objects that are drawn with them
+        self.geometries = Cache(maxsize=self.config.view.geometry_cachesize)
+        self.materials = Cache()
+        self.triangulations = Cache(maxsize=self.config.view.triangulation_cachesize)
+        self.instancegroups: dict = {}
+        self.mergegroup: ThreeMergeGroup = None
+        self.scenebounds: tuple = None
+        self.sceneindex = SceneIndex()
+        self.profiler = DrawProfiler()
+        self.traffic: TrafficMeter = None
+        self._executor: ProcessPoolExecutor = None
+        self._executorworkers = 0
+        self._executorfinalizer: weakref.finalize = None
+
         # move this to a UI class
         self.toolbar = None
         self.main = None
         self.statusbar = None
         self.statustext = None
+        self.task: asyncio.Task = None
 
     # =============================================================================
     # System methods
     # =============================================================================
 
-    def show(self) -> None:
-        """Display the viewer in the notebook."""
-        self.init_webgl()
-        self.init_ui()
+    def show(self, asynchronous: bool = False) -> Optional[asyncio.Task]:
+        """Display the viewer in the notebook.
 
-        self.scene.draw()
-        for o in self.scene.objects:
-            for o3 in o.guids:
-                self.scene3.add(o3)
+        Parameters
+        ----------
+        asynchronous : bool, optional
+            If True, display the empty viewer immediately,
+            and draw the scene objects in batches in an asynchronous task.
+            The notebook remains responsive while the objects are drawn,
+            and the status bar shows the progress.
+            See :meth:`update_async`.
+
+        Returns
+        -------
+        :class:`asyncio.Task` | None
+            The task that draws the scene, if the viewer is shown asynchronously.
 
-        ipydisplay(self.ui)
+        """
+        with self.measure_traffic("show"):
+            self.init_webgl()
+            self.init_ui()
+
+            if asynchronous:
+                ipydisplay(self.ui)
+                self.task = asyncio.get_event_loop().create_task(self.update_async())
+                return self.task
+
+            # the refinements of progressively drawn objects are only sent once the viewer is displayed,
+            # such that their previews are shown first, like in asynchronous mode
+            for _ in self.update_steps(refine=False):
+                pass
+            ipydisplay(self.ui)
+            for _ in self.refine_steps():
+                pass
+            if self.config.ui.show_stats:
+                self.set_statustext(self.profiler.summary())
+
+    def measure_traffic(self, operation: str) -> contextlib.AbstractContextManager:
+        """Measure the comm traffic of an operation with :attr:`traffic`, if it is set.
+
+        :meth:`show`, :meth:`update` and :meth:`update_async` are measured automatically.
+        The traffic of an asynchronous update also includes messages of other widgets
+        that are sent while the update waits for the event loop.
+
+        Parameters
+        ----------
+        operation : str
+            The name of the operation.
+
+        Returns
+        -------
+        contextlib.AbstractContextManager
+
+        Examples
+        --------
+        >>> from compas_notebook.traffic import TrafficMeter
+        >>> viewer = Viewer()
+        >>> viewer.traffic = TrafficMeter()
+        >>> viewer.show()  # doctest: +SKIP
+        >>> print(viewer.traffic.summary())  # doctest: +SKIP
+        >>> viewer.traffic.dump("traffic.jsonl")  # doctest: +SKIP
+
+        """
+        if self.traffic is None:
+            return contextlib.nullcontext()
+        return self.traffic.measure(operation)
 
-    # this could be handled better,
-    # by only removing and re-adding objects that have changed.
-    # in any case, visibility should just be updateable...
     def update(self) -> None:
-        """Update an existing viewer instance."""
-        for child in self.scene3.children:
-            self.scene3.remove(child)
+        """Update an existing viewer instance.
+
+        Only scene objects that have changed since they were last drawn are redrawn.
+        The pythreejs objects of all other scene objects are left untouched,
+        and the children of the pythreejs scene are replaced in a single operation.
+
+        Scene objects that have only been moved, by changing their transformation or the frame of any of their parents,
+        are not redrawn, and only the matrices of their pythreejs objects are updated.
+        Likewise, only the colors of recolorable objects of which only the colors have changed are updated.
+        See :meth:`compas_notebook.scene.ThreeSceneObject.redraw`.
+
+        To force a scene object to be redrawn,
+        for example after modifying its item in place without changing its data,
+        use :meth:`compas_notebook.scene.ThreeSceneObject.invalidate`.
+
+        Depending on ``config.view.instancing``,
+        shapes with the same base geometry are drawn together as instances of that geometry.
+        See :class:`compas_notebook.scene.instancing.ThreeInstanceGroup`.
+
+        If ``config.view.merging`` is True,
+        static objects such as lines, polylines, polygons and polyhedra are merged into a few shared geometries.
+        Merged objects can be hidden or recolored individually through :attr:`mergegroup`.
+        See :class:`compas_notebook.scene.merging.ThreeMergeGroup`.
+
+        If ``config.view.resolution`` is ``"auto"``,
+        curved shapes are tessellated based on their size relative to the bounds of the scene.
+        See :meth:`compas_notebook.scene.ThreeSceneObject.segments`.
+
+        If ``config.view.quantization`` is True,
+        the positions and colors of newly drawn objects are quantized before they are sent to the notebook.
+        See :func:`compas_notebook.conversions.quantize_objects`.
+
+        If ``config.view.compression`` is a zlib compression level larger than zero,
+        buffers of newly drawn objects larger than ``config.view.compression_threshold`` bytes
+        are compressed before they are sent to the notebook.
+        See :func:`compas_notebook.conversions.compress_objects`.
+
+        The time and the size of every draw are recorded by :attr:`profiler`, see :meth:`stats`.
+        If ``config.ui.show_stats`` is True, a summary is shown in the status bar.
 
-        self.scene3.children = []
+        """
+        with self.measure_traffic("update"):
+            for _ in self.update_steps():
+                pass
+            if self.config.ui.show_stats:
+                self.set_statustext(self.profiler.summary())
+
+    async def update_async(self, batchsize: int = None) -> None:
+        """Update the viewer in batches, and give control back to the event loop after every batch.
+
+        The pythreejs objects that are already drawn are added to the scene after every batch,
+        such that the scene fills up progressively.
+
+        Parameters
+        ----------
+        batchsize : int, optional
+            The number of scene objects that are drawn per batch.
+            Default is ``config.view.batchsize``.
+
+        """
+        with self.measure_traffic("update_async"):
+            for done, total in self.update_steps(batchsize or self.config.view.batchsize):
+                self.set_statustext(f"Drawing scene objects: {done}/{total}")
+                await asyncio.sleep(0)
+            if self.config.ui.show_stats:
+                self.set_statustext(self.profiler.summary())
+            else:
+                self.set_statustext(f"Drawing scene objects: done ({len(self.scene.objects)} objects)")
+
+    def update_steps(self, batchsize: int = None, refine: bool = True) -> Iterator[tuple[int, int]]:
+        """Update the viewer step by step.
+
+        This is the implementation of :meth:`update` and :meth:`update_async`.
+
+        Parameters
+        ----------
+        batchsize : int, optional
+            The number of scene objects that are drawn per step.
+            If None, the scene is only updated once all objects are drawn,
+            and only the refinements of progressively drawn objects are yielded as steps.
+        refine : bool, optional
+            If False, progressively drawn objects are not refined beyond their previews.
+            The refinements can be added later with :meth:`refine_steps`.
+
+        Yields
+        ------
+        tuple[int, int]
+            The number of completed steps, and the total number of steps.
+            Individual objects, instance groups, the merge group and every refinement count as a step.
+
+        """
+        children = []
+
+        for o in self.scene.objects:
+            o.viewer = self
+
+        self.scenebounds = None
+        if self.config.view.resolution == "auto":
+            bounds = self.controller.scene_bounds()
+            if bounds[0] <= bounds[3]:
+                self.scenebounds = bounds
 
         if self.config.view.show_grid:
-            self.scene3.add(self.grid3)
+            children.append(self.grid3)
         if self.config.view.show_axes:
-            self.scene3.add(self.axes3)
+            children.append(self.axes3)
+
+        objects, groups = self.group_instances()
+
+        merged = []
+        if self.config.view.merging:
+            merged = [o for o in objects if o.mergeable]
+            objects = [o for o in objects if not o.mergeable]
+
+        total = len(objects) + len(groups) + bool(merged)
+        done = 0
+
+        def step():
+            nonlocal done
+            done += 1
+            if batchsize and (done % batchsize == 0 or done == total):
+                if list(self.scene3.children) != children:
+                    self.scene3.children = children
+                return True
+            return False
+
+        for o in objects:
+            if self.profiler.record(o, o.redraw):
+                self.sceneindex.invalidate(o)
+                self.encode_buffers(o.guids)
+            children += o.guids
+            if step():
+                yield done, total
+
+        instancegroups = {}
+        for key, group in groups.items():
+            instancegroup = self.instancegroups.get(key) or ThreeInstanceGroup(key, viewer=self)
+            instancegroup.objects = group
+            if self.profiler.record(instancegroup, instancegroup.redraw):
+                for o in group:
+                    self.sceneindex.invalidate(o)
+            instancegroups[key] = instancegroup
+            children += instancegroup.guids
+            if step():
+                yield done, total
+        self.instancegroups = instancegroups
+
+        if merged:
+            self.mergegroup = self.mergegroup or ThreeMergeGroup(viewer=self)
+            self.mergegroup.objects = merged
+            if self.profiler.record(self.mergegroup, self.mergegroup.redraw):
+                for o in merged:
+                    self.sceneindex.invalidate(o)
+                self.encode_buffers(self.mergegroup.guids)
+            children += self.mergegroup.guids
+            if step():
+                yield done, total
+        else:
+            self.mergegroup = None
+
+        if list(self.scene3.children) != children:
+            self.scene3.children = children
+
+        self.profiler.retain(objects + list(self.instancegroups.values()) + [self.mergegroup])
+
+        if refine:
+            for _ in self.refine_steps(objects):
+                total += 1
+                done += 1
+                yield done, total
+
+    def refine_steps(self, objects: list = None) -> Iterator:
+        """Refine progressively drawn objects step by step.
+
+        Progressively drawn objects are refined after the scene is complete,
+        such that the notebook already shows a preview while the refinements are sent.
+
+        Parameters
+        ----------
+        objects : list[:class:`compas_notebook.scene.ThreeSceneObject`], optional
+            The objects to refine.
+            Default is all objects of the scene.
 
-        self.scene.draw()
+        Yields
+        ------
+        :class:`compas_notebook.scene.ThreeSceneObject`
+            The object that was refined in every step.
+
+        """
+        for o in self.scene.objects if objects is None else objects:
+            while self.profiler.record(o, o.refine):
+                self.encode_buffers(o.guids)
+                yield o
+
+    @property
+    def executor(self) -> Optional[ProcessPoolExecutor]:
+        """The process pool on which faces with more than four vertices are triangulated.
+
+        The pool has ``config.view.triangulation_workers`` worker processes,
+        and is created when it is first needed.
+        If the number of workers is zero, there is no pool, and faces are triangulated serially.
+        The pool is shut down with :meth:`close`, or when the viewer is garbage collected.
+
+        Returns
+        -------
+        :class:`concurrent.futures.ProcessPoolExecutor` | None
+
+        """
+        workers = self.config.view.triangulation_workers
+        if self._executor is not None and self._executorworkers != workers:
+            self.close()
+        if workers and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+            self._executorworkers = workers
+            # the finalizer only refers to the pool, such that it doesn't keep the viewer alive
+            self._executorfinalizer = weakref.finalize(self, self._executor.shutdown, wait=False)
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the worker processes of the triangulation pool, if there are any.
+
+        A new pool is created if it is needed again.
+
+        """
+        if self._executorfinalizer is not None:
+            self._executorfinalizer()
+            self._executorfinalizer = None
+        self._executor = None
+
+    def stats(self) -> list[DrawStats]:
+        """Get the draw statistics of the scene objects, from the slowest to the fastest.
+
+        Instanced and merged objects are drawn together,
+        and their statistics are reported per instance group and for the merge group.
+
+        Returns
+        -------
+        list[:class:`compas_notebook.profiling.DrawStats`]
+
+        Examples
+        --------
+        >>> viewer = Viewer()
+        >>> for stats in viewer.stats():  # doctest: +SKIP
+        ...     print(stats.name, stats.time, stats.bytes, stats.triangles)
+
+        """
+        return sorted(self.profiler.records.values(), key=lambda stats: stats.time, reverse=True)
+
+    def export_html(self, path, title: str = "COMPAS Notebook", level: int = 6, threshold: int = 1024) -> int:
+        """Export the 3D view to a standalone HTML page, that can be shared with people without a running kernel.
+
+        The scene is drawn completely first, including all refinements of progressively drawn objects.
+        The page embeds the pythreejs objects of the view, with shared geometries and materials embedded once,
+        and with the buffers of the geometries compressed with zlib.
+        The widget manager and the JavaScript of pythreejs are loaded from a CDN when the page is opened.
+        See :func:`compas_notebook.export.embed_state`.
+
+        Parameters
+        ----------
+        path : path-like or str
+            The path of the file.
+        title : str, optional
+            The title of the page.
+        level : int, optional
+            The zlib compression level, from 1 (fastest) to 9 (smallest).
+            If zero, the buffers are embedded uncompressed.
+        threshold : int, optional
+            The minimum size of a compressed buffer in bytes.
+
+        Returns
+        -------
+        int
+            The size of the file in bytes.
+
+        Examples
+        --------
+        >>> viewer = Viewer()
+        >>> viewer.export_html("scene.html")  # doctest: +SKIP
+
+        """
+        if getattr(self, "renderer3", None) is None:
+            self.init_webgl()
+        self.update()
+        return write_html(path, [self.renderer3], title=title, level=level, threshold=threshold)
+
+    def encode_buffers(self, objects: list[three.Object3D]) -> None:
+        """Encode the buffers of newly drawn pythreejs objects for transport, according to the view configuration.
+
+        Positions and colors are quantized first, if enabled,
+        such that compression is applied to the smaller, quantized buffers.
+
+        Parameters
+        ----------
+        objects : list[:class:`three.Object3D`]
+            The pythreejs objects.
+
+        """
+        if self.config.view.quantization:
+            quantize_objects(objects)
+        if self.config.view.compression:
+            compress_objects(
+                objects, level=self.config.view.compression, threshold=self.config.view.compression_threshold
+            )
+
+    def group_instances(self) -> tuple[list, dict]:
+        """Separate the visible scene objects into individually drawn objects and groups of instances.
+
+        Returns
+        -------
+        tuple[list[:class:`ThreeSceneObject`], dict[hashable, list[:class:`ThreeSceneObject`]]]
+            The objects that should be drawn individually,
+            and the groups of objects that should be drawn as instances, per instance key.
+
+        """
+        mode = self.config.view.instancing
+        objects = []
+        groups = {}
 
         for o in self.scene.objects:
-            for o3 in o.guids:
-                self.scene3.add(o3)
+            if not o.show:
+                continue
+            key = o.instance_key() if mode != "never" else None
+            if key is None:
+                objects.append(o)
+            else:
+                groups.setdefault(key, []).append(o)
+
+        if mode == "auto":
+            for key in list(groups):
+                if len(groups[key]) < self.config.view.instancing_threshold:
+                    objects += groups.pop(key)
+
+        return objects, groups
 
     # =============================================================================
     # WebGL
@@ -230,8 +631,8 @@ class Viewer:
         if items:
             for item in items:
                 if item["type"] == "checkbox":
-
-                    def action(x):
+                    # the item is bound as a default argument, because the function is called after the loop
+                    def action(x, item=item):
                         f = getattr(self.controller, item["action"])
                         f(x)
 
@@ -0,0 +1,166 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+import pytest
+import pythreejs as three
+from compas.colors import Color
+from ipydatawidgets import NDArrayWidget
+from ipydatawidgets.ndarray.serializers import array_from_compressed_json
+from ipydatawidgets.ndarray.serializers import array_to_compressed_json
+
+from compas_notebook.cache import Cache
+from compas_notebook.conversions import attribute_array
+from compas_notebook.conversions import compress_objects
+from compas_notebook.conversions import decimate_points
+from compas_notebook.conversions import instanced_material
+from compas_notebook.conversions import node_indices
+from compas_notebook.conversions import quantize_objects
+from compas_notebook.conversions import triangulate_faces
+from compas_notebook.conversions import vertices_and_faces_to_threejs
+
+
+def test_triangulate_faces_mixed_degrees():
+    vertices = [[0, 0, 0], [1, 0, 0], [2, 0, 0], [2, 1, 0], [1, 1.5, 0], [0, 1, 0], [3, 0, 0], [3, 1, 0], [2.5, 2, 0]]
+    faces = [[0, 1, 4, 5], [2, 6, 7, 8, 3], [1, 2, 3]]
+
+    triangles, owners = triangulate_faces(vertices, faces)
+
+    assert triangles.shape == (6, 3)
+    assert owners.tolist() == [0, 0, 1, 1, 1, 2]
+    assert triangles[:2].tolist() == [[0, 1, 4], [0, 4, 5]]
+    assert triangles[-1].tolist() == [1, 2, 3]
+    assert set(triangles[2:5].ravel()) == {2, 6, 7, 8, 3}
+
+
+def test_triangulate_faces_in_parallel():
+    vertices = []
+    faces = []
+    for i in range(10):
+        angles = numpy.linspace(0, 2 * numpy.pi, 5 + i % 3, endpoint=False)
+        faces.append([[0, 1, 2, 3], list(range(len(vertices), len(vertices) + len(angles)))][i % 2])
+        vertices += numpy.column_stack([numpy.cos(angles) + i, numpy.sin(angles), numpy.zeros_like(angles)]).tolist()
+
+    expected = triangulate_faces(vertices, faces)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = triangulate_faces(vertices, faces, executor=executor, chunksize=2)
+
+    assert result[0].tolist() == expected[0].tolist()
+    assert result[1].tolist() == expected[1].tolist()
+
+
+def test_triangulate_faces_with_cache():
+    angles = numpy.linspace(0, 2 * numpy.pi, 6, endpoint=False)
+    hexagon = numpy.column_stack([numpy.cos(angles), numpy.sin(angles), numpy.zeros(6)])
+    vertices = numpy.concatenate([hexagon + [0.1 * i, i, 0] for i in range(10)])
+    faces = [list(range(6 * i, 6 * i + 6)) for i in range(10)] + [[0, 1, 2, 3]]
+
+    cache = Cache(maxsize=10)
+    expected = triangulate_faces(vertices, faces)
+    result = triangulate_faces(vertices, faces, cache=cache)
+
+    assert result[0].tolist() == expected[0].tolist()
+    assert result[1].tolist() == expected[1].tolist()
+    assert (cache.hits, cache.misses) == (9, 1)
+
+    triangulate_faces(vertices, faces, cache=cache)
+    assert (cache.hits, cache.misses) == (19, 1)
+
+
+def test_triangulate_faces_empty():
+    triangles, owners = triangulate_faces([], [])
+
+    assert triangles.shape == (0, 3)
+    assert owners.shape == (0,)
+
+
+def test_vertices_and_faces_to_threejs_of_arrays():
+    vertices = numpy.random.default_rng(0).random((6, 3))
+    for faces in ([[0, 1, 2], [2, 3, 4], [4, 5, 0]], [[0, 1, 2, 3], [2, 3, 4, 5]]):
+        expected = vertices_and_faces_to_threejs(vertices.tolist(), faces)
+        geometry = vertices_and_faces_to_threejs(vertices, numpy.array(faces))
+
+        for name in ("position", "index"):
+            array = geometry.attributes[name].array
+            assert array.dtype == expected.attributes[name].array.dtype
+            assert array.tolist() == expected.attributes[name].array.tolist()
+
+
+def test_node_indices():
+    # a lookup array for dense integer keys, a binary search for sparse integer and string keys
+    assert node_indices([3, 0, 2, 1], [[1, 2], [0, 3]]).tolist() == [[3, 2], [1, 0]]
+    assert node_indices([10**9, 5, 7], numpy.array([7, 10**9, 5])).tolist() == [2, 0, 1]
+    assert node_indices(["b", "a"], iter(["a", "b", "a"])).tolist() == [1, 0, 1]
+    assert node_indices([(0, 1), (1, 1)], [(1, 1), (0, 1)]).tolist() == [1, 0]
+
+    for keys, nodes in (([0, 1], [2]), ([0, 1], [-1]), ([10**9, 5], [6]), (["a"], ["b"]), ([0, 1], ["a"])):
+        with pytest.raises(KeyError):
+            node_indices(keys, nodes)
+
+
+def test_decimate_points():
+    points = numpy.random.default_rng(0).random((5000, 3))
+    points[:, 2] = 0
+
+    for method in ("voxel", "random"):
+        indices = decimate_points(points, 500, method=method)
+        assert 400 <= len(indices) <= 500
+        assert len(numpy.unique(indices)) == len(indices)
+
+    assert len(decimate_points(points, 10000)) == 5000
+
+
+def test_decimate_points_with_distant_outliers():
+    points = numpy.random.default_rng(0).random((200_000, 3)) * 0.01
+    points = numpy.vstack([points, [1e6, 1e6, 1e6]])
+
+    indices = decimate_points(points, 1000)
+
+    assert len(indices) <= 1000
+    assert len(points) - 1 in indices
+
+
+def test_quantize_objects_folds_dequantization_into_matrix():
+    positions = numpy.random.default_rng(0).random((100, 3)) * [10, 5, 0] + [1, 2, 3]
+    colors = numpy.random.default_rng(1).random((100, 3))
+    geometry = three.BufferGeometry(
+        attributes={
+            "position": three.BufferAttribute(positions.astype(numpy.float32), normalized=False),
+            "color": three.BufferAttribute(colors.astype(numpy.float32), normalized=False),
+        }
+    )
+    points = three.Points(geometry, three.PointsMaterial())
+
+    quantize_objects([points])
+
+    position = geometry.attributes["position"]
+    assert position.array.dtype == numpy.uint16
+    assert geometry.attributes["color"].array.dtype == numpy.uint8
+    matrix = numpy.array(points.matrix).reshape(4, 4).T
+    restored = (position.array / 65535) @ matrix[:3, :3].T + matrix[:3, 3]
+    assert numpy.allclose(restored, positions, atol=1e-3)
+
+
+def test_compress_objects_only_compresses_large_buffers():
+    positions = numpy.random.default_rng(0).random((1000, 3)).astype(numpy.float32)
+    index = numpy.arange(30, dtype=numpy.uint32)
+    position = three.BufferAttribute(positions, normalized=False)
+    a = three.Mesh(three.BufferGeometry(attributes={"position": position, "index": three.BufferAttribute(index)}))
+    b = three.Points(three.BufferGeometry(attributes={"position": position}), three.PointsMaterial())
+
+    assert compress_objects([three.Group(children=[a]), b], level=6, threshold=1000) == positions.nbytes
+
+    assert isinstance(position.array, NDArrayWidget)
+    assert isinstance(a.geometry.attributes["index"].array, numpy.ndarray)
+    assert attribute_array(position) is position.array.array
+
+    widget = position.array
+    state = array_to_compressed_json(widget.array, widget)
+    assert "compressed_buffer" in state
+    assert numpy.array_equal(array_from_compressed_json(state, widget), positions)
+
+
+def test_instanced_material_sends_the_color_as_a_color_uniform():
+    material = instanced_material(Color.red())
+
+    assert material.get_state()["uniforms"]["diffuse"] == {"type": "c", "value": Color.red().hex}
+    assert "USE_INSTANCE_COLOR" not in material.defines
@@ -0,0 +1,187 @@
+import numpy
+import pythreejs as three
+from compas.colors import Color
+from compas.datastructures import Graph
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Capsule
+from compas.geometry import Frame
+from compas.geometry import Translation
+from compas.scene import Scene
+
+import compas_notebook.scene  # noqa: F401
+
+
+def test_mesh_faces_indexed_per_color():
+    mesh = Mesh.from_meshgrid(dx=1, nx=4)
+    scene = Scene(context="Notebook")
+    sceneobject = scene.add(mesh)
+    sceneobject.facecolor[0] = Color.red()
+
+    group = sceneobject.draw_faces(list(mesh.faces()), sceneobject.facecolor)
+
+    assert isinstance(group, three.Group)
+    assert len(group.children) == 2
+    position = group.children[0].geometry.attributes["position"]
+    assert group.children[1].geometry.attributes["position"] is position
+    assert len(position.array) == mesh.number_of_vertices()
+    assert sum(len(child.geometry.attributes["index"].array) for child in group.children) == 3 * 2 * 16
+
+
+def test_mesh_faces_unindexed():
+    mesh = Mesh.from_meshgrid(dx=1, nx=4)
+    scene = Scene(context="Notebook")
+    sceneobject = scene.add(mesh, indexed=False)
+
+    mesh3 = sceneobject.draw_faces(list(mesh.faces()), sceneobject.facecolor)
+
+    assert len(mesh3.geometry.attributes["position"].array) == 3 * 2 * 16
+    assert len(mesh3.geometry.attributes["color"].array) == 3 * 2 * 16
+
+
+def test_mesh_draw_with_deleted_vertices_and_subsets():
+    mesh = Mesh.from_meshgrid(dx=3, nx=3)
+    mesh.delete_vertex(0)
+    mesh.add_face([1, 2, 6, 10, 9, 5])
+    scene = Scene(context="Notebook")
+    faces = list(mesh.faces())[::-2]
+    sceneobject = scene.add(mesh, indexed=False, show_vertices=[15, 5], show_edges=True, show_faces=faces)
+    sceneobject.draw()
+
+    vertices, edges, faces3 = sceneobject.guids
+    assert vertices.geometry.attributes["position"].array.tolist() == [
+        mesh.vertex_coordinates(15),
+        mesh.vertex_coordinates(5),
+    ]
+    positions = edges.geometry.attributes["position"].array.reshape(-1, 2, 3)
+    for (u, v), (a, b) in zip(mesh.edges(), positions):
+        assert a.tolist() == mesh.vertex_coordinates(u) and b.tolist() == mesh.vertex_coordinates(v)
+    assert len(faces3.geometry.attributes["position"].array) == 3 * sum(len(mesh.face_vertices(f)) - 2 for f in faces)
+
+
+def test_mesh_vertex_xyz_is_cached_until_the_mesh_is_drawn():
+    mesh = Mesh.from_meshgrid(dx=1, nx=4)
+    scene = Scene(context="Notebook")
+    sceneobject = scene.add(mesh)
+
+    vertex_xyz = sceneobject.vertex_xyz
+    assert sceneobject.vertex_xyz is vertex_xyz
+
+    mesh.vertex_attribute(0, "x", -1.0)
+    sceneobject.draw()
+    assert sceneobject.vertex_xyz is not vertex_xyz
+    assert sceneobject.vertex_xyz[0][0] == -1.0
+
+
+def test_mesh_update_colors_only_replaces_colors():
+    scene = Scene(context="Notebook")
+    mesh = Mesh.from_meshgrid(dx=1.0, nx=4)
+    sceneobject = scene.add(mesh, indexed=False, show_vertices=True, show_edges=True)
+    sceneobject.redraw()
+    points, edges, faces = sceneobject.guids
+    position = faces.geometry.attributes["position"].array
+
+    face = next(mesh.faces())
+    sceneobject.facecolor[face] = Color.red()
+    sceneobject.vertexcolor[0] = Color.blue()
+    sceneobject.edgecolor[next(mesh.edges())] = Color.green()
+    assert sceneobject.update_colors()
+
+    assert not sceneobject.is_dirty
+    assert sceneobject.guids == [points, edges, faces]
+    assert faces.geometry.attributes["position"].array is position
+    assert faces.geometry.attributes["color"].array[:3].tolist() == [[1.0, 0.0, 0.0]] * 3
+    assert points.geometry.attributes["color"].array[0].tolist() == [0.0, 0.0, 1.0]
+    assert edges.geometry.attributes["color"].array[:2].tolist() == [[0.0, 1.0, 0.0]] * 2
+
+    mesh.vertex_attribute(0, "z", 1.0)
+    assert not sceneobject.update_colors()
+    assert sceneobject.is_dirty
+
+
+def test_mesh_update_colors_of_indexed_faces():
+    scene = Scene(context="Notebook")
+    mesh = Mesh.from_meshgrid(dx=1.0, nx=4)
+    sceneobject = scene.add(mesh, show_edges=False)
+    sceneobject.redraw()
+    material = sceneobject.guids[0].material
+
+    sceneobject.facecolor.default = Color.red()
+    assert sceneobject.update_colors()
+    assert sceneobject.guids[0].material is not material
+    assert sceneobject.guids[0].material.color == Color.red().hex
+
+    # a different partition of the faces by color can't be applied to the existing meshes
+    sceneobject.facecolor[next(mesh.faces())] = Color.blue()
+    assert not sceneobject.update_colors()
+    assert sceneobject.is_dirty
+
+
+def test_graph_update_colors():
+    scene = Scene(context="Notebook")
+    graph = Graph.from_nodes_and_edges([[0, 0, 0], [1, 0, 0], [1, 1, 0]], [(0, 1), (1, 2)])
+    sceneobject = scene.add(graph, edgecolor={(0, 1): Color.red()})
+    sceneobject.redraw()
+    points, lines = sceneobject.guids
+    assert lines.geometry.attributes["color"].array[:2].tolist() == [[1.0, 0.0, 0.0]] * 2
+
+    sceneobject.edgecolor[1, 2] = Color.green()
+    assert sceneobject.update_colors()
+    assert lines.geometry.attributes["color"].array[2:].tolist() == [[0.0, 1.0, 0.0]] * 2
+
+    sceneobject.nodecolor[0] = Color.blue()
+    assert not sceneobject.update_colors()
+    assert sceneobject.is_dirty
+
+
+def test_graph_draw_subsets_of_nodes_and_edges():
+    scene = Scene(context="Notebook")
+    graph = Graph()
+    for i, key in enumerate("abcd"):
+        graph.add_node(key, x=i, y=0, z=0)
+    graph.add_edge("a", "b")
+    graph.add_edge("b", "c")
+    graph.add_edge("c", "d")
+    sceneobject = scene.add(graph, show_nodes=["d", "b"], show_edges=[("c", "d")])
+    sceneobject.draw()
+
+    points, lines = sceneobject.guids
+    assert points.geometry.attributes["position"].array[:, 0].tolist() == [0, 1, 2, 3]
+    assert points.geometry.attributes["index"].array.tolist() == [1, 3]
+    assert lines.geometry.attributes["index"].array.tolist() == [2, 3]
+
+
+def test_capsules_with_low_resolutions():
+    scene = Scene(context="Notebook")
+    sceneobject = scene.add(Capsule(1, 2), resolution=4)
+
+    mesh, _ = sceneobject.draw()
+
+    assert len(mesh.geometry.attributes["position"].array)
+
+
+def test_move_only_updates_matrices():
+    scene = Scene(context="Notebook")
+    parent = scene.add(Box(1.0))
+    sceneobject = scene.add(Box(1.0), parent=parent)
+    sceneobject.redraw()
+    guids = list(sceneobject.guids)
+    base = [numpy.array(obj.matrix).reshape(4, 4).T for obj in guids]
+
+    sceneobject.transformation = Translation.from_vector([1, 2, 3])
+    assert sceneobject.is_dirty
+    assert not sceneobject.redraw()
+    assert not sceneobject.is_dirty
+    assert list(sceneobject.guids) == guids
+    for obj, matrix in zip(guids, base):
+        assert numpy.allclose(numpy.array(obj.matrix).reshape(4, 4).T, sceneobject.worldmatrix @ matrix)
+
+    # the frames of the parents are part of the world transformation
+    parent.frame = Frame([0, 0, 10])
+    assert not sceneobject.redraw()
+    assert numpy.allclose(numpy.array(guids[0].matrix).reshape(4, 4).T[:3, 3], [1, 2, 13])
+
+    sceneobject.transformation = None
+    sceneobject.color = Color.red()
+    assert not sceneobject.update_transformation()
+    assert sceneobject.redraw()
@@ -0,0 +1,76 @@
+import numpy
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Cone
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from compas_notebook.spatial import BVH
+from compas_notebook.viewer import Viewer
+
+
+def test_bvh_query_box_matches_brute_force():
+    lower = numpy.random.default_rng(0).random((500, 3)) * 100
+    boxes = numpy.hstack([lower, lower + 2])
+    bvh = BVH(boxes)
+    query = numpy.array([10, 10, 10, 50, 50, 50])
+
+    expected = [i for i, box in enumerate(boxes) if (box[:3] <= query[3:]).all() and (box[3:] >= query[:3]).all()]
+
+    assert bvh.query_box(query) == expected
+    assert numpy.allclose(bvh.bounds, list(boxes[:, :3].min(axis=0)) + list(boxes[:, 3:].max(axis=0)))
+
+
+def test_bvh_query_ray_is_ordered_by_distance():
+    boxes = [[i, 0, 0, i + 0.5, 1, 1] for i in range(10)]
+    bvh = BVH(boxes)
+
+    hits = bvh.query_ray([20, 0.5, 0.5], [-1, 0, 0])
+
+    assert [item for _, item in hits] == list(range(9, -1, -1))
+    assert hits[0][0] == 10.5
+
+
+def test_scene_bounds_are_cached_until_objects_change():
+    viewer = Viewer()
+    viewer.init_webgl()
+    viewer.init_ui()
+    mesh = viewer.scene.add(Mesh.from_meshgrid(dx=4, nx=4))
+    box = viewer.scene.add(Box(2, frame=Frame([10, 0, 0], [1, 0, 0], [0, 1, 0])))
+    viewer.update()
+
+    assert viewer.controller.scene_bounds() == (0, -1, -1, 11, 4, 1)
+    bvh = viewer.sceneindex.bvh
+    assert viewer.controller.scene_bounds() == (0, -1, -1, 11, 4, 1)
+    assert viewer.sceneindex.bvh is bvh
+    assert viewer.sceneindex.bvh.query_box([9, -1, -1, 12, 1, 1]) == [box]
+
+    mesh.item.vertex_attribute(0, "x", -1.0)
+    viewer.update()
+    assert viewer.controller.scene_bounds()[0] == -1
+
+
+def test_scene_bounds_are_refreshed_when_objects_are_redrawn():
+    viewer = Viewer()
+    viewer.init_webgl()
+    mesh = viewer.scene.add(Mesh.from_meshgrid(dx=4, nx=4))
+    assert viewer.controller.scene_bounds() == (0, 0, 0, 4, 4, 0)
+
+    # the data of the objects is not hashed again to validate the cached boxes
+    mesh.item.vertex_attribute(0, "x", -1.0)
+    assert viewer.controller.scene_bounds() == (0, 0, 0, 4, 4, 0)
+
+    viewer.update()
+    assert viewer.controller.scene_bounds() == (-1, 0, 0, 4, 4, 0)
+
+    mesh.transformation = Translation.from_vector([0, 0, 2])
+    assert viewer.controller.scene_bounds() == (-1, 0, 2, 4, 4, 2)
+
+
+def test_scene_bounds_of_cones_contain_the_drawn_cones():
+    viewer = Viewer()
+    viewer.scene.add(Cone(1, 4))
+    xmin, ymin, zmin, xmax, ymax, zmax = viewer.controller.scene_bounds()
+
+    # pythreejs cones are centred on their frame
+    assert zmin <= -2 and zmax >= 2
@@ -0,0 +1,406 @@
+import asyncio
+import base64
+import gc
+import json
+import zlib
+
+import numpy
+from compas.colors import Color
+from compas.datastructures import Mesh
+from compas.geometry import Box
+from compas.geometry import Cylinder
+from compas.geometry import Frame
+from compas.geometry import Line
+from compas.geometry import Pointcloud
+from compas.geometry import Polygon
+
+from compas_notebook import viewer as viewer_module
+from compas_notebook.traffic import TrafficMeter
+from compas_notebook.viewer import Viewer
+
+
+def make_viewer():
+    viewer = Viewer()
+    viewer.init_webgl()
+    viewer.init_ui()
+    return viewer
+
+
+def test_update_only_redraws_changed_objects():
+    viewer = make_viewer()
+    mesh = viewer.scene.add(Mesh.from_meshgrid(4, 4))
+    box = viewer.scene.add(Box(1))
+    viewer.update()
+
+    guids = list(box.guids)
+    mesh.show_vertices = True
+    viewer.update()
+
+    assert list(box.guids) == guids
+    assert len(mesh.guids) == 2
+    for guid in list(box.guids) + list(mesh.guids):
+        assert guid in viewer.scene3.children
+
+
+def test_invalidate_forces_redraw():
+    viewer = make_viewer()
+    box = viewer.scene.add(Box(1))
+    viewer.update()
+
+    guids = list(box.guids)
+    assert not box.is_dirty
+    box.invalidate()
+    assert box.is_dirty
+    viewer.update()
+
+    assert list(box.guids) != guids
+    assert not box.is_dirty
+
+
+def test_identical_shapes_share_geometry():
+    viewer = make_viewer()
+    a = viewer.scene.add(Box(1, frame=Frame([0, 0, 0], [1, 0, 0], [0, 1, 0])))
+    b = viewer.scene.add(Box(1, frame=Frame([2, 0, 0], [1, 0, 0], [0, 1, 0])))
+    c = viewer.scene.add(Box(2))
+    viewer.update()
+
+    assert a.guids[0].geometry is b.guids[0].geometry
+    assert a.guids[1].geometry is b.guids[1].geometry
+    assert a.guids[0].matrix != b.guids[0].matrix
+    assert a.guids[0].geometry is not c.guids[0].geometry
+
+
+def test_geometry_cache_is_bounded():
+    cachesize = Viewer().config.view.geometry_cachesize
+    Viewer().config.view.geometry_cachesize = 4
+    try:
+        viewer = make_viewer()
+    finally:
+        viewer.config.view.geometry_cachesize = cachesize
+    for i in range(10):
+        viewer.scene.add(Box(i + 1))
+    viewer.update()
+
+    assert len(viewer.geometries) == 4
+
+
+def test_identical_materials_are_shared():
+    viewer = make_viewer()
+    a = viewer.scene.add(Box(1), color=Color.red())
+    b = viewer.scene.add(Box(2), color=Color.red())
+    c = viewer.scene.add(Box(3), color=Color.blue())
+    viewer.update()
+
+    assert a.guids[0].material is b.guids[0].material
+    assert a.guids[1].material is b.guids[1].material
+    assert a.guids[0].material is not c.guids[0].material
+
+
+def test_many_identical_shapes_are_instanced():
+    viewer = make_viewer()
+    n = viewer.config.view.instancing_threshold
+    for i in range(n):
+        viewer.scene.add(Box(1, frame=Frame([i, 0, 0], [1, 0, 0], [0, 1, 0])))
+    viewer.update()
+
+    mesh, lines = viewer.instancegroups[("Box",)].guids
+    assert mesh in viewer.scene3.children
+    assert lines in viewer.scene3.children
+    assert mesh.geometry.maxInstancedCount == n
+    assert mesh.geometry.attributes["instanceMatrix3"].array[-1].tolist() == [n - 1, 0, 0, 1]
+
+
+def test_objects_leaving_an_instance_group_are_redrawn():
+    viewer = make_viewer()
+    box = viewer.scene.add(Box(1))
+    viewer.update()
+    for i in range(1, viewer.config.view.instancing_threshold):
+        viewer.scene.add(Box(1, frame=Frame([i, 0, 0], [1, 0, 0], [0, 1, 0])))
+    viewer.update()
+    assert ("Box",) in viewer.instancegroups
+
+    box.color = Color.red()
+    viewer.update()
+    viewer.config.view.instancing = "never"
+    try:
+        viewer.update()
+    finally:
+        viewer.config.view.instancing = "auto"
+
+    assert not viewer.instancegroups
+    assert box.guids[0] in viewer.scene3.children
+    assert box.guids[0].material.color == Color.red().hex
+
+
+def test_objects_leaving_the_merge_group_are_redrawn():
+    viewer = make_viewer()
+    polygon = viewer.scene.add(Polygon([[0, 0, 0], [1, 0, 0], [1, 1, 0]]))
+    viewer.update()
+    viewer.config.view.merging = True
+    try:
+        viewer.update()
+        assert polygon in viewer.mergegroup.objects
+        polygon.color = Color.red()
+        viewer.update()
+    finally:
+        viewer.config.view.merging = False
+    viewer.update()
+
+    assert viewer.mergegroup is None
+    assert polygon.guids[0] in viewer.scene3.children
+    assert polygon.guids[0].material.color == Color.red().hex
+
+
+def test_static_objects_are_merged():
+    viewer = make_viewer()
+    viewer.config.view.merging = True
+    try:
+        lines = [viewer.scene.add(Line([i, 0, 0], [i, 1, 0])) for i in range(10)]
+        polygon = viewer.scene.add(Polygon([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]), color=Color.red())
+        viewer.update()
+    finally:
+        viewer.config.view.merging = False
+
+    mesh, segments = viewer.mergegroup.guids
+    assert mesh in viewer.scene3.children
+    assert segments in viewer.scene3.children
+    assert not lines[0].guids
+    assert len(segments.geometry.attributes["index"].array) == 2 * 10 + 2 * 4
+    assert mesh.geometry.attributes["color"].array[0].tolist() == [1, 0, 0]
+
+    viewer.mergegroup.hide(lines[3])
+    vstart, _, estart, estop = viewer.mergegroup.ranges["lines"][lines[3]]
+    assert (segments.geometry.attributes["index"].array[estart:estop] == vstart).all()
+
+    viewer.mergegroup.set_color(polygon, Color.blue(), kind="faces")
+    assert mesh.geometry.attributes["color"].array[0].tolist() == [0, 0, 1]
+
+
+def test_merged_objects_are_recolored_with_quantized_colors():
+    viewer = make_viewer()
+    viewer.config.view.merging = True
+    viewer.config.view.quantization = True
+    try:
+        polygon = viewer.scene.add(Polygon([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]))
+        viewer.update()
+        mesh, _ = viewer.mergegroup.guids
+        assert mesh.geometry.attributes["color"].array.dtype == numpy.uint8
+
+    finally:
+        viewer.config.view.merging = False
+        viewer.config.view.quantization = False
+
+    viewer.mergegroup.set_color(polygon, Color.red(), kind="faces")
+    assert mesh.geometry.attributes["color"].array.dtype == numpy.uint8
+    assert mesh.geometry.attributes["color"].array[0].tolist() == [255, 0, 0]
+
+
+def test_merged_concave_quads_are_ear_clipped():
+    viewer = make_viewer()
+    viewer.config.view.merging = True
+    try:
+        polygon = viewer.scene.add(Polygon([[0, 0, 0], [2, 1, 0], [4, 0, 0], [2, 3, 0]]))
+        viewer.update()
+    finally:
+        viewer.config.view.merging = False
+
+    mesh, _ = viewer.mergegroup.guids
+    triangles = mesh.geometry.attributes["index"].array.reshape(-1, 3).tolist()
+    assert triangles == [
+        list(triangle) for triangle in polygon.draw()[0].geometry.attributes["index"].array.reshape(-1, 3)
+    ]
+    assert triangles == [[3, 0, 1], [1, 2, 3]]
+
+
+def test_resolution_of_curved_shapes():
+    viewer = make_viewer()
+    viewer.config.view.resolution = "auto"
+    try:
+        large = viewer.scene.add(Cylinder(5, 50))
+        small = viewer.scene.add(Cylinder(0.1, 0.5))
+        fixed = viewer.scene.add(Cylinder(0.1, 0.5), resolution=12)
+        viewer.update()
+    finally:
+        viewer.config.view.resolution = 32
+
+    assert large.guids[0].geometry.radialSegments == viewer.config.view.resolution_max
+    assert small.guids[0].geometry.radialSegments == viewer.config.view.resolution_min
+    assert fixed.guids[0].geometry.radialSegments == 12
+
+
+def test_large_pointclouds_are_drawn_progressively():
+    viewer = make_viewer()
+    viewer.config.view.pointcloud_chunksize = 1000
+    try:
+        points = numpy.random.default_rng(0).random((5000, 3)).tolist()
+        pointcloud = viewer.scene.add(Pointcloud(points), pointbudget=3000)
+        viewer.update()
+    finally:
+        viewer.config.view.pointcloud_chunksize = 100_000
+
+    group = pointcloud.guids[0]
+    assert group in viewer.scene3.children
+    assert len(group.children) == 3
+    assert sum(len(child.geometry.attributes["position"].array) for child in group.children) <= 3000
+    assert not pointcloud.is_dirty
+
+
+def test_show_displays_the_preview_of_pointclouds_before_the_refinements(monkeypatch):
+    viewer = Viewer()
+    viewer.config.view.pointcloud_chunksize = 1000
+    try:
+        points = numpy.random.default_rng(0).random((5000, 3)).tolist()
+        pointcloud = viewer.scene.add(Pointcloud(points), pointbudget=3000)
+        displayed = []
+
+        def display(ui):
+            displayed.append(len(pointcloud.guids[0].children))
+
+        monkeypatch.setattr(viewer_module, "ipydisplay", display)
+        viewer.show()
+    finally:
+        viewer.config.view.pointcloud_chunksize = 100_000
+
+    assert displayed == [1]
+    assert len(pointcloud.guids[0].children) == 3
+
+
+def test_voxel_decimated_pointclouds_stay_within_the_budget():
+    viewer = make_viewer()
+    viewer.config.view.pointcloud_chunksize = 1000
+    viewer.config.view.pointcloud_decimation = "voxel"
+    try:
+        rng = numpy.random.default_rng(0)
+        points = numpy.concatenate([rng.random((8000, 3)), rng.random((2000, 3)) * 0.1]).tolist()
+        pointcloud = viewer.scene.add(Pointcloud(points), pointbudget=3000)
+        viewer.update()
+        while pointcloud.refine():
+            pass
+    finally:
+        viewer.config.view.pointcloud_chunksize = 100_000
+        viewer.config.view.pointcloud_decimation = "voxel"
+
+    group = pointcloud.guids[0]
+    assert sum(len(child.geometry.attributes["position"].array) for child in group.children) <= 3000
+
+
+def test_triangulation_pool_is_shut_down():
+    viewer = Viewer()
+    config = viewer.config.view
+    config.triangulation_workers = 1
+    try:
+        executor = viewer.executor
+        viewer.close()
+        assert executor._shutdown_thread
+        assert viewer.executor is not executor
+
+        executor = viewer.executor
+        del viewer
+        gc.collect()
+        assert executor._shutdown_thread
+    finally:
+        config.triangulation_workers = 0
+
+
+def test_update_async_draws_in_batches():
+    viewer = make_viewer()
+    boxes = [viewer.scene.add(Box(1, frame=Frame([i, 0, 0], [1, 0, 0], [0, 1, 0]))) for i in range(5)]
+
+    steps = list(viewer.update_steps(batchsize=2))
+    assert steps == [(2, 5), (4, 5), (5, 5)]
+
+    for box in boxes:
+        box.invalidate()
+    asyncio.run(viewer.update_async(batchsize=2))
+
+    assert viewer.statustext.value == "Drawing scene objects: done (5 objects)"
+    for box in boxes:
+        for guid in box.guids:
+            assert guid in viewer.scene3.children
+
+
+def test_stats_of_drawn_objects():
+    viewer = make_viewer()
+    mesh = viewer.scene.add(Mesh.from_meshgrid(dx=1.0, nx=10), show_edges=False, name="grid")
+    viewer.scene.add(Box(1))
+    viewer.config.ui.show_stats = True
+    try:
+        viewer.update()
+    finally:
+        viewer.config.ui.show_stats = False
+
+    stats = {stats.name: stats for stats in viewer.stats()}
+    assert stats["grid"].triangles == 200
+    assert stats["grid"].bytes > 0
+    assert stats["grid"].widgets > 0
+    assert stats["grid"].draws == 1
+    assert viewer.statustext.value == viewer.profiler.summary()
+
+    viewer.update()
+    assert stats["grid"].draws == 1
+
+    viewer.scene.remove(mesh)
+    viewer.update()
+    assert "grid" not in {stats.name for stats in viewer.stats()}
+
+
+def test_traffic_of_updates(tmp_path):
+    viewer = make_viewer()
+    viewer.traffic = TrafficMeter()
+    viewer.scene.add(Mesh.from_meshgrid(dx=1.0, nx=10))
+    viewer.update()
+    viewer.update()
+
+    first, second = viewer.traffic.records
+    assert first.operation == "update"
+    assert first.opens > 0
+    assert first.buffer_bytes > 0
+    assert second.opens == 0
+    assert second.bytes < first.bytes
+
+    viewer.traffic.dump(tmp_path / "traffic.jsonl")
+    lines = (tmp_path / "traffic.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    assert len(json.loads(lines[0])["log"]) == first.messages
+
+
+def test_toggle_parts_without_redrawing():
+    viewer = make_viewer()
+    viewer.traffic = TrafficMeter()
+    meshes = [viewer.scene.add(Mesh.from_meshgrid(dx=1.0, nx=4)) for _ in range(3)]
+    viewer.update()
+    (faces,) = meshes[0].guids
+
+    viewer.controller.on_toggle_vertices({"new": True})
+    points = meshes[0].guids[-1]
+    assert meshes[0].guids == [faces, points]
+    assert points in viewer.scene3.children
+
+    viewer.controller.on_toggle_vertices({"new": False})
+    viewer.controller.on_toggle_vertices({"new": True})
+    _, shown, hidden, shown_again = viewer.traffic.records
+    assert shown.opens > 0
+    assert hidden.opens == 0 and hidden.messages == len(meshes)
+    assert shown_again.opens == 0 and shown_again.messages == len(meshes)
+    assert points.visible
+    assert meshes[0].guids == [faces, points]
+
+
+def test_export_html(tmp_path):
+    viewer = make_viewer()
+    mesh = viewer.scene.add(Mesh.from_meshgrid(dx=1.0, nx=20))
+    size = viewer.export_html(tmp_path / "scene.html", threshold=0)
+
+    html = (tmp_path / "scene.html").read_text()
+    assert size == len(html.encode())
+    data = html.split('<script type="application/vnd.jupyter.widget-state+json">')[1].split("</script>")[0]
+    state = json.loads(data)["state"]
+
+    (faces,) = mesh.guids
+    position = state[faces.geometry.attributes["position"].model_id]
+    array = state[position["state"]["array"][len("IPY_MODEL_") :]]
+    assert array["model_name"] == "NDArrayModel"
+    (buffer,) = array["buffers"]
+    assert buffer["path"] == ["array", "compressed_buffer"]
+    decompressed = zlib.decompress(base64.b64decode(buffer["data"]))
+    assert decompressed == faces.geometry.attributes["position"].array.tobytes()